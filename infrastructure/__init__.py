@@ -8,29 +8,60 @@ Provides core system infrastructure for logging, monitoring, error handling,
 context management, and agent registry.
 """
 
-from .error_service import ErrorTracker, resilient_task, RetryConfig, human_escalation_handler
+from .error_service import (
+    ErrorTracker, ErrorFingerprint, resilient_task, RetryConfig, human_escalation_handler,
+    CircuitBreaker, CircuitOpenError, RetryBudget, HedgeConfig, get_resilience_metrics,
+)
+from .deadline_service import DeadlineExceeded, deadline_scope, shrink_timeout, check_deadline
 from .logging_service import StructuredLogger, setup_structured_logger, AgentLogger, set_trace_id, get_trace_id
-from .monitoring_service import PerformanceMonitor, AgentMetrics, PerformanceTimer
+from .tracing_service import span, traced, configure_tracing, Tracer
+from .log_archive_service import compact_logs, load_tables, agent_latency, agent_errors
+from .monitoring_service import PerformanceMonitor, AgentMetrics, PerformanceTimer, DurationSketch, SlidingWindow
 from .context_service import ContextManager
+from .memory_store_service import SQLiteMemoryKeeper
 from .registry_service import AgentRegistry
 
 __all__ = [
     # Error Handling (error_service.py)
     "ErrorTracker",
+    "ErrorFingerprint",
     "resilient_task",
     "RetryConfig",
     "human_escalation_handler",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "RetryBudget",
+    "HedgeConfig",
+    "get_resilience_metrics",
+    # Deadlines (deadline_service.py)
+    "DeadlineExceeded",
+    "deadline_scope",
+    "shrink_timeout",
+    "check_deadline",
     # Logging (logging_service.py)
     "StructuredLogger",
     "setup_structured_logger",
     "AgentLogger",
     "set_trace_id",
     "get_trace_id",
+    # Tracing (tracing_service.py)
+    "span",
+    "traced",
+    "configure_tracing",
+    "Tracer",
+    # Log archive (log_archive_service.py)
+    "compact_logs",
+    "load_tables",
+    "agent_latency",
+    "agent_errors",
     # Monitoring (monitoring_service.py)
     "PerformanceMonitor",
     "AgentMetrics",
     "PerformanceTimer",
+    "DurationSketch",
+    "SlidingWindow",
     # Context & Registry
     "ContextManager",      # context_service.py
+    "SQLiteMemoryKeeper",  # memory_store_service.py
     "AgentRegistry",       # registry_service.py
 ]
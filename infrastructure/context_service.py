@@ -1,26 +1,52 @@
 """
 Context Manager for Memory-Keeper Integration
-VERSION: 2.0.0 - Integrated from v5.0 + Korean plan improvements
+VERSION: 2.2.0 - Maintained per-category statistics
 
 Automates context persistence and retrieval via MCP memory-keeper:
 - Category-based organization
 - Automatic cleanup of old entries
 - Priority-based retention policies
 - Session state management
+- Write-back cache: saves are coalesced per key and flushed in batches
+  (context_batch_save, falling back to per-item context_save)
+- Retention driven by locally tracked per-category keys and timestamps,
+  so cleanup needs no category re-fetch over MCP
+- Per-category counts, oldest/newest timestamps and byte sizes maintained
+  on save and delete, so get_statistics transfers no data
 
 Based on:
 - scalable.pdf: Context persistence for multi-agent systems
 - MCP memory-keeper server best practices
 """
 
+import atexit
 import json
 import logging
+import time
+from collections import OrderedDict
 from typing import Any, Callable, Dict, Optional, List
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# Errors meaning memory-keeper does not offer an optional tool at all (as
+# opposed to a transient failure, which must not disable the tool)
+UNSUPPORTED_TOOL_PATTERNS = (
+    "unknown tool",
+    "unknown memory-keeper tool",
+    "no such tool",
+    "tool not found",
+    "method not found",
+    "-32601",  # JSON-RPC "Method not found"
+)
+
+
+def _is_unsupported_tool(error: Exception) -> bool:
+    """Whether an MCP error says the tool itself is unavailable"""
+    message = str(error).lower()
+    return any(pattern in message for pattern in UNSUPPORTED_TOOL_PATTERNS)
+
 
 @dataclass
 class ContextCategory:
@@ -41,6 +67,13 @@ class ContextManager:
     - Periodic cleanup of old context
     - Priority-based retention policies
     - Session state tracking
+
+    Saves are buffered: repeated saves to one key are coalesced, and the
+    buffer is flushed once it holds batch_size keys, before any read, and
+    at exit. flush_interval_s is checked on the next save only (there is
+    no background timer, since memory-keeper calls are not thread-safe),
+    so a partial buffer can wait between saves; call flush() at the end
+    of a unit of work to persist immediately.
     """
 
     # Category definitions with retention policies
@@ -110,17 +143,46 @@ class ContextManager:
         )
     }
 
-    def __init__(self, memory_tool_func: Callable):
+    def __init__(
+        self,
+        memory_tool_func: Callable,
+        batch_size: int = 20,
+        flush_interval_s: float = 5.0,
+        clock: Callable[[], float] = time.time
+    ):
         """
         Initialize context manager.
 
         Args:
             memory_tool_func: Function to call memory-keeper MCP tools
                              Signature: def(tool_name: str, **params) -> dict
+            batch_size: Pending keys that trigger a flush (1 = write-through)
+            flush_interval_s: Pending-save age that makes the next save flush
+            clock: Epoch-seconds clock (injectable for tests)
         """
         self.memory_tool = memory_tool_func
         self.context_save_count = 0
         self.auto_cleanup_interval = 10  # Cleanup every N saves
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_s = flush_interval_s
+        self.clock = clock
+
+        # Write-back buffer: key -> save params (insertion order = flush order)
+        self._pending: "OrderedDict[str, Dict]" = OrderedDict()
+        self._pending_since: Optional[float] = None
+        self._batch_supported = True
+        self._delete_supported = True
+        self._stored: set = set()  # Keys known to exist in memory-keeper
+
+        # Retention index: category -> key -> last save time (oldest first)
+        self._tracked: Dict[str, "OrderedDict[str, float]"] = {
+            name: OrderedDict() for name in self.CATEGORIES
+        }
+        self._entries: Dict[str, tuple] = {}  # key -> (category, size in bytes)
+        self._category_bytes: Dict[str, int] = {name: 0 for name in self.CATEGORIES}
+        self._tracked_seeded = False
+
+        atexit.register(self._flush_at_exit)
 
     def save(
         self,
@@ -177,22 +239,102 @@ class ContextManager:
         if tags:
             params["tags"] = tags
 
-        # Save to memory-keeper
-        try:
-            self.memory_tool('mcp__memory-keeper__context_save', **params)
-            logger.info(f"Context saved: {key} (category: {category})")
+        # Buffer the save; a later save to the same key replaces it
+        self._pending.pop(key, None)
+        self._pending[key] = params
+        if self._pending_since is None:
+            self._pending_since = self.clock()
+        self._track(category, key, self.clock(), len(str(value).encode("utf-8")))
+        logger.debug(f"Context buffered: {key} (category: {category})")
+
+        # Increment save counter
+        self.context_save_count += 1
+
+        if (
+            len(self._pending) >= self.batch_size
+            or self.clock() - self._pending_since >= self.flush_interval_s
+        ):
+            try:
+                self.flush()
+            except Exception:
+                pass  # Logged by flush(); the batch stays pending for the next one
 
-            # Increment save counter
-            self.context_save_count += 1
+        # Auto-cleanup check (local index only, no MCP round-trips)
+        if self.context_save_count % self.auto_cleanup_interval == 0:
+            self._auto_cleanup()
 
-            # Auto-cleanup check
-            if self.context_save_count % self.auto_cleanup_interval == 0:
-                self._auto_cleanup()
+    def flush(self) -> int:
+        """
+        Persist all pending saves.
+
+        Returns:
+            Number of items written
 
+        Raises:
+            Exception: From memory-keeper; unwritten items stay pending
+        """
+        if not self._pending:
+            return 0
+
+        items = list(self._pending.values())
+        self._pending.clear()
+        self._pending_since = None
+        written = 0
+
+        try:
+            if self._batch_supported and len(items) > 1:
+                try:
+                    self.memory_tool('mcp__memory-keeper__context_batch_save', items=items)
+                    written = len(items)
+                    self._stored.update(params["key"] for params in items)
+                except Exception as e:
+                    if not _is_unsupported_tool(e):
+                        raise  # Transient: requeue and retry the batch later
+                    logger.warning(f"Batch save unavailable ({e}); falling back to single saves")
+                    self._batch_supported = False
+            for params in items[written:]:
+                self.memory_tool('mcp__memory-keeper__context_save', **params)
+                written += 1
+                self._stored.add(params["key"])
         except Exception as e:
-            logger.error(f"Failed to save context {key}: {e}")
+            logger.error(f"Failed to save context ({len(items) - written} items pending): {e}")
+            self._requeue(items[written:])
             raise
 
+        logger.info(f"Context flushed: {written} items")
+        return written
+
+    def _requeue(self, items: List[Dict]):
+        """Put unwritten items back in front of anything saved since"""
+        newer = self._pending
+        self._pending = OrderedDict((params["key"], params) for params in items)
+        for key, params in newer.items():
+            self._pending.pop(key, None)
+            self._pending[key] = params
+        if self._pending and self._pending_since is None:
+            self._pending_since = self.clock()
+
+    def _flush_at_exit(self):
+        try:
+            self.flush()
+        except Exception:
+            pass  # Already logged; nothing more to do at interpreter exit
+
+    def _track(self, category: str, key: str, saved_at: float, size: int):
+        """Record a save in the local retention index and category totals"""
+        self._untrack(key)  # A re-save may also move the key to another category
+        self._tracked[category][key] = saved_at
+        self._entries[key] = (category, size)
+        self._category_bytes[category] += size
+
+    def _untrack(self, key: str):
+        """Forget a key in the retention index and category totals"""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            category, size = entry
+            self._tracked[category].pop(key, None)
+            self._category_bytes[category] -= size
+
     def get(
         self,
         category: Optional[str] = None,
@@ -214,6 +356,8 @@ class ContextManager:
         Returns:
             List of context items
         """
+        self._flush_before_read()
+
         params = {"limit": limit}
 
         if category:
@@ -361,6 +505,48 @@ class ContextManager:
             metadata={"timestamp": datetime.now().isoformat()}
         )
 
+    def _flush_before_read(self):
+        """Reads see every earlier save (read-your-writes)"""
+        if self._pending:
+            try:
+                self.flush()
+            except Exception:
+                pass  # Logged; read what the store has
+
+    def _seed_tracking(self):
+        """
+        One-time import of items stored by earlier sessions into the local
+        retention index and statistics (later calls never re-fetch categories).
+        """
+        self._tracked_seeded = True
+        for cat_name in self.CATEGORIES:
+            try:
+                result = self.memory_tool(
+                    'mcp__memory-keeper__context_get', category=cat_name, limit=1000
+                )
+            except Exception as e:
+                logger.error(f"Retention index seeding failed for {cat_name}: {e}")
+                continue
+            tracked = self._tracked[cat_name]
+            seeded = OrderedDict()
+            for item in sorted(result.get("items", []), key=lambda x: x.get("created_at", "")):
+                item_key = item.get("key")
+                if item_key:
+                    self._stored.add(item_key)
+                if item_key and item_key not in self._entries:
+                    size = len(str(item.get("value", "")).encode("utf-8"))
+                    seeded[item_key] = self._parse_timestamp(item.get("created_at"))
+                    self._entries[item_key] = (cat_name, size)
+                    self._category_bytes[cat_name] += size
+            seeded.update(tracked)  # This session's saves are newer
+            self._tracked[cat_name] = seeded
+
+    def _parse_timestamp(self, value: Optional[str]) -> float:
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+        except ValueError:
+            return self.clock()
+
     def _auto_cleanup(self):
         """
         Automatic cleanup of old context items based on retention policy.
@@ -368,47 +554,71 @@ class ContextManager:
         - Deletes items older than retention_days (if applicable)
         - Keeps only the latest max_items per category
         - Skips categories with retention_days = -1 (indefinite retention)
+
+        Works from the local retention index (seeded once per process).
         """
         logger.info("Auto-cleanup: Checking context items...")
 
+        if not self._tracked_seeded:
+            self._seed_tracking()
+
+        now = self.clock()
         for cat_name, cat_def in self.CATEGORIES.items():
             # Skip indefinite retention categories
             if cat_def.retention_days == -1:
                 continue
 
-            try:
-                # Get all items in category (up to 1000)
-                items = self.get(category=cat_name, limit=1000)
+            tracked = self._tracked[cat_name]
+            cutoff = now - timedelta(days=cat_def.retention_days).total_seconds()
 
-                # Check if cleanup needed
-                if len(items) <= cat_def.max_items:
-                    continue
+            # Oldest first: expired items, then overflow beyond max_items
+            items_to_delete = [key for key, saved_at in tracked.items() if saved_at < cutoff]
+            overflow = len(tracked) - len(items_to_delete) - cat_def.max_items
+            if cat_def.max_items != -1 and overflow > 0:
+                expired = set(items_to_delete)
+                remaining = [key for key in tracked if key not in expired]
+                items_to_delete.extend(remaining[:overflow])
 
-                logger.info(
-                    f"Cleanup needed for {cat_name}: "
-                    f"{len(items)} items > {cat_def.max_items} limit"
-                )
+            if not items_to_delete:
+                continue
 
-                # Sort by created_at timestamp (newest first)
-                items_sorted = sorted(
-                    items,
-                    key=lambda x: x.get("created_at", ""),
-                    reverse=True
-                )
+            logger.info(
+                f"Cleanup needed for {cat_name}: "
+                f"{len(items_to_delete)} of {len(tracked)} items expired or over "
+                f"the {cat_def.max_items} limit"
+            )
+            try:
+                for item_key in items_to_delete:
+                    self._delete(cat_name, item_key)
+            except Exception as e:
+                logger.error(f"Auto-cleanup stopped, context delete failed: {e}")
+                return
 
-                # Items to keep
-                items_to_keep = items_sorted[:cat_def.max_items]
-                items_to_delete = items_sorted[cat_def.max_items:]
+    def _delete(self, category: str, key: str):
+        """Delete one item (pending or stored) and untrack it"""
+        if self._pending.pop(key, None) is not None and not self._pending:
+            self._pending_since = None
 
-                # Delete old items (if delete API available)
-                for item in items_to_delete:
-                    item_key = item.get("key")
-                    logger.info(f"  Marking for deletion: {item_key}")
-                    # Note: memory-keeper may not have delete API
-                    # In that case, items will be kept until manual cleanup
+        if key not in self._stored:
+            # Never flushed: dropping it from the buffer is the whole delete
+            self._untrack(key)
+            return
 
+        if self._delete_supported:
+            try:
+                self.memory_tool('mcp__memory-keeper__context_delete', key=key)
             except Exception as e:
-                logger.error(f"Cleanup failed for {cat_name}: {e}")
+                if not _is_unsupported_tool(e):
+                    raise  # Transient: the item stays tracked for the next cleanup
+                # memory-keeper may not have a delete API; keep items until manual cleanup
+                logger.warning(f"Context delete unavailable ({e}); marking only")
+                self._delete_supported = False
+
+        if not self._delete_supported:
+            logger.info(f"  Marking for deletion: {key}")
+            return
+        self._stored.discard(key)
+        self._untrack(key)
 
     def search(
         self,
@@ -427,6 +637,8 @@ class ContextManager:
         Returns:
             List of matching context items
         """
+        self._flush_before_read()
+
         params = {"query": query, "limit": limit}
 
         if category:
@@ -445,22 +657,29 @@ class ContextManager:
         """
         Get statistics about stored context.
 
+        Served from counters maintained on save and delete: O(categories),
+        no MCP round-trips after the one-time seeding of the local index.
+
         Returns:
             Dictionary with statistics per category
         """
+        if not self._tracked_seeded:
+            self._seed_tracking()
+
         stats = {}
 
-        for cat_name in self.CATEGORIES.keys():
-            try:
-                items = self.get(category=cat_name, limit=1000)
-                stats[cat_name] = {
-                    "count": len(items),
-                    "retention_days": self.CATEGORIES[cat_name].retention_days,
-                    "max_items": self.CATEGORIES[cat_name].max_items
-                }
-            except Exception as e:
-                logger.error(f"Failed to get stats for {cat_name}: {e}")
-                stats[cat_name] = {"count": 0, "error": str(e)}
+        for cat_name, cat_def in self.CATEGORIES.items():
+            tracked = self._tracked[cat_name]
+            oldest = next(iter(tracked.values()), None)
+            newest = tracked[next(reversed(tracked))] if tracked else None
+            stats[cat_name] = {
+                "count": len(tracked),
+                "bytes": self._category_bytes[cat_name],
+                "oldest": datetime.fromtimestamp(oldest).isoformat() if oldest is not None else None,
+                "newest": datetime.fromtimestamp(newest).isoformat() if newest is not None else None,
+                "retention_days": cat_def.retention_days,
+                "max_items": cat_def.max_items
+            }
 
         return stats
 
@@ -474,6 +693,7 @@ class ContextManager:
 
         for cat_name, cat_stats in sorted(stats.items()):
             count = cat_stats.get("count", 0)
+            size_kb = cat_stats.get("bytes", 0) / 1024
             max_items = cat_stats.get("max_items", -1)
             retention = cat_stats.get("retention_days", -1)
 
@@ -483,6 +703,7 @@ class ContextManager:
             print(
                 f"{cat_name:<20} "
                 f"Items: {count:<4} "
+                f"Size: {size_kb:>8.1f}KB "
                 f"Max: {max_str:<10} "
                 f"Retention: {retention_str}"
             )
@@ -0,0 +1,125 @@
+"""
+End-to-End Deadlines for Workflows
+VERSION: 1.0.0 - Contextvar deadline propagation
+
+A workflow sets one deadline at its entry point; every stage below it
+(resilient_task retries, the OCR client, scaffolding generation) reads
+the same deadline from a contextvar instead of using its own hardcoded
+timeout. Stages shrink their timeouts to the time left, skip retries
+that cannot finish in time, and drop work that is already too late.
+
+- The deadline lives in deadline_var, so it follows asyncio tasks and
+  awaits automatically (same mechanism as trace_id_var / span_id_var).
+- Nested scopes can only tighten the deadline, never extend it.
+- Without an active deadline every helper is a no-op.
+
+Usage:
+    from infrastructure.deadline_service import deadline_scope, shrink_timeout
+
+    with deadline_scope(60.0):
+        requests.post(url, json=payload, timeout=shrink_timeout(30))
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+
+class DeadlineExceeded(Exception):
+    """Raised when work starts (or would finish) after the active deadline"""
+    pass
+
+
+@dataclass
+class Deadline:
+    """Absolute point in time (clock seconds) by which a workflow must finish"""
+    expires_at: float
+    clock: Callable[[], float] = time.monotonic
+
+    @classmethod
+    def after(cls, seconds: float, clock: Callable[[], float] = time.monotonic) -> "Deadline":
+        """Deadline `seconds` from now"""
+        return cls(expires_at=clock() + seconds, clock=clock)
+
+    def remaining(self) -> float:
+        """Seconds left (negative once expired)"""
+        return self.expires_at - self.clock()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def timeout(self, default: Optional[float] = None) -> float:
+        """Per-call timeout: the stage default shrunk to the time left (>= 0)"""
+        remaining = max(self.remaining(), 0.0)
+        return remaining if default is None else min(default, remaining)
+
+    def check(self, stage: str = "work"):
+        """Raise DeadlineExceeded if the deadline has passed"""
+        if self.expired():
+            raise DeadlineExceeded(
+                f"{stage} dropped: deadline passed {-self.remaining():.2f}s ago"
+            )
+
+
+# Active deadline for the current workflow (None = unbounded)
+deadline_var: ContextVar[Optional[Deadline]] = ContextVar('deadline', default=None)
+
+
+@contextmanager
+def deadline_scope(
+    seconds: Optional[float],
+    clock: Callable[[], float] = time.monotonic
+) -> Iterator[Optional[Deadline]]:
+    """
+    Activate a deadline for the enclosed block (usable inside async code).
+
+    An enclosing deadline that expires earlier is kept, so a stage can never
+    outlive the workflow that called it.
+
+    Args:
+        seconds: Time budget for the block (None keeps the current deadline)
+        clock: Monotonic clock (injectable for tests)
+
+    Yields:
+        The effective deadline (None if unbounded)
+    """
+    current = deadline_var.get()
+    if seconds is None:
+        yield current
+        return
+
+    deadline = Deadline.after(seconds, clock)
+    if current is not None and current.expires_at <= deadline.expires_at:
+        deadline = current
+
+    token = deadline_var.set(deadline)
+    try:
+        yield deadline
+    finally:
+        deadline_var.reset(token)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """Active deadline in this context, if any"""
+    return deadline_var.get()
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left on the active deadline (None if unbounded)"""
+    deadline = deadline_var.get()
+    return None if deadline is None else deadline.remaining()
+
+
+def shrink_timeout(default: Optional[float]) -> Optional[float]:
+    """A stage's own timeout, shrunk to the time left on the active deadline"""
+    deadline = deadline_var.get()
+    return default if deadline is None else deadline.timeout(default)
+
+
+def check_deadline(stage: str = "work"):
+    """Raise DeadlineExceeded if the active deadline has passed (no-op if unbounded)"""
+    deadline = deadline_var.get()
+    if deadline is not None:
+        deadline.check(stage)
@@ -1,10 +1,15 @@
 """
 Error Handler for Claude Agent SDK
-VERSION: 2.0.0 - Integrated from v5.0 + Korean plan improvements
+VERSION: 2.4.0 - Bounded, indexed error tracking
 
 Provides resilient agent execution with:
-- Automatic retry with exponential backoff
-- Error tracking and statistics
+- Automatic retry with exponential backoff (full jitter)
+- Per-dependency circuit breakers (closed -> open -> half-open)
+- Token-bucket retry budgets capping retries to a share of traffic
+- Opt-in hedged requests: a duplicate call after the observed p95 latency
+- Deadline awareness: attempts shrink to, and retries stop at, the workflow deadline
+- Error tracking in a bounded ring buffer with per-agent/per-type indexes
+  and fingerprint deduplication
 - Human escalation after max retries
 - Memory-keeper integration for error persistence
 
@@ -14,13 +19,20 @@ Based on:
 """
 
 import asyncio
+import hashlib
 import logging
+import random
+import re
+import threading
 import time
+from collections import Counter, OrderedDict, deque
 from functools import wraps
 from typing import Callable, Any, Dict, Optional, List
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from .deadline_service import DeadlineExceeded, current_deadline
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,6 +60,39 @@ class ErrorRecord:
         }
 
 
+# Volatile parts of error messages (ids, hex, numbers) ignored when fingerprinting
+_VOLATILE_RE = re.compile(r"0x[0-9a-f]+|[0-9a-f]{8,}|\d+")
+
+
+def error_fingerprint(agent_name: str, error_type: str, message: str) -> str:
+    """Stable ID for "the same error": agent + type + message without volatile parts"""
+    normalized = _VOLATILE_RE.sub("#", message.lower())[:200]
+    return hashlib.sha1(f"{agent_name}|{error_type}|{normalized}".encode()).hexdigest()[:12]
+
+
+@dataclass
+class ErrorFingerprint:
+    """Deduplicated error: one entry per fingerprint, however often it recurs"""
+    fingerprint: str
+    agent_name: str
+    error_type: str
+    sample_message: str
+    count: int = 0
+    first_seen: str = ""
+    last_seen: str = ""
+
+    def to_dict(self) -> Dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "agent": self.agent_name,
+            "error_type": self.error_type,
+            "message": self.sample_message,
+            "count": self.count,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen
+        }
+
+
 @dataclass
 class RetryConfig:
     """Configuration for retry behavior"""
@@ -55,20 +100,343 @@ class RetryConfig:
     initial_delay: float = 1.0
     backoff_factor: float = 2.0
     max_delay: float = 60.0
+    jitter: bool = True  # Full jitter: sleep uniformly in [0, backoff]
 
     def get_delay(self, retry_count: int) -> float:
-        """Calculate exponential backoff delay: base * 2^(n-1)"""
-        delay = self.initial_delay * (self.backoff_factor ** (retry_count - 1))
-        return min(delay, self.max_delay)
+        """
+        Calculate exponential backoff delay: base * 2^(n-1), capped.
+
+        With jitter, a uniform random delay up to that value is returned so
+        concurrent callers that failed together do not retry together.
+        """
+        delay = min(self.initial_delay * (self.backoff_factor ** (retry_count - 1)), self.max_delay)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-dependency circuit breaker.
+
+    CLOSED: calls pass; `failure_threshold` consecutive failures open it.
+    OPEN: calls are rejected for `recovery_timeout` seconds.
+    HALF_OPEN: up to `half_open_max_calls` probe calls pass; a success
+    closes the circuit, a failure reopens it.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    STATE_CODES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.consecutive_failures = 0
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self):
+        if self._state == self.OPEN and self.clock() - self._opened_at >= self.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit '{self.name}' half-open: probing")
+
+    def allow_request(self) -> bool:
+        """Whether a call may proceed now (counts rejections)"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True
+            self.rejected_count += 1
+            return False
+
+    def release_probe(self):
+        """
+        Give back a half-open probe slot whose call ended without an outcome
+        (cancelled, or cut off by a deadline), so a later call can probe.
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._half_open_calls > 0:
+                self._half_open_calls -= 1
+
+    def record_success(self):
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+            self.consecutive_failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self.consecutive_failures >= self.failure_threshold
+            ):
+                self._state = self.OPEN
+                self._opened_at = self.clock()
+                self.opened_count += 1
+                logger.warning(
+                    f"Circuit '{self.name}' opened after {self.consecutive_failures} failures "
+                    f"(retry in {self.recovery_timeout:.0f}s)"
+                )
+
+    def to_dict(self) -> Dict:
+        state = self.state
+        return {
+            "state": state,
+            "state_code": self.STATE_CODES[state],
+            "consecutive_failures": self.consecutive_failures,
+            "opened_total": self.opened_count,
+            "rejected_total": self.rejected_count,
+        }
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of requests.
+
+    Every first attempt deposits `ratio` tokens and every retry spends one,
+    so sustained retries stay near `ratio` x traffic. `min_per_second`
+    tokens also accrue over time so low-traffic callers can still retry.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._tokens = max_tokens
+        self._last = clock()
+        self.retries_allowed = 0
+        self.retries_rejected = 0
+
+    def _refill(self):
+        now = self.clock()
+        self._tokens = min(self.max_tokens, self._tokens + (now - self._last) * self.min_per_second)
+        self._last = now
+
+    def record_request(self):
+        """Credit the bucket for one first attempt"""
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False if the budget is exhausted"""
+        with self._lock:
+            self._refill()
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self.retries_allowed += 1
+                return True
+            self.retries_rejected += 1
+            return False
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            self._refill()
+            tokens = self._tokens
+        return {
+            "tokens": round(tokens, 2),
+            "retries_allowed_total": self.retries_allowed,
+            "retries_rejected_total": self.retries_rejected,
+        }
+
+
+# Shared per-dependency state (e.g. "mathpix", "anthropic")
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_retry_budgets: Dict[str, RetryBudget] = {}
+_registry_lock = threading.Lock()
+
+
+def get_circuit_breaker(dependency: str, **kwargs) -> CircuitBreaker:
+    """Return the shared breaker for a dependency (kwargs apply on first use)"""
+    with _registry_lock:
+        if dependency not in _circuit_breakers:
+            _circuit_breakers[dependency] = CircuitBreaker(dependency, **kwargs)
+        return _circuit_breakers[dependency]
+
+
+def get_retry_budget(dependency: str, **kwargs) -> RetryBudget:
+    """Return the shared retry budget for a dependency (kwargs apply on first use)"""
+    with _registry_lock:
+        if dependency not in _retry_budgets:
+            _retry_budgets[dependency] = RetryBudget(**kwargs)
+        return _retry_budgets[dependency]
+
+
+@dataclass
+class HedgeConfig:
+    """
+    Opt-in request hedging for resilient_task.
+
+    If a call has not finished after the p95 latency observed by
+    `monitor` for `agent_name`, one duplicate is launched; the first
+    successful result wins and the other call is cancelled. Hedges draw
+    from `budget`, so extra load stays near budget.ratio x traffic.
+    Only use for idempotent calls.
+
+    With record_latency, winning latencies go to a separate
+    "<agent_name>:hedged" series; the delay only reads `agent_name`, so
+    hedged calls never feed back into their own hedge delay.
+    """
+    monitor: Any  # PerformanceMonitor
+    agent_name: str
+    quantile: float = 0.95
+    window: str = "5m"  # Recent window preferred over lifetime stats
+    min_samples: int = 20  # No hedging until this many latencies are known
+    min_delay_ms: float = 10.0
+    record_latency: bool = False  # Record winning latencies as "<agent_name>:hedged"
+    budget: RetryBudget = field(
+        default_factory=lambda: RetryBudget(ratio=0.05, min_per_second=0.1, max_tokens=5.0)
+    )
+    hedges_launched: int = 0
+    hedges_won: int = 0
+    hedges_skipped: int = 0
+
+    def hedge_delay_s(self) -> Optional[float]:
+        """Seconds to wait before hedging, or None if there is not enough data"""
+        latency_ms = None
+        stats = self.monitor.get_window_stats(self.agent_name, self.window)
+        if stats and stats.count >= self.min_samples:
+            latency_ms = stats.quantile(self.quantile)
+        else:
+            metrics = self.monitor.get_metrics(self.agent_name)
+            if metrics and metrics.execution_count >= self.min_samples:
+                latency_ms = metrics.duration_sketch.quantile(self.quantile)
+        if latency_ms is None:
+            return None
+        return max(latency_ms, self.min_delay_ms) / 1000
+
+    def to_dict(self) -> Dict:
+        return {
+            "hedges_launched_total": self.hedges_launched,
+            "hedges_won_total": self.hedges_won,
+            "hedges_skipped_total": self.hedges_skipped,
+            "budget": self.budget.to_dict(),
+        }
+
+
+async def _hedged_call(func: Callable, args: tuple, kwargs: Dict, hedge: HedgeConfig) -> Any:
+    """Run func, launching one duplicate if it outlives the hedge delay"""
+    hedge.budget.record_request()
+    delay = hedge.hedge_delay_s()
+
+    async def attempt(index: int):
+        started = time.perf_counter()
+        result = await func(*args, **kwargs)
+        return index, result, (time.perf_counter() - started) * 1000
+
+    tasks = [asyncio.ensure_future(attempt(0))]
+    try:
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                if hedge.budget.try_spend():
+                    hedge.hedges_launched += 1
+                    tasks.append(asyncio.ensure_future(attempt(1)))
+                else:
+                    hedge.hedges_skipped += 1
+
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is not None:
+                    error = task.exception()
+                    continue
+                index, result, latency_ms = task.result()
+                if index == 1:
+                    hedge.hedges_won += 1
+                if hedge.record_latency:
+                    hedge.monitor.record_execution(
+                        f"{hedge.agent_name}:hedged", latency_ms, success=True
+                    )
+                return result
+        raise error
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_resilience_metrics() -> Dict[str, Dict]:
+    """
+    Breaker and retry-budget state per dependency.
+
+    Returns:
+        {dependency: {"circuit": {...}, "retry_budget": {...}}}
+    """
+    with _registry_lock:
+        names = set(_circuit_breakers) | set(_retry_budgets)
+        breakers = dict(_circuit_breakers)
+        budgets = dict(_retry_budgets)
+    return {
+        name: {
+            "circuit": breakers[name].to_dict() if name in breakers else None,
+            "retry_budget": budgets[name].to_dict() if name in budgets else None,
+        }
+        for name in sorted(names)
+    }
 
 
 class ErrorTracker:
-    """Tracks errors per agent-task combination with escalation logic"""
+    """
+    Tracks errors per agent-task combination with escalation logic.
+
+    Full records (with context snapshots) are kept in a ring buffer of
+    `max_logs` entries, indexed by agent and error type. Every error is
+    also folded into a fingerprint entry (count, first/last seen), and
+    per-agent/per-type totals are kept as running counters, so summaries
+    stay exact after old records have been evicted.
+    """
 
-    def __init__(self, max_retries: int = 3):
+    def __init__(self, max_retries: int = 3, max_logs: int = 1000, max_fingerprints: int = 500):
         self.max_retries = max_retries
         self.error_history: Dict[str, int] = {}  # key -> retry count
-        self.error_logs: List[ErrorRecord] = []
+        self.error_logs: deque = deque(maxlen=max_logs)
+        self._by_agent: Dict[str, deque] = {}
+        self._by_type: Dict[str, deque] = {}
+        self.max_fingerprints = max_fingerprints
+        self.fingerprints: "OrderedDict[str, ErrorFingerprint]" = OrderedDict()  # LRU by last_seen
+        self.total_errors = 0
+        self.agent_counts: Counter = Counter()
+        self.type_counts: Counter = Counter()
 
     def get_error_key(self, agent_name: str, task_id: str) -> str:
         """Generate unique key for agent-task combination"""
@@ -101,7 +469,7 @@ class ErrorTracker:
             retry_count=current_count,
             context_snapshot=context
         )
-        self.error_logs.append(record)
+        self._store(record)
 
         logger.warning(
             f"Error recorded for {agent_name}/{task_id}: "
@@ -110,6 +478,42 @@ class ErrorTracker:
 
         return current_count
 
+    def _store(self, record: ErrorRecord):
+        """Append to the ring buffer, indexes, counters and fingerprints"""
+        if len(self.error_logs) == self.error_logs.maxlen:
+            # The evicted record is the oldest overall, hence the oldest in its indexes too
+            evicted = self.error_logs[0]
+            for index, name in ((self._by_agent, evicted.agent_name), (self._by_type, evicted.error_type)):
+                bucket = index[name]
+                bucket.popleft()
+                if not bucket:
+                    del index[name]
+        self.error_logs.append(record)
+        self._by_agent.setdefault(record.agent_name, deque()).append(record)
+        self._by_type.setdefault(record.error_type, deque()).append(record)
+
+        self.total_errors += 1
+        self.agent_counts[record.agent_name] += 1
+        self.type_counts[record.error_type] += 1
+
+        fingerprint = error_fingerprint(record.agent_name, record.error_type, record.error_message)
+        entry = self.fingerprints.get(fingerprint)
+        if entry is None:
+            entry = ErrorFingerprint(
+                fingerprint=fingerprint,
+                agent_name=record.agent_name,
+                error_type=record.error_type,
+                sample_message=record.error_message[:500],
+                first_seen=record.timestamp
+            )
+            self.fingerprints[fingerprint] = entry
+            if len(self.fingerprints) > self.max_fingerprints:
+                self.fingerprints.popitem(last=False)  # Least recently seen
+        else:
+            self.fingerprints.move_to_end(fingerprint)
+        entry.count += 1
+        entry.last_seen = record.timestamp
+
     def should_escalate(self, agent_name: str, task_id: str) -> bool:
         """
         Check if error count exceeded max_retries.
@@ -125,34 +529,41 @@ class ErrorTracker:
             del self.error_history[key]
             logger.info(f"Error counter reset for {agent_name}/{task_id}")
 
-    def get_error_logs(self, agent_name: Optional[str] = None) -> List[ErrorRecord]:
-        """Retrieve error logs (optionally filtered by agent)"""
+    def get_error_logs(
+        self,
+        agent_name: Optional[str] = None,
+        error_type: Optional[str] = None
+    ) -> List[ErrorRecord]:
+        """Retrieve retained error logs, oldest first (optionally by agent and/or type)"""
+        if agent_name and error_type:
+            return [r for r in self._by_agent.get(agent_name, ()) if r.error_type == error_type]
         if agent_name:
-            return [log for log in self.error_logs if log.agent_name == agent_name]
-        return self.error_logs
+            return list(self._by_agent.get(agent_name, ()))
+        if error_type:
+            return list(self._by_type.get(error_type, ()))
+        return list(self.error_logs)
 
     def get_error_summary(self) -> Dict:
-        """Get error statistics"""
-        if not self.error_logs:
+        """Get error statistics (O(distinct fingerprints), exact despite eviction)"""
+        if not self.total_errors:
             return {"total_errors": 0}
 
-        by_agent: Dict[str, int] = {}
-        by_type: Dict[str, int] = {}
-
-        for record in self.error_logs:
-            by_agent[record.agent_name] = by_agent.get(record.agent_name, 0) + 1
-            by_type[record.error_type] = by_type.get(record.error_type, 0) + 1
-
         return {
-            "total_errors": len(self.error_logs),
-            "by_agent": by_agent,
-            "by_type": by_type
+            "total_errors": self.total_errors,
+            "retained_errors": len(self.error_logs),
+            "by_agent": dict(self.agent_counts),
+            "by_type": dict(self.type_counts),
+            "distinct_errors": len(self.fingerprints),
+            "fingerprints": [
+                entry.to_dict()
+                for entry in sorted(self.fingerprints.values(), key=lambda e: e.count, reverse=True)
+            ]
         }
 
     def save_to_memory_keeper(self, memory_save_func: Callable):
         """
         Persist error tracker state to memory-keeper.
-        Stores last 100 errors for debugging.
+        Stores the last 100 errors and all fingerprints for debugging.
 
         Args:
             memory_save_func: Function to call memory-keeper save
@@ -162,7 +573,8 @@ class ErrorTracker:
 
         state = {
             "error_history": self.error_history,
-            "error_logs": [log.to_dict() for log in self.error_logs[-100:]],
+            "error_logs": [log.to_dict() for log in list(self.error_logs)[-100:]],
+            "fingerprints": [entry.to_dict() for entry in self.fingerprints.values()],
             "timestamp": datetime.now().isoformat()
         }
 
@@ -217,18 +629,42 @@ class RetryPolicy:
         return any(pattern in error_msg for pattern in retryable_patterns)
 
 
-def resilient_task(config: Optional[RetryConfig] = None):
+def resilient_task(
+    config: Optional[RetryConfig] = None,
+    dependency: Optional[str] = None,
+    breaker: Optional[CircuitBreaker] = None,
+    budget: Optional[RetryBudget] = None,
+    hedge: Optional[HedgeConfig] = None
+):
     """
     Decorator for resilient agent task execution with retry and backoff.
 
     Usage:
-        @resilient_task(RetryConfig(max_retries=3, initial_delay=1.0))
+        @resilient_task(RetryConfig(max_retries=3, initial_delay=1.0), dependency="mathpix")
         async def call_agent(prompt: str):
             # SDK Task call here
             pass
 
+    With a dependency name, all decorated calls to that dependency share
+    one circuit breaker and one retry budget: an open circuit fails calls
+    fast with CircuitOpenError, and retries stop once the budget is spent.
+    Only retryable (transient) errors count as breaker failures; non-retryable
+    errors leave the breaker unchanged.
+
+    With a HedgeConfig, each attempt that outlives the observed p95
+    latency gets one duplicate (see HedgeConfig); retries still apply if
+    both copies fail.
+
+    Under an active workflow deadline (see deadline_service), each attempt
+    is cut off when the deadline passes (DeadlineExceeded, never retried)
+    and a retry whose backoff would end past the deadline is skipped.
+
     Args:
         config: Retry configuration (uses defaults if None)
+        dependency: Name of the upstream dependency (enables breaker + budget)
+        breaker: Explicit circuit breaker (overrides the shared one)
+        budget: Explicit retry budget (overrides the shared one)
+        hedge: Opt-in hedging policy (idempotent calls only)
 
     Returns:
         Decorated async function with retry logic
@@ -237,15 +673,45 @@ def resilient_task(config: Optional[RetryConfig] = None):
         config = RetryConfig()
 
     retry_policy = RetryPolicy(config.initial_delay, config.max_delay)
+    if dependency:
+        breaker = breaker or get_circuit_breaker(dependency)
+        budget = budget or get_retry_budget(dependency)
 
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args, **kwargs) -> Any:
             retries = 0
+            if budget:
+                budget.record_request()
 
             while retries < config.max_retries:
+                deadline = current_deadline()
+                if deadline:
+                    deadline.check(func.__name__)
+
+                if breaker and not breaker.allow_request():
+                    raise CircuitOpenError(
+                        f"{func.__name__}: circuit '{breaker.name}' is open"
+                    )
+
+                recorded = False
                 try:
-                    result = await func(*args, **kwargs)
+                    call = _hedged_call(func, args, kwargs, hedge) if hedge else func(*args, **kwargs)
+                    if deadline:
+                        try:
+                            result = await asyncio.wait_for(call, timeout=deadline.remaining())
+                        except asyncio.TimeoutError:
+                            if not deadline.expired():
+                                raise  # The call's own timeout, not ours
+                            raise DeadlineExceeded(
+                                f"{func.__name__} cut off at the workflow deadline"
+                            ) from None
+                    else:
+                        result = await call
+
+                    if breaker:
+                        breaker.record_success()
+                        recorded = True
 
                     # Success - reset retry counter if tracking
                     if retries > 0:
@@ -255,11 +721,22 @@ def resilient_task(config: Optional[RetryConfig] = None):
 
                     return result
 
+                except DeadlineExceeded:
+                    raise  # Too late to be useful; never retried or counted against the breaker
+
                 except Exception as e:
                     retries += 1
+                    retryable = retry_policy.should_retry(e)
+
+                    if breaker and retryable:
+                        # Only transient errors count against the dependency; a
+                        # non-retryable one leaves the breaker as it was (the
+                        # finally below just gives back a half-open probe slot)
+                        breaker.record_failure()
+                        recorded = True
 
                     # Check if retryable
-                    if not retry_policy.should_retry(e):
+                    if not retryable:
                         logger.error(
                             f"{func.__name__} failed with non-retryable error: {e}",
                             exc_info=True
@@ -274,9 +751,25 @@ def resilient_task(config: Optional[RetryConfig] = None):
                         )
                         raise
 
+                    # Check the shared retry budget
+                    if budget and not budget.try_spend():
+                        logger.error(
+                            f"{func.__name__} failed; retry budget exhausted "
+                            f"for '{dependency or func.__name__}': {e}"
+                        )
+                        raise
+
                     # Calculate backoff delay
                     delay = config.get_delay(retries)
 
+                    # Skip a retry that could not even start before the deadline
+                    if deadline and deadline.remaining() <= delay:
+                        logger.error(
+                            f"{func.__name__} failed; no time left before the "
+                            f"deadline to retry: {e}"
+                        )
+                        raise
+
                     logger.warning(
                         f"{func.__name__} failed (attempt {retries}/{config.max_retries}). "
                         f"Retrying in {delay:.1f}s... Error: {e}"
@@ -284,6 +777,12 @@ def resilient_task(config: Optional[RetryConfig] = None):
 
                     await asyncio.sleep(delay)
 
+                finally:
+                    # Cancelled or cut off by the deadline: no verdict on the
+                    # dependency, but a half-open probe slot must not leak
+                    if breaker and not recorded:
+                        breaker.release_probe()
+
             raise Exception(
                 f"{func.__name__} failed after {config.max_retries} retries"
             )
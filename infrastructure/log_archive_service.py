@@ -0,0 +1,416 @@
+"""
+Columnar Log Archive for StructuredLogger JSONL Files
+VERSION: 1.0.0 - Daily columnar segments + vectorized aggregations
+
+Compacts closed daily JSONL logs (agent-YYYYMMDD[-N].jsonl) into one
+columnar file per day, so queries read only the columns they need instead
+of json.loads-ing every line.
+
+Archive layout (agent-YYYYMMDD.mlc):
+    MAGIC | header length (uint32 LE) | header JSON | column blocks
+
+    Each column block is zlib-compressed. The header lists every column with
+    its kind, offset and length:
+    - "array": typed stdlib array (ts_ms int64, duration_ms float64 with NaN
+      for missing, success int8 with -1 for missing)
+    - "dict": dictionary-encoded strings (uint32 codes + value list) for
+      agent_name, event_type, level, trace_id and error_type
+    - "json": per-row JSON text (message, metadata), only decoded on demand
+
+Scans work on whole columns: a filter is resolved to dictionary codes once
+per file, turned into a row mask, and rows are selected and counted with
+itertools.compress / Counter over the typed arrays, so agent/event filters
+never touch strings (or run a Python loop) row by row.
+
+Usage:
+    from infrastructure.log_archive_service import compact_logs, load_tables, agent_latency
+    compact_logs("/tmp/math-agent-logs")
+    tables = load_tables("/tmp/math-agent-logs", since="2025-10-01")
+    for row in agent_latency(tables):
+        print(row["agent_name"], row["p95_ms"])
+"""
+
+import json
+import math
+from collections import Counter
+from itertools import compress, filterfalse
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+MAGIC = b"MLCOL01\n"
+ARCHIVE_SUFFIX = ".mlc"
+LOG_PREFIX = "agent"
+
+# name -> typecode for typed numeric columns
+ARRAY_COLUMNS = {"ts_ms": "q", "duration_ms": "d", "success": "b"}
+DICT_COLUMNS = ("agent_name", "event_type", "level", "trace_id", "error_type")
+JSON_COLUMNS = ("message", "metadata")
+
+
+@dataclass
+class DictColumn:
+    """Dictionary-encoded string column"""
+    codes: array
+    values: List[Optional[str]]
+
+    def codes_for(self, wanted: Iterable[Optional[str]]) -> set:
+        """Codes whose value is in `wanted` (filter without decoding rows)"""
+        wanted = set(wanted)
+        return {code for code, value in enumerate(self.values) if value in wanted}
+
+    def mask_for(self, wanted: Iterable[Optional[str]]) -> bytes:
+        """Row mask (1 where the value is in `wanted`) for itertools.compress"""
+        return bytes(map(self.codes_for(wanted).__contains__, self.codes))
+
+
+class _DictBuilder:
+    def __init__(self):
+        self.codes = array("I")
+        self.index: Dict[Optional[str], int] = {}
+        self.values: List[Optional[str]] = []
+
+    def append(self, value: Optional[str]):
+        code = self.index.get(value)
+        if code is None:
+            code = self.index[value] = len(self.values)
+            self.values.append(value)
+        self.codes.append(code)
+
+    def build(self) -> DictColumn:
+        return DictColumn(self.codes, self.values)
+
+
+def _parse_ts_ms(timestamp: Optional[str]) -> int:
+    if not timestamp:
+        return 0
+    try:
+        return int(datetime.fromisoformat(timestamp.replace("Z", "+00:00")).timestamp() * 1000)
+    except ValueError:
+        return 0
+
+
+def entries_to_columns(entries: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build in-memory columns from parsed log entries.
+
+    Args:
+        entries: LogEntry dicts as written by StructuredLogger
+
+    Returns:
+        Column name -> array, DictColumn or list of JSON text
+    """
+    numeric = {name: array(code) for name, code in ARRAY_COLUMNS.items()}
+    dicts = {name: _DictBuilder() for name in DICT_COLUMNS}
+    texts: Dict[str, List[str]] = {name: [] for name in JSON_COLUMNS}
+
+    for entry in entries:
+        metadata = entry.get("metadata") or {}
+        duration = entry.get("duration_ms")
+        success = metadata.get("success") if isinstance(metadata, dict) else None
+
+        numeric["ts_ms"].append(_parse_ts_ms(entry.get("timestamp")))
+        numeric["duration_ms"].append(float(duration) if duration is not None else math.nan)
+        numeric["success"].append(-1 if success is None else int(bool(success)))
+
+        dicts["agent_name"].append(entry.get("agent_name"))
+        dicts["event_type"].append(entry.get("event_type"))
+        dicts["level"].append(entry.get("level"))
+        dicts["trace_id"].append(entry.get("trace_id"))
+        dicts["error_type"].append(metadata.get("error_type") if isinstance(metadata, dict) else None)
+
+        texts["message"].append(json.dumps(entry.get("message"), ensure_ascii=False))
+        texts["metadata"].append(json.dumps(metadata, ensure_ascii=False))
+
+    columns: Dict[str, Any] = dict(numeric)
+    columns.update({name: builder.build() for name, builder in dicts.items()})
+    columns.update(texts)
+    return columns
+
+
+def read_jsonl_columns(paths: Iterable[Path]) -> Dict[str, Any]:
+    """Parse JSONL log files (in order) into columns; bad lines are skipped"""
+    def entries():
+        for path in paths:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+    return entries_to_columns(entries())
+
+
+def write_archive(path: Path, columns: Dict[str, Any]):
+    """Write columns to a columnar archive file (atomically)"""
+    blocks: List[bytes] = []
+    specs: List[Dict[str, Any]] = []
+    offset = 0
+
+    for name, column in columns.items():
+        spec: Dict[str, Any] = {"name": name}
+        if isinstance(column, DictColumn):
+            spec.update(kind="dict", dtype=column.codes.typecode, values=column.values)
+            raw = column.codes.tobytes()
+        elif isinstance(column, array):
+            spec.update(kind="array", dtype=column.typecode)
+            raw = column.tobytes()
+        else:
+            spec.update(kind="json")
+            raw = "\n".join(column).encode("utf-8")
+        block = zlib.compress(raw, 6)
+        spec.update(offset=offset, length=len(block))
+        offset += len(block)
+        specs.append(spec)
+        blocks.append(block)
+
+    rows = len(columns["ts_ms"]) if "ts_ms" in columns else 0
+    header = json.dumps({"rows": rows, "columns": specs}, ensure_ascii=False).encode("utf-8")
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+    tmp_path.replace(path)
+
+
+def read_archive(path: Path, columns: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+    """
+    Read selected columns from an archive file.
+
+    Args:
+        path: Archive file
+        columns: Column names to load (default: all)
+
+    Returns:
+        Column name -> array, DictColumn or list of JSON text
+    """
+    wanted = set(columns) if columns is not None else None
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a columnar log archive: {path}")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len))
+        data_start = f.tell()
+
+        result: Dict[str, Any] = {}
+        for spec in header["columns"]:
+            if wanted is not None and spec["name"] not in wanted:
+                continue
+            f.seek(data_start + spec["offset"])
+            raw = zlib.decompress(f.read(spec["length"]))
+            if spec["kind"] == "json":
+                result[spec["name"]] = raw.decode("utf-8").split("\n") if header["rows"] else []
+                continue
+            values = array(spec["dtype"])
+            values.frombytes(raw)
+            if spec["kind"] == "dict":
+                result[spec["name"]] = DictColumn(values, spec["values"])
+            else:
+                result[spec["name"]] = values
+    return result
+
+
+def _day_of(path: Path) -> Optional[str]:
+    """YYYYMMDD from agent-YYYYMMDD[-N].jsonl / .mlc, or None"""
+    stem = path.name.split(".", 1)[0]
+    prefix, _, rest = stem.partition("-")
+    day = rest.partition("-")[0]
+    if prefix != LOG_PREFIX or len(day) != 8 or not day.isdigit():
+        return None
+    return day
+
+
+def _segment_index(path: Path) -> int:
+    index = path.stem.split("-")[2:]
+    return int(index[0]) if index and index[0].isdigit() else 0
+
+
+def _jsonl_by_day(log_dir: Path) -> Dict[str, List[Path]]:
+    days: Dict[str, List[Path]] = {}
+    for path in log_dir.glob(f"{LOG_PREFIX}-*.jsonl"):
+        day = _day_of(path)
+        if day:
+            days.setdefault(day, []).append(path)
+    for paths in days.values():
+        paths.sort(key=_segment_index)
+    return days
+
+
+def compact_logs(
+    log_dir: str,
+    archive_dir: Optional[str] = None,
+    delete: bool = False,
+    today: Optional[date] = None
+) -> List[Path]:
+    """
+    Convert closed daily JSONL logs into columnar archives.
+
+    A day is closed once it is before `today`; today's file is still being
+    written. Days whose archive is newer than all of their segments are
+    skipped, so this is safe to run repeatedly.
+
+    Args:
+        log_dir: StructuredLogger log directory
+        archive_dir: Where to write archives (default: {log_dir}/archive)
+        delete: Remove the JSONL segments after archiving
+        today: Override the current date (for tests)
+
+    Returns:
+        Archive files written
+    """
+    log_path = Path(log_dir)
+    out_dir = Path(archive_dir) if archive_dir else log_path / "archive"
+    cutoff = (today or date.today()).strftime("%Y%m%d")
+    written: List[Path] = []
+
+    for day, segments in sorted(_jsonl_by_day(log_path).items()):
+        if day >= cutoff:
+            continue
+        archive_path = out_dir / f"{LOG_PREFIX}-{day}{ARCHIVE_SUFFIX}"
+        newest = max(p.stat().st_mtime for p in segments)
+        if archive_path.exists() and archive_path.stat().st_mtime >= newest:
+            continue
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        write_archive(archive_path, read_jsonl_columns(segments))
+        written.append(archive_path)
+        if delete:
+            for segment in segments:
+                segment.unlink()
+
+    return written
+
+
+def load_tables(
+    log_dir: str,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    columns: Optional[Iterable[str]] = None,
+    archive_dir: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """
+    Load one column table per day in [since, until].
+
+    Archived days are read from their columnar file; days not archived yet
+    (including today) fall back to parsing their JSONL segments.
+
+    Args:
+        log_dir: StructuredLogger log directory
+        since: First day (YYYY-MM-DD or YYYYMMDD), inclusive
+        until: Last day, inclusive
+        columns: Columns to load from archives (default: all)
+        archive_dir: Archive directory (default: {log_dir}/archive)
+
+    Returns:
+        List of column tables, oldest day first
+    """
+    log_path = Path(log_dir)
+    out_dir = Path(archive_dir) if archive_dir else log_path / "archive"
+    lo = since.replace("-", "") if since else "00000000"
+    hi = until.replace("-", "") if until else "99999999"
+
+    archives = {
+        _day_of(p): p for p in out_dir.glob(f"{LOG_PREFIX}-*{ARCHIVE_SUFFIX}") if _day_of(p)
+    } if out_dir.exists() else {}
+    jsonl = _jsonl_by_day(log_path)
+
+    tables = []
+    for day in sorted(set(archives) | set(jsonl)):
+        if not lo <= day <= hi:
+            continue
+        if day in archives:
+            tables.append(read_archive(archives[day], columns))
+        else:
+            tables.append(read_jsonl_columns(jsonl[day]))
+    return tables
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = math.floor(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def agent_latency(tables: List[Dict[str, Any]], event_type: str = "agent_complete") -> List[Dict[str, Any]]:
+    """
+    Per-agent duration_ms statistics for one event type.
+
+    Returns:
+        Rows with agent_name, count, mean_ms, p50_ms, p95_ms, p99_ms, max_ms,
+        slowest agents (by p95) first
+    """
+    durations: Dict[Optional[str], List[float]] = {}
+
+    for table in tables:
+        agents: DictColumn = table["agent_name"]
+        if not table["event_type"].codes_for([event_type]):
+            continue
+        mask = table["event_type"].mask_for([event_type])
+        agent_codes = array(agents.codes.typecode, compress(agents.codes, mask))
+        selected = array("d", compress(table["duration_ms"], mask))
+        for agent_code in set(agent_codes):
+            values = list(filterfalse(math.isnan, compress(selected, map(agent_code.__eq__, agent_codes))))
+            if values:
+                durations.setdefault(agents.values[agent_code], []).extend(values)
+
+    rows = []
+    for agent, values in durations.items():
+        values.sort()
+        rows.append({
+            "agent_name": agent,
+            "count": len(values),
+            "mean_ms": sum(values) / len(values),
+            "p50_ms": _percentile(values, 50),
+            "p95_ms": _percentile(values, 95),
+            "p99_ms": _percentile(values, 99),
+            "max_ms": values[-1],
+        })
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return rows
+
+
+def agent_errors(tables: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Per-agent error counts (level ERROR) with error type breakdown.
+
+    Returns:
+        Rows with agent_name, events, errors, error_rate, by_type;
+        most errors first
+    """
+    totals: Dict[Optional[str], Dict[str, Any]] = {}
+
+    for table in tables:
+        agents: DictColumn = table["agent_name"]
+        error_types: DictColumn = table["error_type"]
+        mask = table["level"].mask_for(["ERROR"])
+
+        events = Counter(agents.codes)
+        errors = Counter(zip(compress(agents.codes, mask), compress(error_types.codes, mask)))
+
+        for agent_code, count in events.items():
+            row = totals.setdefault(agents.values[agent_code], {"events": 0, "errors": 0, "by_type": {}})
+            row["events"] += count
+        for (agent_code, type_code), count in errors.items():
+            row = totals[agents.values[agent_code]]
+            row["errors"] += count
+            error_type = error_types.values[type_code] or "unknown"
+            row["by_type"][error_type] = row["by_type"].get(error_type, 0) + count
+
+    rows = [
+        {"agent_name": agent, **row, "error_rate": row["errors"] / row["events"]}
+        for agent, row in totals.items()
+    ]
+    rows.sort(key=lambda r: r["errors"], reverse=True)
+    return rows
@@ -1,30 +1,50 @@
 """
 Structured Logger for Multi-Agent System
-VERSION: 2.0.0 - Integrated from v5.0 + Korean plan improvements
+VERSION: 2.2.0 - Fast-path JSON formatter
 
 Provides JSON logging with:
 - trace_id propagation for distributed tracing
 - Structured LogEntry dataclass
 - JSONL file output for log analysis
 - Agent-aware logging context
+- Buffered background writer: logging on the hot path is one queue put;
+  a writer thread serializes, batches and rotates files (daily + size)
+- FastJSONFormatter: same fields, values and key order as JSONFormatter,
+  with cached call-site fragments and timestamp prefixes (uses orjson when
+  installed: equivalent JSON, but nested values are written compactly)
 
 Based on:
 - scalable.pdf: Observability patterns for multi-agent systems
 - OpenTelemetry-inspired trace propagation
 """
 
+import atexit
 import json
 import logging
+import queue
 import sys
+import threading
+import time
 from datetime import datetime
 from typing import Optional, Dict, Any
 from contextvars import ContextVar
 from dataclasses import dataclass, asdict
 from pathlib import Path
 
+try:
+    import orjson  # Optional: faster serialization
+except ImportError:
+    orjson = None
+
 # Context variable for trace_id propagation across async boundaries
 trace_id_var: ContextVar[Optional[str]] = ContextVar('trace_id', default=None)
 
+# Buffered sink tuning
+LOG_QUEUE_MAXSIZE = 10_000  # Entries buffered before new ones are dropped
+LOG_FLUSH_SIZE = 200  # Flush the file after this many entries...
+LOG_FLUSH_INTERVAL_S = 0.5  # ...or once the oldest unflushed entry is this old
+MAX_LOG_BYTES = 50 * 1024 * 1024  # Size-based rotation threshold per file
+
 
 @dataclass
 class LogEntry:
@@ -82,6 +102,98 @@ class JSONFormatter(logging.Formatter):
         return json.dumps(log_data, ensure_ascii=False)
 
 
+# json.dumps(ensure_ascii=False) builds a new encoder per call; reuse one
+_json_encoder = json.JSONEncoder(ensure_ascii=False)
+_encode_str = json.encoder.encode_basestring
+
+
+def _dumps(value: Any) -> str:
+    """
+    Serialize like json.dumps(ensure_ascii=False).
+
+    With orjson installed the result is equivalent JSON but not
+    byte-identical: dicts and lists come out without spaces after ':' and
+    ',', and floats use orjson's shortest repr. Without orjson it matches
+    json.dumps exactly.
+    """
+    if type(value) is str:
+        return _encode_str(value)
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            pass  # e.g. ints beyond 64 bits; json handles them
+    return _json_encoder.encode(value)
+
+
+_EXTRA_FIELDS = ("agent_name", "duration_ms", "event_type", "metadata")
+_CALL_SITE_CACHE_MAX = 4096
+
+
+class FastJSONFormatter(JSONFormatter):
+    """
+    JSONFormatter with the same fields and key order, built from cached
+    fragments instead of a fresh dict per record. Output parses to the same
+    JSON; nested metadata is only byte-identical without orjson (see _dumps).
+
+    - level and module/function/line are pre-serialized once per level and
+      per call site
+    - the timestamp comes from record.created, reusing the formatted
+      "YYYY-MM-DDTHH:MM:SS." prefix while the second doesn't change
+    - extras are looked up in record.__dict__ instead of four hasattr calls
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._ts_cache = (-1, "")  # (epoch second, '{"timestamp": "...:SS.')
+        self._levels: Dict[str, str] = {}
+        self._call_sites: Dict[tuple, str] = {}
+
+    def _timestamp_prefix(self, created: float) -> tuple:
+        second = int(created)
+        cached_second, prefix = self._ts_cache
+        if second != cached_second:
+            prefix = '{"timestamp": "' + time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)) + "."
+            self._ts_cache = (second, prefix)
+        return second, prefix
+
+    def format(self, record: logging.LogRecord) -> str:
+        """Format log record as JSON string"""
+        second, prefix = self._timestamp_prefix(record.created)
+        micros = int((record.created - second) * 1_000_000)
+
+        level = self._levels.get(record.levelname)
+        if level is None:
+            level = self._levels[record.levelname] = f', "level": {_dumps(record.levelname)}'
+
+        site_key = (record.name, record.funcName, record.lineno)
+        site = self._call_sites.get(site_key)
+        if site is None:
+            if len(self._call_sites) >= _CALL_SITE_CACHE_MAX:
+                self._call_sites.clear()
+            site = self._call_sites[site_key] = (
+                f', "module": {_dumps(record.name)}, "function": {_dumps(record.funcName)}'
+                f', "line": {record.lineno}'
+            )
+
+        parts = [prefix, f'{micros:06d}Z"', level, ', "message": ', _dumps(record.getMessage()), site]
+
+        trace_id = trace_id_var.get()
+        if trace_id:
+            parts += [', "trace_id": ', _dumps(trace_id)]
+
+        if record.exc_info:
+            parts += [', "exc_info": ', _dumps(self.formatException(record.exc_info))]
+
+        attrs = record.__dict__
+        for field in _EXTRA_FIELDS:
+            if field in attrs:
+                parts += [f', "{field}": ', _dumps(attrs[field])]
+
+        parts.append("}")
+        return "".join(parts)
+
+
 def setup_structured_logger(
     name: str = "math_agents",
     level: int = logging.INFO,
@@ -106,7 +218,7 @@ def setup_structured_logger(
 
     # Console handler with JSON formatting
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(JSONFormatter())
+    console_handler.setFormatter(FastJSONFormatter())
     logger.addHandler(console_handler)
 
     # File handler if specified
@@ -116,7 +228,7 @@ def setup_structured_logger(
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
         file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
-        file_handler.setFormatter(JSONFormatter())
+        file_handler.setFormatter(FastJSONFormatter())
         logger.addHandler(file_handler)
 
     logger.propagate = False
@@ -200,16 +312,220 @@ class AgentLogger:
         )
 
 
+class _FlushRequest:
+    """Queue marker: writer flushes everything before it, then sets done"""
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+_CLOSE = object()
+
+
+class BufferedJSONLSink:
+    """
+    Background JSONL writer shared by all loggers of one log directory.
+
+    put() only enqueues. A daemon thread serializes entries, writes them to
+    an open file handle and flushes after LOG_FLUSH_SIZE entries or
+    LOG_FLUSH_INTERVAL_S, whichever comes first. Files are named
+    {prefix}-YYYYMMDD.jsonl and roll over at midnight (by entry timestamp)
+    or when max_bytes is reached ({prefix}-YYYYMMDD-1.jsonl, -2, ...).
+    When the queue is full, entries are dropped and counted rather than
+    blocking the caller.
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        prefix: str = "agent",
+        max_bytes: int = MAX_LOG_BYTES,
+        flush_size: int = LOG_FLUSH_SIZE,
+        flush_interval_s: float = LOG_FLUSH_INTERVAL_S,
+        maxsize: int = LOG_QUEUE_MAXSIZE
+    ):
+        self.log_dir = Path(log_dir)
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.flush_size = flush_size
+        self.flush_interval_s = flush_interval_s
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._file = None
+        self._day: Optional[str] = None
+        self._index = 0
+        self._bytes = 0
+        self.written_count = 0
+        self.dropped_count = 0
+
+    # ---------------------------- Caller side ----------------------------
+
+    def put(self, entry: LogEntry, console: Optional[str] = None) -> bool:
+        """Queue an entry (and optional console line). False if dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait((entry, console))
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything queued so far is on disk"""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        request = _FlushRequest()
+        try:
+            self._queue.put(request, timeout=timeout)
+        except queue.Full:
+            return False
+        return request.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0):
+        """Flush, stop the writer thread and close the file"""
+        if self._thread is None:
+            return
+        try:
+            self._queue.put(_CLOSE, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+        self._thread = None
+
+    @property
+    def current_path(self) -> Path:
+        """File the next entry of today would be written to"""
+        if self._file is not None:
+            return Path(self._file.name)
+        return self._path_for(datetime.now().strftime('%Y%m%d'), 0)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"jsonl-sink-{self.prefix}", daemon=True
+                )
+                self._thread.start()
+
+    # ---------------------------- Writer thread ----------------------------
+
+    def _run(self):
+        pending = 0
+        first_pending_at = 0.0
+        while True:
+            timeout = None
+            if pending:
+                timeout = max(0.0, first_pending_at + self.flush_interval_s - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _CLOSE:
+                self._flush_file()
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+            if isinstance(item, _FlushRequest):
+                self._flush_file()
+                pending = 0
+                item.done.set()
+                continue
+
+            if item is not None:
+                self._write(*item)
+                if not pending:
+                    first_pending_at = time.monotonic()
+                pending += 1
+
+            if pending and (
+                pending >= self.flush_size
+                or time.monotonic() - first_pending_at >= self.flush_interval_s
+            ):
+                self._flush_file()
+                pending = 0
+
+    def _write(self, entry: LogEntry, console: Optional[str]):
+        try:
+            data = (entry.to_json() + '\n').encode('utf-8', errors='replace')
+            day = entry.timestamp[:10].replace('-', '')
+            if day != self._day or (self._bytes and self._bytes + len(data) > self.max_bytes):
+                self._rotate(day)
+            self._file.write(data)
+            self._bytes += len(data)
+            self.written_count += 1
+        except Exception as e:
+            # Never let a bad entry kill the writer thread
+            sys.stderr.write(f"[logging] failed to write entry: {e}\n")
+        if console is not None:
+            sys.stdout.write(console + '\n')
+
+    def _flush_file(self):
+        if self._file is not None:
+            self._file.flush()
+        sys.stdout.flush()
+
+    def _path_for(self, day: str, index: int) -> Path:
+        suffix = f"-{index}" if index else ""
+        return self.log_dir / f"{self.prefix}-{day}{suffix}.jsonl"
+
+    def _rotate(self, day: str):
+        """Open the file for `day`, skipping segments already at max_bytes"""
+        if self._file is not None:
+            self._file.close()
+        index = 0 if day != self._day else self._index + 1
+        path = self._path_for(day, index)
+        while path.exists() and path.stat().st_size >= self.max_bytes:
+            index += 1
+            path = self._path_for(day, index)
+
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, 'ab', buffering=1 << 16)
+        self._day = day
+        self._index = index
+        self._bytes = path.stat().st_size
+
+
+# One sink (and writer thread) per log directory
+_sinks: Dict[Path, BufferedJSONLSink] = {}
+_sinks_lock = threading.Lock()
+
+
+def get_jsonl_sink(log_dir: str, max_bytes: int = MAX_LOG_BYTES) -> BufferedJSONLSink:
+    """Return the shared buffered sink for a log directory"""
+    key = Path(log_dir).resolve()
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None:
+            sink = _sinks[key] = BufferedJSONLSink(key, max_bytes=max_bytes)
+        return sink
+
+
+@atexit.register
+def _close_sinks():
+    for sink in list(_sinks.values()):
+        sink.close()
+
+
 class StructuredLogger:
     """
     Enhanced structured logger with JSONL file output.
     Provides agent-aware logging with trace_id support.
+
+    Entries (and console echoes) go through a shared BufferedJSONLSink by
+    default; pass buffered=False to write synchronously.
     """
 
     def __init__(
         self,
         log_dir: str = "/tmp/math-agent-logs",
-        trace_id: Optional[str] = None
+        trace_id: Optional[str] = None,
+        buffered: bool = True,
+        max_bytes: int = MAX_LOG_BYTES
     ):
         """
         Initialize structured logger.
@@ -217,6 +533,9 @@ class StructuredLogger:
         Args:
             log_dir: Directory for JSONL log files
             trace_id: Optional trace ID (generates short UUID if None)
+            buffered: Write through the background sink (default) instead
+                of opening the file for every entry
+            max_bytes: Size at which the sink starts a new file
         """
         import uuid
 
@@ -224,13 +543,33 @@ class StructuredLogger:
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
         self.trace_id = trace_id or str(uuid.uuid4())[:8]
-        self.log_file = self.log_dir / f"agent-{datetime.now().strftime('%Y%m%d')}.jsonl"
+        self._sink = get_jsonl_sink(log_dir, max_bytes) if buffered else None
 
         # Set trace_id in context
         trace_id_var.set(self.trace_id)
 
-    def _write_log(self, entry: LogEntry):
-        """Write log entry to JSONL file"""
+    @property
+    def current_trace_id(self) -> str:
+        """Trace of the calling context (a workflow run's root span), else the logger's own"""
+        return trace_id_var.get() or self.trace_id
+
+    @property
+    def log_file(self) -> Path:
+        """Current JSONL file"""
+        if self._sink is not None:
+            return self._sink.current_path
+        return self.log_dir / f"agent-{datetime.now().strftime('%Y%m%d')}.jsonl"
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until buffered entries are written"""
+        return self._sink.flush(timeout) if self._sink is not None else True
+
+    def _write_log(self, entry: LogEntry, console: Optional[str] = None):
+        """Write log entry to JSONL file (and echo a console line)"""
+        if self._sink is not None:
+            self._sink.put(entry, console)
+            return
+
         try:
             with open(self.log_file, 'a', encoding='utf-8', errors='replace') as f:
                 f.write(entry.to_json() + '\n')
@@ -238,6 +577,8 @@ class StructuredLogger:
             # Fallback: sanitize and retry
             with open(self.log_file, 'a', encoding='utf-8', errors='ignore') as f:
                 f.write(entry.to_json() + '\n')
+        if console is not None:
+            print(console)
 
     def agent_start(
         self,
@@ -248,15 +589,14 @@ class StructuredLogger:
         """Log agent start event"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="agent_start",
             agent_name=agent_name,
             level="INFO",
             message=f"Starting agent: {agent_name}",
             metadata={"task": task_description, **(metadata or {})}
         )
-        self._write_log(entry)
-        print(f"[{entry.timestamp}] START {agent_name}: {task_description}")
+        self._write_log(entry, f"[{entry.timestamp}] START {agent_name}: {task_description}")
 
     def agent_complete(
         self,
@@ -268,7 +608,7 @@ class StructuredLogger:
         """Log agent completion event"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="agent_complete",
             agent_name=agent_name,
             level="INFO" if success else "ERROR",
@@ -276,9 +616,8 @@ class StructuredLogger:
             duration_ms=duration_ms,
             metadata={"success": success, **(metadata or {})}
         )
-        self._write_log(entry)
         status_icon = "✅" if success else "❌"
-        print(f"[{entry.timestamp}] {status_icon} {agent_name}: {duration_ms:.0f}ms")
+        self._write_log(entry, f"[{entry.timestamp}] {status_icon} {agent_name}: {duration_ms:.0f}ms")
 
     def tool_call(
         self,
@@ -291,7 +630,7 @@ class StructuredLogger:
         """Log tool call event"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="tool_call",
             agent_name=agent_name,
             level="INFO",
@@ -311,15 +650,14 @@ class StructuredLogger:
         """Log error event"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="error",
             agent_name=agent_name,
             level="ERROR",
             message=error_message,
             metadata={"error_type": error_type, **(metadata or {})}
         )
-        self._write_log(entry)
-        print(f"[{entry.timestamp}] ❌ ERROR ({agent_name}): {error_message}")
+        self._write_log(entry, f"[{entry.timestamp}] ❌ ERROR ({agent_name}): {error_message}")
 
     def metric(
         self,
@@ -331,7 +669,7 @@ class StructuredLogger:
         """Log performance metric"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="metric",
             agent_name=None,
             level="INFO",
@@ -354,7 +692,7 @@ class StructuredLogger:
         """Log system-level event"""
         entry = LogEntry(
             timestamp=datetime.now().isoformat(),
-            trace_id=self.trace_id,
+            trace_id=self.current_trace_id,
             event_type="system",
             agent_name=None,
             level="INFO",
@@ -395,18 +733,21 @@ class AgentExecutionLogger:
         self.agent_name = agent_name
         self.task_description = task_description
         self.start_time = None
+        self._span = None
 
     def __enter__(self):
-        """Log agent start"""
-        import time
+        """Log agent start (and open an agent span under the current one)"""
+        from .tracing_service import span
         self.start_time = time.time()
+        self._span = span(f"agent:{self.agent_name}", agent=self.agent_name)
+        self._span.__enter__()
         self.logger.agent_start(self.agent_name, self.task_description)
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Log agent completion"""
-        import time
         duration_ms = (time.time() - self.start_time) * 1000
         success = exc_type is None
         self.logger.agent_complete(self.agent_name, duration_ms, success)
+        self._span.__exit__(exc_type, exc_val, exc_tb)
         return False  # Don't suppress exceptions
@@ -0,0 +1,252 @@
+"""
+Local Memory-Keeper Store
+VERSION: 1.0.0 - SQLite stand-in for the mcp-memory-keeper server
+
+Drop-in `memory_tool_func` for ContextManager backed by a local SQLite
+database, so context operations need no npx server or IPC hop and can be
+load-tested offline.
+
+- Tools: context_save, context_batch_save, context_get, context_search,
+  context_delete (with or without the "mcp__memory-keeper__" prefix)
+- Keys are unique; saving an existing key updates it in place
+- Indexes on category, priority, channel and created_at for context_get
+- FTS5 index over key/value/tags for context_search (ranked)
+- context_delete really deletes, so retention cleanup frees space
+
+Usage:
+    from infrastructure.context_service import ContextManager
+    from infrastructure.memory_store_service import SQLiteMemoryKeeper
+
+    context = ContextManager(SQLiteMemoryKeeper("/tmp/math-agent-context.db"))
+
+Benchmark: python3 scripts/context_store_benchmark_script.py
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+TOOL_PREFIX = "mcp__memory-keeper__"
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS context_items (
+        id INTEGER PRIMARY KEY,
+        key TEXT NOT NULL UNIQUE,
+        value TEXT NOT NULL,
+        category TEXT,
+        priority TEXT,
+        channel TEXT,
+        metadata TEXT,
+        tags TEXT,
+        size INTEGER NOT NULL DEFAULT 0,
+        created_at TEXT NOT NULL,
+        updated_at TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_context_category ON context_items (category, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_context_priority ON context_items (priority, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_context_channel ON context_items (channel, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_context_created ON context_items (created_at)",
+    # Full-text index (rowid = context_items.id), maintained on save/delete
+    "CREATE VIRTUAL TABLE IF NOT EXISTS context_fts USING fts5(key, value, tags)",
+]
+
+ITEM_COLUMNS = "id, key, value, category, priority, channel, metadata, tags, created_at, updated_at"
+
+
+def _quote_search_terms(query: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (implicit AND)"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in query.split())
+
+
+class SQLiteMemoryKeeper:
+    """
+    memory-keeper tool calls served from SQLite.
+
+    Callable as `store(tool_name, **params) -> dict`, matching the
+    memory_tool_func signature ContextManager expects. Thread-safe.
+    """
+
+    def __init__(self, db_path: str = ":memory:", clock: Callable[[], float] = time.time):
+        """
+        Open (and create if needed) the store.
+
+        Args:
+            db_path: SQLite file, or ":memory:" for a throwaway store
+            clock: Epoch-seconds clock for created_at/updated_at
+        """
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = db_path
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._conn.commit()
+
+        self._tools: Dict[str, Callable[..., Dict]] = {
+            "context_save": self.save,
+            "context_batch_save": self.batch_save,
+            "context_get": self.get,
+            "context_search": self.search,
+            "context_delete": self.delete,
+        }
+
+    def __call__(self, tool_name: str, **params) -> Dict[str, Any]:
+        """Dispatch a memory-keeper tool call"""
+        name = tool_name[len(TOOL_PREFIX):] if tool_name.startswith(TOOL_PREFIX) else tool_name
+        tool = self._tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown memory-keeper tool: {tool_name}")
+        return tool(**params)
+
+    def _now(self) -> str:
+        return datetime.fromtimestamp(self.clock(), timezone.utc).isoformat()
+
+    def _upsert(self, item: Dict[str, Any], now: str):
+        """Insert or update one item and its FTS row (caller holds the lock)"""
+        value = item["value"]
+        if not isinstance(value, str):
+            value = json.dumps(value, ensure_ascii=False)
+        tags = item.get("tags") or []
+        row = self._conn.execute(
+            """
+            INSERT INTO context_items
+                (key, value, category, priority, channel, metadata, tags, size, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value, category = excluded.category,
+                priority = excluded.priority, channel = excluded.channel,
+                metadata = excluded.metadata, tags = excluded.tags,
+                size = excluded.size, updated_at = excluded.updated_at
+            RETURNING id
+            """,
+            (
+                item["key"], value, item.get("category"), item.get("priority", "normal"),
+                item.get("channel"), json.dumps(item.get("metadata") or {}, ensure_ascii=False),
+                json.dumps(tags, ensure_ascii=False), len(value.encode("utf-8")), now, now,
+            ),
+        ).fetchone()
+        self._conn.execute("DELETE FROM context_fts WHERE rowid = ?", (row[0],))
+        self._conn.execute(
+            "INSERT INTO context_fts (rowid, key, value, tags) VALUES (?, ?, ?, ?)",
+            (row[0], item["key"], value, " ".join(tags)),
+        )
+
+    def save(self, **item) -> Dict[str, Any]:
+        """context_save: key, value, category, priority, metadata, channel, tags"""
+        with self._lock, self._conn:
+            self._upsert(item, self._now())
+        return {"success": True, "key": item["key"]}
+
+    def batch_save(self, items: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """context_batch_save: many items in one transaction"""
+        now = self._now()
+        with self._lock, self._conn:
+            for item in items:
+                self._upsert(item, now)
+        return {"success": True, "saved": len(items)}
+
+    def get(
+        self,
+        category: Optional[str] = None,
+        key: Optional[str] = None,
+        priorities: Optional[List[str]] = None,
+        channel: Optional[str] = None,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """context_get: newest first, filtered by any combination of fields"""
+        clauses, args = [], []
+        for column, value in (("key", key), ("category", category), ("channel", channel)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        if priorities:
+            clauses.append(f"priority IN ({', '.join('?' * len(priorities))})")
+            args.extend(priorities)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {ITEM_COLUMNS} FROM context_items {where} "
+                f"ORDER BY created_at DESC, id DESC LIMIT ?",
+                (*args, limit),
+            ).fetchall()
+        return {"items": [self._row_to_item(row) for row in rows]}
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        channel: Optional[str] = None,
+        limit: int = 10
+    ) -> Dict[str, Any]:
+        """context_search: FTS5 query (plain text accepted), best match first"""
+        if not query.strip():
+            return {"items": []}  # Nothing to match (and not valid FTS5 syntax)
+
+        clauses, args = [], []
+        for column, value in (("c.category", category), ("c.channel", channel)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                args.append(value)
+        extra = "".join(f" AND {clause}" for clause in clauses)
+        sql = (
+            f"SELECT {', '.join('c.' + col.strip() for col in ITEM_COLUMNS.split(','))} "
+            f"FROM context_fts f JOIN context_items c ON c.id = f.rowid "
+            f"WHERE context_fts MATCH ?{extra} ORDER BY f.rank LIMIT ?"
+        )
+
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, (query, *args, limit)).fetchall()
+            except sqlite3.OperationalError:
+                # Not valid FTS5 syntax: search the words literally
+                rows = self._conn.execute(sql, (_quote_search_terms(query), *args, limit)).fetchall()
+        return {"items": [self._row_to_item(row) for row in rows]}
+
+    def delete(self, key: str) -> Dict[str, Any]:
+        """context_delete: remove one item by key"""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "DELETE FROM context_items WHERE key = ? RETURNING id", (key,)
+            ).fetchone()
+            if row:
+                self._conn.execute("DELETE FROM context_fts WHERE rowid = ?", (row[0],))
+        return {"success": True, "deleted": 1 if row else 0}
+
+    def count(self, category: Optional[str] = None) -> int:
+        """Number of stored items (optionally in one category)"""
+        with self._lock:
+            if category is None:
+                return self._conn.execute("SELECT COUNT(*) FROM context_items").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM context_items WHERE category = ?", (category,)
+            ).fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_item(row: tuple) -> Dict[str, Any]:
+        return {
+            "id": row[0],
+            "key": row[1],
+            "value": row[2],
+            "category": row[3],
+            "priority": row[4],
+            "channel": row[5],
+            "metadata": json.loads(row[6] or "{}"),
+            "tags": json.loads(row[7] or "[]"),
+            "created_at": row[8],
+            "updated_at": row[9],
+        }
@@ -1,6 +1,6 @@
 """
 Performance Monitor for Multi-Agent System
-VERSION: 2.0.0 - Integrated from v5.0 + Korean plan improvements
+VERSION: 2.2.0 - Sliding-window metrics
 
 Tracks agent execution metrics:
 - Execution time (avg, median, p95)
@@ -8,6 +8,14 @@ Tracks agent execution metrics:
 - Token consumption (if available)
 - API call count
 
+Durations are kept in a DurationSketch (log-bucketed, DDSketch-style):
+fixed memory per agent, percentiles within 1% relative error, and
+mergeable across worker processes via export_state()/merge_state().
+
+Each agent also keeps sliding windows (1m, 5m, 1h) as rings of time
+buckets holding count, errors and a latency sketch, so regressions are
+judged on recent behaviour instead of lifetime averages.
+
 Based on:
 - scalable.pdf: Performance monitoring for multi-agent systems
 - OpenTelemetry metrics patterns
@@ -15,11 +23,232 @@ Based on:
 
 import time
 import json
+import math
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Callable
-from statistics import mean, median
+from typing import Any, Dict, List, Optional, Callable
 from datetime import datetime
 
+SKETCH_RELATIVE_ACCURACY = 0.01  # Percentiles within 1% of the true value
+SKETCH_MAX_BINS = 2048  # Lowest bins are collapsed beyond this
+SKETCH_MIN_VALUE = 1e-3  # Durations at or below this (ms) count as zero
+
+# Sliding windows (name -> span in seconds), each a ring of WINDOW_BUCKETS buckets
+WINDOWS = {"1m": 60, "5m": 300, "1h": 3600}
+WINDOW_BUCKETS = 12
+
+
+class DurationSketch:
+    """
+    Mergeable streaming quantile sketch with relative-error guarantees.
+
+    Values fall into logarithmic bins (bin i covers (gamma^(i-1), gamma^i]
+    with gamma = (1 + a) / (1 - a)), so any quantile is answered within
+    relative accuracy `a` from at most SKETCH_MAX_BINS counters regardless
+    of how many values were added. Two sketches with the same accuracy
+    merge by adding bin counts.
+    """
+
+    def __init__(self, relative_accuracy: float = SKETCH_RELATIVE_ACCURACY, max_bins: int = SKETCH_MAX_BINS):
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._sorted_keys: Optional[List[int]] = None
+
+    def add(self, value: float):
+        """Add one value (O(1))"""
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+        if value <= SKETCH_MIN_VALUE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        if key in self.bins:
+            self.bins[key] += 1
+        else:
+            self.bins[key] = 1
+            self._sorted_keys = None
+            if len(self.bins) > self.max_bins:
+                self._collapse()
+
+    def _collapse(self):
+        """Fold the lowest bins together to stay within max_bins"""
+        keys = sorted(self.bins)
+        excess = keys[:len(keys) - self.max_bins + 1]
+        target = keys[len(excess)]
+        self.bins[target] += sum(self.bins.pop(k) for k in excess)
+        self._sorted_keys = None
+
+    def quantile(self, q: float) -> float:
+        """Value at quantile q in [0, 1] (0.0 when empty)"""
+        if self.count == 0:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        rank = q * (self.count - 1)
+        if rank < self.zero_count:
+            return max(self.min, 0.0)
+
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self.bins)
+        seen = self.zero_count
+        for key in self._sorted_keys:
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self._gamma ** key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def merge(self, other: "DurationSketch"):
+        """Add another sketch's values into this one"""
+        if not math.isclose(other.relative_accuracy, self.relative_accuracy):
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, n in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + n
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._sorted_keys = None
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable state (for shipping between processes)"""
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(k): n for k, n in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DurationSketch":
+        """Rebuild a sketch from to_dict() output"""
+        sketch = cls(relative_accuracy=data["relative_accuracy"])
+        sketch.bins = {int(k): n for k, n in data["bins"].items()}
+        sketch.zero_count = data["zero_count"]
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        if data["count"]:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        return sketch
+
+
+class _WindowBucket:
+    __slots__ = ("index", "count", "errors", "total_ms", "sketch")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.count = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.sketch = DurationSketch()
+
+
+@dataclass
+class WindowStats:
+    """Aggregate of the buckets inside one window"""
+    window: str
+    count: int
+    errors: int
+    total_ms: float
+    sketch: DurationSketch
+
+    @property
+    def error_rate(self) -> float:
+        """Failures as a percentage of executions"""
+        return (self.errors / self.count * 100) if self.count else 0.0
+
+    @property
+    def avg_duration_ms(self) -> float:
+        return (self.total_ms / self.count) if self.count else 0.0
+
+    def quantile(self, q: float) -> float:
+        return self.sketch.quantile(q)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "window": self.window,
+            "count": self.count,
+            "error_rate": f"{self.error_rate:.1f}%",
+            "avg_duration_ms": f"{self.avg_duration_ms:.0f}",
+            "p95_duration_ms": f"{self.quantile(0.95):.0f}",
+        }
+
+
+class SlidingWindow:
+    """
+    Ring of time buckets covering the last `span_s` seconds.
+
+    record() touches one bucket (O(1)); a bucket whose slot comes round
+    again is reset. stats() merges the live buckets.
+    """
+
+    def __init__(self, name: str, span_s: float, buckets: int = WINDOW_BUCKETS):
+        self.name = name
+        self.span_s = span_s
+        self.width_s = span_s / buckets
+        self._ring: List[Optional[_WindowBucket]] = [None] * buckets
+
+    def record(self, now: float, duration_ms: float, success: bool):
+        index = int(now // self.width_s)
+        slot = index % len(self._ring)
+        bucket = self._ring[slot]
+        if bucket is None or bucket.index != index:
+            bucket = self._ring[slot] = _WindowBucket(index)
+        bucket.count += 1
+        bucket.total_ms += duration_ms
+        if not success:
+            bucket.errors += 1
+        bucket.sketch.add(duration_ms)
+
+    def stats(self, now: float, exclude_recent_s: float = 0.0) -> WindowStats:
+        """
+        Aggregate buckets in the window ending at `now`.
+
+        Args:
+            now: Current time (seconds, same clock as record())
+            exclude_recent_s: Skip buckets that overlap the last N seconds
+                (used to keep a baseline from including the current window)
+        """
+        newest = int(now // self.width_s)
+        oldest = newest - len(self._ring) + 1
+        if exclude_recent_s:
+            newest = int((now - exclude_recent_s) // self.width_s) - 1
+
+        stats = WindowStats(self.name, 0, 0, 0.0, DurationSketch())
+        for bucket in self._ring:
+            if bucket is None or not oldest <= bucket.index <= newest:
+                continue
+            stats.count += bucket.count
+            stats.errors += bucket.errors
+            stats.total_ms += bucket.total_ms
+            stats.sketch.merge(bucket.sketch)
+        return stats
+
+
+def _default_windows() -> Dict[str, SlidingWindow]:
+    return {name: SlidingWindow(name, span) for name, span in WINDOWS.items()}
+
 
 @dataclass
 class AgentMetrics:
@@ -31,7 +260,8 @@ class AgentMetrics:
     total_duration_ms: float = 0.0
     token_consumption: int = 0
     api_call_count: int = 0
-    duration_history: List[float] = field(default_factory=list)
+    duration_sketch: DurationSketch = field(default_factory=DurationSketch)
+    windows: Dict[str, SlidingWindow] = field(default_factory=_default_windows, repr=False)
 
     @property
     def success_rate(self) -> float:
@@ -47,25 +277,47 @@ class AgentMetrics:
     @property
     def median_duration_ms(self) -> float:
         """Calculate median execution duration"""
-        return median(self.duration_history) if self.duration_history else 0.0
+        return self.duration_sketch.quantile(0.5)
 
     @property
     def p95_duration_ms(self) -> float:
         """Calculate 95th percentile execution duration"""
-        if not self.duration_history:
-            return 0.0
-        sorted_durations = sorted(self.duration_history)
-        idx = int(len(sorted_durations) * 0.95)
-        return sorted_durations[min(idx, len(sorted_durations) - 1)]
+        return self.duration_sketch.quantile(0.95)
 
     @property
     def p99_duration_ms(self) -> float:
         """Calculate 99th percentile execution duration"""
-        if not self.duration_history:
-            return 0.0
-        sorted_durations = sorted(self.duration_history)
-        idx = int(len(sorted_durations) * 0.99)
-        return sorted_durations[min(idx, len(sorted_durations) - 1)]
+        return self.duration_sketch.quantile(0.99)
+
+    def merge(self, other: "AgentMetrics"):
+        """Fold another process's lifetime metrics for the same agent into these (windows stay local)"""
+        self.execution_count += other.execution_count
+        self.success_count += other.success_count
+        self.failure_count += other.failure_count
+        self.total_duration_ms += other.total_duration_ms
+        self.token_consumption += other.token_consumption
+        self.api_call_count += other.api_call_count
+        self.duration_sketch.merge(other.duration_sketch)
+
+    def to_state(self) -> Dict[str, Any]:
+        """Raw counters plus sketch, for merging elsewhere"""
+        return {
+            "agent_name": self.agent_name,
+            "execution_count": self.execution_count,
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "total_duration_ms": self.total_duration_ms,
+            "token_consumption": self.token_consumption,
+            "api_call_count": self.api_call_count,
+            "duration_sketch": self.duration_sketch.to_dict(),
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "AgentMetrics":
+        """Rebuild metrics from to_state() output"""
+        data = dict(state)
+        data["duration_sketch"] = DurationSketch.from_dict(data["duration_sketch"])
+        return cls(**data)
 
     def to_dict(self) -> Dict:
         """Convert metrics to dictionary for serialization"""
@@ -91,10 +343,16 @@ class PerformanceMonitor:
     Tracks execution time, success rate, token usage, API calls, etc.
     """
 
-    def __init__(self):
-        """Initialize performance monitor"""
+    def __init__(self, clock: Callable[[], float] = time.time):
+        """
+        Initialize performance monitor.
+
+        Args:
+            clock: Time source for sliding windows (seconds)
+        """
         self.metrics: Dict[str, AgentMetrics] = {}
         self.session_start = time.time()
+        self.clock = clock
 
     def record_execution(
         self,
@@ -120,7 +378,11 @@ class PerformanceMonitor:
         metrics = self.metrics[agent_name]
         metrics.execution_count += 1
         metrics.total_duration_ms += duration_ms
-        metrics.duration_history.append(duration_ms)
+        metrics.duration_sketch.add(duration_ms)
+
+        now = self.clock()
+        for window in metrics.windows.values():
+            window.record(now, duration_ms, success)
 
         if success:
             metrics.success_count += 1
@@ -142,6 +404,22 @@ class PerformanceMonitor:
         """
         return self.metrics.get(agent_name)
 
+    def get_window_stats(self, agent_name: str, window: str = "5m") -> Optional[WindowStats]:
+        """
+        Get recent metrics for an agent.
+
+        Args:
+            agent_name: Name of agent
+            window: One of WINDOWS ("1m", "5m", "1h")
+
+        Returns:
+            WindowStats or None if agent not found
+        """
+        metrics = self.metrics.get(agent_name)
+        if not metrics:
+            return None
+        return metrics.windows[window].stats(self.clock())
+
     def get_all_metrics(self) -> Dict[str, AgentMetrics]:
         """
         Get metrics for all agents.
@@ -199,9 +477,41 @@ class PerformanceMonitor:
             "agents": {
                 name: metrics.to_dict()
                 for name, metrics in self.metrics.items()
+            },
+            "windows": {
+                name: {
+                    window: stats.to_dict()
+                    for window, stats in (
+                        (w, metrics.windows[w].stats(self.clock())) for w in WINDOWS
+                    )
+                }
+                for name, metrics in self.metrics.items()
             }
         }
 
+    def export_state(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Export mergeable per-agent state (counters + sketches).
+
+        Returns:
+            JSON-serializable dict for merge_state() in another process
+        """
+        return {name: metrics.to_state() for name, metrics in self.metrics.items()}
+
+    def merge_state(self, state: Dict[str, Dict[str, Any]]):
+        """
+        Merge per-agent state exported by another monitor (e.g. a worker).
+
+        Args:
+            state: Output of export_state()
+        """
+        for name, agent_state in state.items():
+            incoming = AgentMetrics.from_state(agent_state)
+            if name in self.metrics:
+                self.metrics[name].merge(incoming)
+            else:
+                self.metrics[name] = incoming
+
     def save_to_memory_keeper(self, memory_save_func: Callable):
         """
         Persist all metrics to memory-keeper storage.
@@ -235,7 +545,8 @@ class PerformanceMonitor:
         self,
         agent_name: str,
         baseline_avg_ms: float,
-        threshold_percent: float = 20.0
+        threshold_percent: float = 20.0,
+        window: Optional[str] = "5m"
     ) -> bool:
         """
         Check if average duration exceeds baseline by more than threshold%.
@@ -244,19 +555,71 @@ class PerformanceMonitor:
             agent_name: Name of agent to check
             baseline_avg_ms: Baseline average duration
             threshold_percent: Threshold percentage for regression (default 20%)
+            window: Recent window to judge (None = lifetime average)
 
         Returns:
             True if regression detected, False otherwise
         """
         metrics = self.get_metrics(agent_name)
+        if not metrics:
+            return False
+
+        if window is None:
+            count, avg_ms = metrics.execution_count, metrics.avg_duration_ms
+        else:
+            stats = metrics.windows[window].stats(self.clock())
+            count, avg_ms = stats.count, stats.avg_duration_ms
 
         # Not enough data to determine regression
-        if not metrics or metrics.execution_count < 5:
+        if count < 5:
             return False
 
         # Check if average exceeds baseline + threshold
         threshold_ms = baseline_avg_ms * (1 + threshold_percent / 100)
-        return metrics.avg_duration_ms > threshold_ms
+        return avg_ms > threshold_ms
+
+    def detect_window_regression(
+        self,
+        agent_name: str,
+        current: str = "5m",
+        baseline: str = "1h",
+        threshold_percent: float = 20.0,
+        quantile: float = 0.95,
+        error_rate_threshold: float = 10.0,
+        min_count: int = 5
+    ) -> bool:
+        """
+        Compare the current window against a longer baseline window.
+
+        The baseline excludes buckets overlapping the current window, so a
+        fresh slowdown is not averaged into the thing it is compared with.
+
+        Args:
+            agent_name: Name of agent to check
+            current: Recent window ("1m" or "5m")
+            baseline: Longer reference window (e.g. "1h")
+            threshold_percent: Latency increase (at `quantile`) that counts
+            quantile: Latency quantile to compare (default p95)
+            error_rate_threshold: Error-rate increase in percentage points
+            min_count: Minimum executions required in each window
+
+        Returns:
+            True if latency or error rate regressed, False otherwise
+        """
+        metrics = self.get_metrics(agent_name)
+        if not metrics:
+            return False
+
+        now = self.clock()
+        recent = metrics.windows[current].stats(now)
+        reference = metrics.windows[baseline].stats(now, exclude_recent_s=WINDOWS[current])
+        if recent.count < min_count or reference.count < min_count:
+            return False
+
+        threshold_ms = reference.quantile(quantile) * (1 + threshold_percent / 100)
+        if recent.quantile(quantile) > threshold_ms:
+            return True
+        return recent.error_rate - reference.error_rate > error_rate_threshold
 
     def get_slowest_agents(self, limit: int = 5) -> List[tuple]:
         """
@@ -1,12 +1,16 @@
 """
 Dynamic Agent Registry
 
-VERSION: 1.0.0
+VERSION: 1.2.0 - Capability inverted indexes
 DATE: 2025-10-15
 PURPOSE: Auto-discovery and dynamic registration of agents for scalability
 
 Features:
 - Auto-discover agents from agents/ directory
+- Discovery manifest cache (module path, mtime, exports, capability metadata):
+  unchanged modules are not imported at startup, only on first use
+- Capability -> agents inverted indexes maintained at registration, with
+  multi-capability intersection queries
 - Dynamic registration (add agents without modifying main.py)
 - Capability metadata extraction
 - Agent feature detection (Extended Thinking, Prompt Caching, etc.)
@@ -19,21 +23,58 @@ Benefits:
 - Easy debugging (see which agents have which features)
 
 Usage:
-    from subagents.agent_registry import AgentRegistry
+    from infrastructure.registry_service import AgentRegistry
     
-    registry = AgentRegistry(Path("agents"))
-    agents = registry.discover_agents()
+    registry = AgentRegistry(Path("subagents"))
+    agents = registry.discover_agents()  # Lazy mapping: imports on first access
     
     # Use in main.py
     options = ClaudeAgentOptions(agents=agents, ...)
+
+Benchmark: python3 scripts/registry_startup_benchmark_script.py
 """
 
+from collections.abc import Mapping
 from pathlib import Path
 import importlib
+import json
+import os
 import sys
-from typing import Dict, List, Optional, Any
-from claude_agent_sdk import AgentDefinition
-from semantic_layer import SemanticAgentDefinition
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Any
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: the SDK alone takes ~1s to import
+    from claude_agent_sdk import AgentDefinition
+
+MANIFEST_VERSION = 1
+MANIFEST_NAME = ".agent_manifest.json"
+
+
+class LazyAgentMap(Mapping):
+    """
+    Read-only agent name -> definition mapping backed by the registry.
+    
+    Iteration and len() only use cached metadata; the defining module is
+    imported when a definition is first accessed.
+    """
+    
+    def __init__(self, registry: "AgentRegistry", names: Optional[Dict[str, str]] = None):
+        self._registry = registry
+        self._names = names  # Public name -> registry agent name (None = identity)
+    
+    def _keys(self):
+        return self._names if self._names is not None else self._registry.metadata
+    
+    def __getitem__(self, name: str) -> "AgentDefinition":
+        if self._names is not None:
+            name = self._names[name]
+        return self._registry.get_agent(name)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys())
+    
+    def __len__(self) -> int:
+        return len(self._keys())
 
 
 class AgentRegistry:
@@ -51,22 +92,32 @@ class AgentRegistry:
     - Model versions
     """
     
-    def __init__(self, agents_dir: Path):
+    def __init__(self, agents_dir: Path, manifest_path: Optional[Path] = None):
         """
         Initialize agent registry.
         
         Args:
-            agents_dir: Path to agents directory
+            agents_dir: Path to agents directory (an importable package)
+            manifest_path: Discovery cache file (default: agents_dir/.agent_manifest.json)
         """
         self.agents_dir = Path(agents_dir)
-        self.agents: Dict[str, AgentDefinition] = {}
+        self.package = self.agents_dir.name
+        self.manifest_path = Path(manifest_path) if manifest_path else self.agents_dir / MANIFEST_NAME
         self.metadata: Dict[str, Dict[str, Any]] = {}
+        self.agents = LazyAgentMap(self)
+        self._loaded: Dict[str, "AgentDefinition"] = {}
+        
+        # Inverted indexes, maintained by register()/unregister()
+        self._by_tool: Dict[str, Set[str]] = {}  # lowercased tool -> agent names
+        self._extended_thinking: Set[str] = set()
+        self._prompt_caching: Set[str] = set()
+        self._capability_cache: Dict[str, FrozenSet[str]] = {}  # Substring query -> agents
         
         # Ensure agents directory is in Python path
         if str(self.agents_dir.parent) not in sys.path:
             sys.path.insert(0, str(self.agents_dir.parent))
     
-    def discover_agents(self) -> Dict[str, AgentDefinition]:
+    def discover_agents(self, use_manifest: bool = True) -> Mapping:
         """
         Auto-discover all agents in agents/ directory.
         
@@ -79,12 +130,127 @@ class AgentRegistry:
         - meta_orchestrator.py exports meta_orchestrator
         - socratic_mediator_agent.py exports socratic_mediator_agent
         
+        Modules whose manifest entry still matches their mtime and size are
+        not imported; their metadata comes from the manifest. Changed, new
+        or failed modules are imported and the manifest is rewritten.
+        
+        Args:
+            use_manifest: Read the manifest cache (False forces a full import scan)
+        
         Returns:
-            Dictionary mapping agent names to AgentDefinition instances
+            Lazy mapping of agent names to AgentDefinition instances
         """
         print(f"🔍 Scanning {self.agents_dir}...")
         
-        # Find all Python files (exclude infrastructure files)
+        manifest = self._load_manifest() if use_manifest else {}
+        entries: Dict[str, Dict[str, Any]] = {}
+        previous = set(self.metadata)
+        
+        for file in self._agent_files():
+            stat = file.stat()
+            entry = manifest.get(file.stem)
+            cached = (
+                entry is not None
+                and entry.get("mtime_ns") == stat.st_mtime_ns
+                and entry.get("size") == stat.st_size
+            )
+            if not cached:
+                try:
+                    entry = self._scan_module(file, stat)
+                except Exception as e:
+                    print(f"  ⚠️  Failed to load {file.name}: {e}")
+                    continue  # Not cached, so it is retried next startup
+            
+            entries[file.stem] = entry
+            for agent_name, meta in entry["agents"].items():
+                self.register(agent_name, meta)
+                previous.discard(agent_name)
+                print(f"  ✅ {agent_name} (from {file.name}{', cached' if cached else ''})")
+        
+        # Agents whose module disappeared (or stopped exporting them) on reload
+        for agent_name in previous:
+            self.unregister(agent_name)
+        
+        if entries != manifest:
+            self._write_manifest(entries)
+        
+        print(f"\n✅ Discovered {len(self.metadata)} agents total\n")
+        return self.agents
+    
+    def register(self, agent_name: str, meta: Dict[str, Any]):
+        """
+        Add or replace an agent's metadata and update the capability indexes.
+        
+        Args:
+            agent_name: Registry name (e.g. "quality-agent")
+            meta: Metadata as produced by _extract_metadata
+        """
+        previous = self.metadata.get(agent_name)
+        if previous is not None:
+            self._deindex(agent_name, previous)  # Reload: replace old capabilities
+        self.metadata[agent_name] = meta
+        
+        for tool in meta.get("tools") or []:
+            self._by_tool.setdefault(str(tool).lower(), set()).add(agent_name)
+        if meta.get("has_extended_thinking"):
+            self._extended_thinking.add(agent_name)
+        if meta.get("has_prompt_caching"):
+            self._prompt_caching.add(agent_name)
+        self._invalidate_cached(meta)
+    
+    def unregister(self, agent_name: str):
+        """Remove an agent and its index entries (no-op if unknown)"""
+        meta = self.metadata.pop(agent_name, None)
+        if meta is not None:
+            self._loaded.pop(agent_name, None)
+            self._deindex(agent_name, meta)
+    
+    def _deindex(self, agent_name: str, meta: Dict[str, Any]):
+        """Remove one agent's entries from the capability indexes"""
+        for tool in meta.get("tools") or []:
+            key = str(tool).lower()
+            agents = self._by_tool.get(key)
+            if agents is not None:
+                agents.discard(agent_name)
+                if not agents:
+                    del self._by_tool[key]
+        self._extended_thinking.discard(agent_name)
+        self._prompt_caching.discard(agent_name)
+        self._invalidate_cached(meta)
+    
+    def _invalidate_cached(self, meta: Dict[str, Any]):
+        """Drop cached substring queries that could match this agent's tools"""
+        if not self._capability_cache:
+            return
+        tools = [str(tool).lower() for tool in meta.get("tools") or []]
+        for query in [q for q in self._capability_cache if any(q in tool for tool in tools)]:
+            del self._capability_cache[query]
+    
+    def get_agent(self, agent_name: str) -> "AgentDefinition":
+        """
+        Get an agent definition, importing its module on first use.
+        
+        Raises:
+            KeyError: If the agent was not discovered
+        """
+        agent = self._loaded.get(agent_name)
+        if agent is None:
+            meta = self.metadata[agent_name]
+            module = importlib.import_module(f"{self.package}.{meta['module']}")
+            agent = getattr(module, meta["export"])
+            self._loaded[agent_name] = agent
+        return agent
+    
+    def agent_map(self, names: Dict[str, str]) -> LazyAgentMap:
+        """Lazy mapping under different public names ({public_name: agent_name})"""
+        return LazyAgentMap(self, names)
+    
+    def load_all(self) -> Dict[str, "AgentDefinition"]:
+        """Import every discovered agent (eager equivalent of self.agents)"""
+        return {name: self.get_agent(name) for name in self.metadata}
+    
+    def _agent_files(self) -> List[Path]:
+        """Candidate agent modules (infrastructure files excluded)"""
         excluded_files = {
             '__init__', 'agent_registry', 'planning_observer',
             'planning_session_manager', 'improvement_manager',
@@ -94,46 +260,79 @@ class AgentRegistry:
             'structured_logger', 'self_improver', 'socratic_mediator'
         }
         
-        agent_files = [
+        return sorted(
             f for f in self.agents_dir.glob("*.py")
             if f.stem not in excluded_files and not f.stem.startswith('_')
-        ]
+        )
+    
+    def _scan_module(self, file: Path, stat: os.stat_result) -> Dict[str, Any]:
+        """Import one module and build its manifest entry"""
+        from claude_agent_sdk import AgentDefinition
+        from semantic_layer import SemanticAgentDefinition
         
-        for file in agent_files:
-            module_name = f"agents.{file.stem}"
+        # Ensure the agents package is importable
+        if str(self.agents_dir.parent) not in sys.path:
+            sys.path.insert(0, str(self.agents_dir.parent))
+        
+        module = importlib.import_module(f"{self.package}.{file.stem}")
+        agents: Dict[str, Dict[str, Any]] = {}
+        
+        # Look for AgentDefinition exports
+        for attr_name in dir(module):
+            # Skip private attributes
+            if attr_name.startswith('_'):
+                continue
             
-            try:
-                # Import module
-                module = importlib.import_module(module_name)
-                
-                # Look for AgentDefinition exports
-                for attr_name in dir(module):
-                    # Skip private attributes
-                    if attr_name.startswith('_'):
-                        continue
-                    
-                    attr = getattr(module, attr_name)
-                    
-                    # Check if it's an AgentDefinition or SemanticAgentDefinition
-                    if isinstance(attr, (AgentDefinition, SemanticAgentDefinition)):
-                        # Convert underscore to hyphen for consistency
-                        agent_name = attr_name.replace('_', '-')
-                        self.agents[agent_name] = attr
-                        
-                        # Extract metadata for capability routing
-                        self.metadata[agent_name] = self._extract_metadata(attr, file)
-                        
-                        print(f"  ✅ {agent_name} (from {file.name})")
+            attr = getattr(module, attr_name)
+            
+            # Check if it's an AgentDefinition or SemanticAgentDefinition
+            if isinstance(attr, (AgentDefinition, SemanticAgentDefinition)):
+                # Convert underscore to hyphen for consistency
+                agent_name = attr_name.replace('_', '-')
+                self._loaded[agent_name] = attr
                 
-            except Exception as e:
-                print(f"  ⚠️  Failed to load {file.name}: {e}")
+                # Extract metadata for capability routing
+                meta = self._extract_metadata(attr, file)
+                meta["export"] = attr_name
+                agents[agent_name] = meta
         
-        print(f"\n✅ Discovered {len(self.agents)} agents total\n")
-        return self.agents
+        return {
+            "path": str(file),
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "exports": [meta["export"] for meta in agents.values()],
+            "agents": agents,
+        }
+    
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Cached discovery entries keyed by module name ({} if missing/stale)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != MANIFEST_VERSION or data.get("agents_dir") != str(self.agents_dir.resolve()):
+            return {}
+        return data.get("modules", {})
+    
+    def _write_manifest(self, entries: Dict[str, Dict[str, Any]]):
+        """Atomically replace the manifest (best effort: read-only dirs are fine)"""
+        data = {
+            "version": MANIFEST_VERSION,
+            "agents_dir": str(self.agents_dir.resolve()),
+            "modules": entries,
+        }
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"  ⚠️  Could not write agent manifest: {e}")
     
     def _extract_metadata(
         self,
-        agent: AgentDefinition,
+        agent: "AgentDefinition",
         file: Path
     ) -> Dict[str, Any]:
         """
@@ -192,46 +391,77 @@ class AgentRegistry:
         - capability="Write" → ["knowledge-builder", "self-improver", ...]
         
         Args:
-            capability: Capability to search for
+            capability: Capability to search for (case-insensitive substring of a tool name)
         
         Returns:
-            List of agent names with that capability
+            Sorted list of agent names with that capability
         """
-        result = []
-        capability_lower = capability.lower()
+        return sorted(self._agents_with(capability))
+    
+    def get_agents_by_capabilities(
+        self,
+        capabilities: Iterable[str],
+        match_all: bool = True,
+        extended_thinking: Optional[bool] = None,
+        prompt_caching: Optional[bool] = None
+    ) -> List[str]:
+        """
+        Find agents matching several capabilities at once.
         
-        for name, metadata in self.metadata.items():
-            tools = metadata.get("tools", [])
-            
-            # Check if capability is in tools list
-            if any(capability_lower in str(tool).lower() for tool in tools):
-                result.append(name)
+        Args:
+            capabilities: Capabilities as in get_agents_by_capability
+            match_all: Intersection (True) or union (False) of the capabilities
+            extended_thinking: Also require (True) or exclude (False) Extended Thinking
+            prompt_caching: Also require (True) or exclude (False) Prompt Caching
         
-        return result
+        Returns:
+            Sorted list of matching agent names
+        """
+        sets = [self._agents_with(capability) for capability in capabilities]
+        if not sets:
+            result = set(self.metadata)
+        elif match_all:
+            sets.sort(key=len)  # Intersect from the smallest set
+            result = set(sets[0]).intersection(*sets[1:])
+        else:
+            result = set().union(*sets)
+        
+        for wanted, flagged in ((extended_thinking, self._extended_thinking), (prompt_caching, self._prompt_caching)):
+            if wanted is True:
+                result &= flagged
+            elif wanted is False:
+                result -= flagged
+        return sorted(result)
+    
+    def _agents_with(self, capability: str) -> FrozenSet[str]:
+        """Agents whose tools contain `capability` (cached; a miss scans distinct tools, not agents)"""
+        key = capability.lower()
+        cached = self._capability_cache.get(key)
+        if cached is None:
+            matches: Set[str] = set()
+            for tool, agents in self._by_tool.items():
+                if key in tool:
+                    matches |= agents
+            cached = self._capability_cache[key] = frozenset(matches)
+        return cached
     
     def get_agents_with_extended_thinking(self) -> List[str]:
         """
         Get all agents with Extended Thinking enabled.
         
         Returns:
-            List of agent names
+            Sorted list of agent names
         """
-        return [
-            name for name, meta in self.metadata.items()
-            if meta.get("has_extended_thinking", False)
-        ]
+        return sorted(self._extended_thinking)
     
     def get_agents_with_caching(self) -> List[str]:
         """
         Get all agents with Prompt Caching enabled.
         
         Returns:
-            List of agent names
+            Sorted list of agent names
         """
-        return [
-            name for name, meta in self.metadata.items()
-            if meta.get("has_prompt_caching", False)
-        ]
+        return sorted(self._prompt_caching)
     
     def print_agent_status(self):
         """Print detailed agent status with features"""
@@ -241,7 +471,7 @@ class AgentRegistry:
         print(f"{'Agent':<30} {'Model':<12} {'Thinking':<10} {'Cache':<8} {'Tools':<5}")
         print("-" * 80)
         
-        for name in sorted(self.agents.keys()):
+        for name in sorted(self.metadata.keys()):
             meta = self.metadata[name]
             model_short = meta.get("model", "unknown")[-8:] if meta.get("model") else "unknown"
             thinking_str = f"{meta.get('thinking_budget', 0)/1000:.0f}k" if meta.get('has_extended_thinking') else "-"
@@ -251,12 +481,12 @@ class AgentRegistry:
             print(f"{name:<30} {model_short:<12} {thinking_str:<10} {cache_str:<8} {tool_count:<5}")
         
         print("=" * 80)
-        print(f"Total agents: {len(self.agents)}")
+        print(f"Total agents: {len(self.metadata)}")
         print(f"With Extended Thinking: {len(self.get_agents_with_extended_thinking())}")
         print(f"With Prompt Caching: {len(self.get_agents_with_caching())}")
         print("=" * 80 + "\n")
     
-    def _has_extended_thinking(self, agent: AgentDefinition) -> bool:
+    def _has_extended_thinking(self, agent: "AgentDefinition") -> bool:
         """
         Check if agent has Extended Thinking enabled.
         
@@ -292,7 +522,7 @@ class AgentRegistry:
         
         return False
     
-    def _get_thinking_budget(self, agent: AgentDefinition) -> int:
+    def _get_thinking_budget(self, agent: "AgentDefinition") -> int:
         """
         Get Extended Thinking budget tokens.
         
@@ -323,7 +553,7 @@ class AgentRegistry:
         
         return 0
     
-    def _has_prompt_caching(self, agent: AgentDefinition) -> bool:
+    def _has_prompt_caching(self, agent: "AgentDefinition") -> bool:
         """Check if agent has Prompt Caching configured"""
         # Check if system has cache_control
         if hasattr(agent, 'system'):
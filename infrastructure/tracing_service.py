@@ -0,0 +1,254 @@
+"""
+Span Tracing for Multi-Agent System
+VERSION: 1.1.0 - Per-run traces for workflow entry points
+
+Records nested, timed spans (workflow -> stage -> agent -> tool) so a
+trace shows where time goes inside a wave, not just per-agent totals.
+
+- The trace ID lives in logging_service.trace_id_var (shared with the
+  structured logs); the current span ID in span_id_var. Both are
+  contextvars, so nesting follows asyncio tasks and awaits automatically.
+- span() works as a sync or async context manager; traced() decorates
+  sync and async functions.
+- Workflow entry points open their root span with new_trace=True, so
+  concurrent runs in one process never share a trace.
+- Finished spans go to the configured exporters: the buffered JSONL log
+  (event_type "span") and/or the observability server (hook type "span").
+
+Usage:
+    from infrastructure.tracing_service import configure_tracing, span
+
+    configure_tracing(log_dir="/tmp/math-agent-logs", observability=True)
+
+    async with span("math_scaffolding_workflow", image=image_path):
+        with span("ocr"):
+            ...
+        async with span("generation", concepts=3) as s:
+            s.set_attribute("steps", 7)
+
+Inspect with: python3 scripts/trace_report_script.py --trace <trace_id>
+"""
+
+import functools
+import inspect
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .logging_service import LogEntry, get_jsonl_sink, trace_id_var
+
+# Current span ID (parent of any span opened in this context)
+span_id_var: ContextVar[Optional[str]] = ContextVar('span_id', default=None)
+
+
+@dataclass
+class Span:
+    """One timed operation within a trace"""
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_time: float  # Epoch seconds
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    duration_ms: Optional[float] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    _start_perf: float = field(default=0.0, repr=False)
+
+    def set_attribute(self, key: str, value: Any):
+        """Attach a key/value to the span (exported with it)"""
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable form shared by all exporters"""
+        data = {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ms": int(self.start_time * 1000),
+            "duration_ms": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+class JSONLSpanExporter:
+    """Writes finished spans to the buffered JSONL log as event_type "span" """
+
+    def __init__(self, log_dir: str = "/tmp/math-agent-logs"):
+        self.sink = get_jsonl_sink(log_dir)
+
+    def export(self, span: Span):
+        data = span.to_dict()
+        self.sink.put(LogEntry(
+            timestamp=datetime.fromtimestamp(span.start_time).isoformat(),
+            trace_id=span.trace_id,
+            event_type="span",
+            agent_name=span.attributes.get("agent"),
+            level="ERROR" if span.status == "error" else "INFO",
+            message=span.name,
+            duration_ms=span.duration_ms,
+            metadata={k: v for k, v in data.items() if k not in ("name", "trace_id", "duration_ms")},
+        ))
+
+
+class ObservabilitySpanExporter:
+    """Sends finished spans to the observability server (non-blocking)"""
+
+    def __init__(self, source_app: str = "math_scaffolding"):
+        self.source_app = source_app
+
+    def export(self, span: Span):
+        from tools.observability_hook import send_hook_event
+        send_hook_event(self.source_app, "span", span.to_dict())
+
+
+class Tracer:
+    """Creates spans and hands finished ones to its exporters"""
+
+    def __init__(self, exporters: Optional[List[Any]] = None):
+        self.exporters: List[Any] = list(exporters or [])
+
+    def add_exporter(self, exporter: Any):
+        self.exporters.append(exporter)
+
+    def span(self, name: str, new_trace: bool = False, **attributes) -> "_SpanContext":
+        """Open a child of the current span (or a new root; always with new_trace)"""
+        return _SpanContext(self, name, attributes, new_trace)
+
+    def _export(self, span: Span):
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception:
+                pass  # Tracing must never break the traced code
+
+
+class _SpanContext:
+    """Context manager (sync and async) that activates one span"""
+
+    def __init__(self, tracer: Tracer, name: str, attributes: Dict[str, Any], new_trace: bool = False):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.new_trace = new_trace
+        self.span: Optional[Span] = None
+        self._tokens: tuple = ()
+
+    def __enter__(self) -> Span:
+        trace_id = None if self.new_trace else trace_id_var.get()
+        trace_token = None
+        if trace_id is None:
+            trace_id = uuid.uuid4().hex[:16]
+            trace_token = trace_id_var.set(trace_id)
+
+        self.span = Span(
+            name=self.name,
+            trace_id=trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=None if self.new_trace else span_id_var.get(),
+            start_time=time.time(),
+            attributes=dict(self.attributes),
+            _start_perf=time.perf_counter(),
+        )
+        self._tokens = (trace_token, span_id_var.set(self.span.span_id))
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        span = self.span
+        span.duration_ms = (time.perf_counter() - span._start_perf) * 1000
+        if exc_type is not None:
+            span.status = "error"
+            span.error = f"{exc_type.__name__}: {exc_val}"
+
+        trace_token, span_token = self._tokens
+        span_id_var.reset(span_token)
+        if trace_token is not None:
+            trace_id_var.reset(trace_token)
+
+        self.tracer._export(span)
+        return False  # Don't suppress exceptions
+
+    async def __aenter__(self) -> Span:
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return self.__exit__(exc_type, exc_val, exc_tb)
+
+
+# Process-wide tracer; no exporters until configure_tracing() is called
+tracer = Tracer()
+
+
+def configure_tracing(
+    log_dir: Optional[str] = "/tmp/math-agent-logs",
+    observability: bool = False,
+    source_app: str = "math_scaffolding"
+) -> Tracer:
+    """
+    Set the exporters of the process-wide tracer.
+
+    Args:
+        log_dir: JSONL log directory for spans (None disables)
+        observability: Also send spans to the observability server
+        source_app: source_app used for observability events
+
+    Returns:
+        The configured tracer
+    """
+    tracer.exporters = []
+    if log_dir:
+        tracer.add_exporter(JSONLSpanExporter(log_dir))
+    if observability:
+        tracer.add_exporter(ObservabilitySpanExporter(source_app))
+    return tracer
+
+
+def span(name: str, new_trace: bool = False, **attributes) -> _SpanContext:
+    """
+    Open a span on the process-wide tracer (use with `with` or `async with`).
+
+    new_trace=True starts a fresh trace ID with this span as its root
+    (one per workflow run) instead of joining the current trace.
+    """
+    return tracer.span(name, new_trace=new_trace, **attributes)
+
+
+def current_span_id() -> Optional[str]:
+    """ID of the innermost active span in this context"""
+    return span_id_var.get()
+
+
+def traced(name: Optional[str] = None, new_trace: bool = False, **attributes) -> Callable:
+    """
+    Decorator that wraps a sync or async function in a span.
+
+    Args:
+        name: Span name (default: function's qualified name)
+        new_trace: Start a new trace for every call (workflow entry points)
+        **attributes: Static attributes for every call
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with span(span_name, new_trace=new_trace, **attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name, new_trace=new_trace, **attributes):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
@@ -19,6 +19,23 @@ Usage:
     reporter.post_tool_use("sess-123", tool_name="Read", result={"bytes": 3245})
     reporter.session_end("sess-123", reason="completed")
 
+Async mode (inside a running event loop):
+    reporter = EventReporter(source_app="math-system", async_mode=True)
+    reporter.notification("sess-123", "Workflow started")  # enqueues, never waits
+    ...
+    await reporter.aclose()  # flush pending events
+
+    Events are buffered in memory and posted in batches (by size or age) to
+    POST {base_url}/batch over one pooled AsyncClient. While the server is
+    unreachable (transport errors, 5xx, 408/429), batches are appended to a
+    JSONL spool on disk instead of piling up in memory; the sender task
+    replays the spool in order, one batch at a time, once the server is
+    reachable again (probing on the retry backoff even if no new events
+    arrive). Events the server rejects outright (other 4xx) are never
+    retried: they go to a ".rejected" file next to the spool. Spool file
+    I/O runs on a single background thread, never on the event loop. The
+    spool location is set by OBS_SPOOL_PATH.
+
 Schema (aligned with the GitHub repo):
 {
   "source_app": "str",
@@ -30,14 +47,33 @@ Schema (aligned with the GitHub repo):
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import asyncio
+import json
 import os
+import time
 
 import httpx
 
 
+# Async-mode tuning
+BATCH_SIZE = 100  # Max events per POST
+FLUSH_INTERVAL_S = 0.5  # Max time an event waits for a batch to fill
+MAX_PENDING = 10_000  # Events held in memory before new ones go to the spool
+RETRY_BACKOFF_S = (1.0, 2.0, 5.0, 15.0, 30.0)  # Delay before probing a down server
+DEFAULT_SPOOL_DIR = "/tmp/math-observability"
+RETRYABLE_STATUS = (408, 429)  # 4xx responses that are worth retrying
+
+
+def _is_retryable(status_code: int) -> bool:
+    """Whether a failed delivery may succeed later (5xx, 408, 429)"""
+    return status_code >= 500 or status_code in RETRYABLE_STATUS
+
+
 class HookEventType(str, Enum):
     """Supported hook event types (kept in sync with the observability server)."""
 
@@ -61,37 +97,370 @@ class ObservabilityEvent:
     hook_event_type: HookEventType
     payload: Dict[str, Any]
 
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "source_app": self.source_app,
+            "session_id": self.session_id,
+            "hook_event_type": self.hook_event_type.value,
+            "payload": self.payload,
+        }
+
 
 class EventReporter:
     """HTTP client for posting observability events.
 
     The server base URL can be configured via the OBS_EVENTS_URL environment
     variable. Defaults to http://localhost:4000/events
+
+    By default each event is posted synchronously over a pooled client. With
+    async_mode=True, send() only enqueues and a background task batches,
+    delivers and (during outages) spools events; see the module docstring.
     """
 
     def __init__(
         self,
         source_app: str,
         base_url: Optional[str] = None,
-        timeout_s: float = 5.0
+        timeout_s: float = 5.0,
+        async_mode: bool = False,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_s: float = FLUSH_INTERVAL_S,
+        max_pending: int = MAX_PENDING,
+        spool_path: Optional[str] = None,
     ):
         self.source_app = source_app
         self.base_url = base_url or os.getenv("OBS_EVENTS_URL", "http://localhost:4000/events")
+        self.batch_url = self.base_url.rstrip("/") + "/batch"
         self.timeout_s = timeout_s
+        self.async_mode = async_mode
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_pending = max_pending
+        self.spool_path = Path(spool_path or os.getenv(
+            "OBS_SPOOL_PATH", f"{DEFAULT_SPOOL_DIR}/{source_app}.spool.jsonl"
+        ))
+        self.replay_path = self.spool_path.with_name(self.spool_path.name + ".replay")
+        self.rejected_path = self.spool_path.with_name(self.spool_path.name + ".rejected")
+
+        self._client: Optional[httpx.Client] = None
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch_supported = True
+        self._failures = 0
+        self._retry_at = 0.0
+        # One worker keeps spool appends, renames and reads in order
+        self._spool_executor: Optional[ThreadPoolExecutor] = None
+        self._spool_pending = False
+
+        self.sent_count = 0
+        self.spooled_count = 0
+        self.replayed_count = 0
+        self.rejected_count = 0
 
     def _post(self, event: ObservabilityEvent) -> bool:
         """Post event to the server. Returns True on 2xx, False otherwise."""
+        if self.async_mode:
+            return self._enqueue(event.to_json())
+        try:
+            if self._client is None:
+                self._client = httpx.Client(timeout=self.timeout_s)
+            resp = self._client.post(self.base_url, json=event.to_json())
+            return 200 <= resp.status_code < 300
+        except Exception:
+            return False
+
+    def close(self) -> None:
+        """Close the pooled synchronous client."""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    # ------------------------------ Async mode ------------------------------
+
+    def _enqueue(self, event: Dict[str, Any]) -> bool:
+        """Queue an event for the sender task without waiting.
+
+        Without a running event loop, or when the in-memory queue is full,
+        the event goes straight to the spool. Returns True once the event is
+        queued or spooled.
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._spool_now([event])
+
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run(), name=f"event-reporter-{self.source_app}")
+
         try:
-            with httpx.Client(timeout=self.timeout_s) as client:
-                resp = client.post(self.base_url, json={
-                    "source_app": event.source_app,
-                    "session_id": event.session_id,
-                    "hook_event_type": event.hook_event_type.value,
-                    "payload": event.payload,
-                })
-                return 200 <= resp.status_code < 300
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            # Written on the spool thread; send() must not block the loop
+            self._spool_in_background([event])
+            return True
+
+    async def flush(self) -> None:
+        """Wait until every queued event has been delivered or spooled."""
+        if self._queue is not None:
+            await self._queue.join()
+        if self._spool_executor is not None:
+            await self._in_spool_thread(lambda: None)  # Drain pending spool writes
+
+    async def aclose(self) -> None:
+        """Flush queued events, stop the sender task and close the pool."""
+        await self.flush()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._spool_executor is not None:
+            self._spool_executor.shutdown(wait=True)
+            self._spool_executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Delivery counters for async mode."""
+        return {
+            "pending": self._queue.qsize() if self._queue else 0,
+            "sent": self.sent_count,
+            "spooled": self.spooled_count,
+            "replayed": self.replayed_count,
+            "rejected": self.rejected_count,
+            "server_down": self._failures > 0,
+            "spool_path": str(self.spool_path),
+        }
+
+    async def _run(self) -> None:
+        """Drain the queue into batches bounded by size and age.
+
+        While spooled events are waiting, an idle sender wakes up when the
+        retry backoff expires and replays them without waiting for new
+        events.
+        """
+        self._spool_pending = await self._in_spool_thread(
+            lambda: self.spool_path.exists() or self.replay_path.exists()
+        )
+        while True:
+            if self._spool_pending:
+                try:
+                    first = await asyncio.wait_for(
+                        self._queue.get(), max(self._retry_at - time.monotonic(), 0.0)
+                    )
+                except asyncio.TimeoutError:
+                    # Probe: a failed replay pushes _retry_at out by the backoff
+                    await self._replay_spool()
+                    continue
+            else:
+                first = await self._queue.get()
+
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval_s
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            try:
+                await self._dispatch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _dispatch(self, batch: List[Dict[str, Any]]) -> None:
+        """Deliver a batch live, or spool it while the server is down."""
+        if self._failures and time.monotonic() < self._retry_at:
+            await self._spool(batch)
+            return
+
+        unsent = await self._deliver(batch)
+        self.sent_count += len(batch) - len(unsent)
+        if unsent:
+            await self._spool(unsent)
+            self._mark_down()
+            return
+
+        self._failures = 0
+        if self._spool_pending:
+            await self._replay_spool()
+
+    async def _deliver(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """POST a batch over the pooled client.
+
+        Returns the events still to be retried later (transport error, 5xx,
+        408, 429): empty once the server has answered for every event (2xx,
+        or a permanent rejection, which is quarantined), and only the unsent
+        tail if a per-event fallback fails partway.
+        """
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(timeout=self.timeout_s)
+        client = self._async_client
+
+        sent = 0
+        try:
+            if self._batch_supported:
+                resp = await client.post(self.batch_url, json=batch)
+                if 200 <= resp.status_code < 300:
+                    return []
+                if _is_retryable(resp.status_code):
+                    return batch
+                if resp.status_code in (404, 405):
+                    # Server predates /events/batch
+                    self._batch_supported = False
+                elif len(batch) == 1:
+                    await self._reject(batch)
+                    return []
+                # Otherwise the batch was rejected as a whole: post events
+                # one by one so only the invalid ones are quarantined
+
+            for event in batch:
+                resp = await client.post(self.base_url, json=event)
+                if _is_retryable(resp.status_code):
+                    break
+                if not 200 <= resp.status_code < 300:
+                    await self._reject([event])
+                sent += 1
+            return batch[sent:]
         except Exception:
+            return batch[sent:]
+
+    def _mark_down(self) -> None:
+        delay = RETRY_BACKOFF_S[min(self._failures, len(RETRY_BACKOFF_S) - 1)]
+        self._failures += 1
+        self._retry_at = time.monotonic() + delay
+
+    @staticmethod
+    def _append_lines(path: Path, events: List[Dict[str, Any]]) -> bool:
+        """Append events to a JSONL file (one JSON object per line)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with path.open("a", encoding="utf-8") as f:
+                f.writelines(json.dumps(event) + "\n" for event in events)
+            return True
+        except OSError:
+            return False
+
+    def _spool_thread(self) -> ThreadPoolExecutor:
+        if self._spool_executor is None:
+            self._spool_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="obs-spool")
+        return self._spool_executor
+
+    async def _in_spool_thread(self, func, *args):
+        """Run blocking spool I/O on the single spool thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._spool_thread(), func, *args)
+
+    def _count_spooled(self, batch: List[Dict[str, Any]], appended: bool) -> bool:
+        """Record a finished spool append; only a successful one counts."""
+        if appended:
+            self.spooled_count += len(batch)
+            self._spool_pending = True
+        return appended
+
+    def _spool_now(self, batch: List[Dict[str, Any]]) -> bool:
+        """Append events to the spool from synchronous code (no event loop)."""
+        return self._count_spooled(batch, self._append_lines(self.spool_path, batch))
+
+    def _spool_in_background(self, batch: List[Dict[str, Any]]) -> None:
+        """Queue a spool append on the spool thread without waiting.
+
+        The counters are updated on the event loop once the append has
+        finished, and only if it succeeded.
+        """
+        appended = asyncio.wrap_future(
+            self._spool_thread().submit(self._append_lines, self.spool_path, batch)
+        )
+        appended.add_done_callback(
+            lambda done: self._count_spooled(batch, done.exception() is None and done.result())
+        )
+
+    async def _spool(self, batch: List[Dict[str, Any]]) -> bool:
+        """Append events to the on-disk spool for a later replay."""
+        return self._count_spooled(
+            batch, await self._in_spool_thread(self._append_lines, self.spool_path, batch)
+        )
+
+    async def _reject(self, events: List[Dict[str, Any]]) -> None:
+        """Quarantine events the server refused; they are never retried."""
+        await self._in_spool_thread(self._append_lines, self.rejected_path, events)
+        self.rejected_count += len(events)
+
+    def _read_replay_batch(self, offset: int) -> tuple:
+        """Up to batch_size events of the .replay file from `offset`.
+
+        Returns (events, start offset of each event's line, next offset).
+        """
+        batch, starts = [], []
+        with self.replay_path.open("rb") as f:
+            f.seek(offset)
+            for _ in range(self.batch_size):
+                start = f.tell()
+                line = f.readline()
+                if not line:
+                    break
+                try:
+                    batch.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # Partial line from an interrupted write
+                starts.append(start)
+            return batch, starts, f.tell()
+
+    def _claim_spool(self) -> bool:
+        """Move the spool to the .replay file (unless one is unfinished); False if nothing to replay."""
+        if self.replay_path.exists():
+            return True
+        if not self.spool_path.exists():
             return False
+        os.replace(self.spool_path, self.replay_path)
+        return True
+
+    async def _replay_spool(self) -> None:
+        """Re-send spooled events in order, holding one batch in memory.
+
+        The spool is renamed to a .replay file before reading so new spills
+        go to a fresh spool. If delivery fails partway, the unsent tail is
+        kept in the .replay file and resumed first next time.
+        """
+        while await self._in_spool_thread(self._claim_spool):
+            offset = 0
+            while True:
+                batch, starts, next_offset = await self._in_spool_thread(self._read_replay_batch, offset)
+                if not batch:
+                    break
+                unsent = await self._deliver(batch)
+                self.replayed_count += len(batch) - len(unsent)
+                if unsent:
+                    # Keep only the lines from the first unsent event on
+                    self._mark_down()
+                    first_unsent = starts[len(batch) - len(unsent)]
+                    await self._in_spool_thread(self._truncate_front, self.replay_path, first_unsent)
+                    return
+                self._failures = 0
+                offset = next_offset
+
+            await self._in_spool_thread(self.replay_path.unlink)
+        self._spool_pending = False
+
+    @staticmethod
+    def _truncate_front(path: Path, offset: int) -> None:
+        """Drop the first `offset` bytes of a file by streaming the rest."""
+        tmp_path = path.with_name(path.name + ".tmp")
+        with path.open("rb") as src, tmp_path.open("wb") as dst:
+            src.seek(offset)
+            while chunk := src.read(1 << 16):
+                dst.write(chunk)
+        os.replace(tmp_path, path)
 
     # -------------------------- Convenience helpers -------------------------
 
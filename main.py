@@ -6,33 +6,36 @@ Architecture:
 - Subagents: 12 specialized agents (defined inline)
 - Pattern: ClaudeSDKClient with AgentDefinition dict
 
-VERSION: 3.1.0 - Kenneth-Liao Pattern + Feedback Loop Integration
+VERSION: 3.2.0 - Lazy subagent loading via registry manifest
 DATE: 2025-10-16
 """
 
 import asyncio
+from pathlib import Path
 from dotenv import load_dotenv
 from claude_agent_sdk import ClaudeSDKClient, ClaudeAgentOptions
 
-# Import all 12 subagent definitions from subagents/ directory
-from subagents import (
-    knowledge_builder,
-    quality_agent,
-    research_agent,
-    socratic_requirements_agent,
-    neo4j_query_agent,
-    problem_decomposer_agent,
-    problem_scaffolding_generator_agent,
-    personalization_engine_agent,
-    feedback_learning_agent,
-    self_improver_agent,
-    meta_planning_analyzer,
-    meta_query_helper,
-)
+# Subagent name -> registry agent name (module export with hyphens). Definitions
+# are imported lazily from subagents/ via the registry's discovery manifest.
+SUBAGENTS_DIR = Path(__file__).parent / "subagents"
+SUBAGENTS = {
+    "knowledge-builder": "knowledge-builder",
+    "quality-agent": "quality-agent",
+    "research-agent": "research-agent",
+    "socratic-requirements-agent": "socratic-requirements-agent",
+    "neo4j-query-agent": "neo4j-query-agent",
+    "problem-decomposer": "problem-decomposer-agent",
+    "problem-scaffolding-generator": "problem-scaffolding-generator-agent",
+    "personalization-engine": "personalization-engine-agent",
+    "feedback-learning-agent": "feedback-learning-agent",
+    "self-improver": "self-improver-agent",
+    "meta-planning-analyzer": "meta-planning-analyzer",
+    "meta-query-helper": "meta-query-helper",
+}
 
 # Optional: Import infrastructure for enhanced features
 try:
-    from infrastructure import StructuredLogger, PerformanceMonitor, ErrorTracker
+    from infrastructure import StructuredLogger, PerformanceMonitor, ErrorTracker, AgentRegistry
     INFRASTRUCTURE_AVAILABLE = True
 except ImportError:
     INFRASTRUCTURE_AVAILABLE = False
@@ -70,6 +73,18 @@ async def main():
         print("✅ Infrastructure initialized (logging, monitoring, error tracking)")
         print()
     
+    # Subagent definitions: manifest-backed lazy mapping when available
+    if INFRASTRUCTURE_AVAILABLE:
+        registry = AgentRegistry(SUBAGENTS_DIR)
+        registry.discover_agents()
+        subagent_definitions = registry.agent_map(SUBAGENTS)
+    else:
+        import subagents
+        subagent_definitions = {
+            name: getattr(subagents, agent_name.replace("-", "_"))
+            for name, agent_name in SUBAGENTS.items()
+        }
+    
     # Configure Claude Agent SDK options
     options = ClaudeAgentOptions(
         # Model configuration
@@ -98,21 +113,8 @@ async def main():
             'mcp__memory-keeper__context_search',
         ],
         
-        # Subagent definitions (11 agents)
-        agents={
-            "knowledge-builder": knowledge_builder,
-            "quality-agent": quality_agent,
-            "research-agent": research_agent,
-            "socratic-requirements-agent": socratic_requirements_agent,
-            "neo4j-query-agent": neo4j_query_agent,
-            "problem-decomposer": problem_decomposer_agent,
-            "problem-scaffolding-generator": problem_scaffolding_generator_agent,
-            "personalization-engine": personalization_engine_agent,
-            "feedback-learning-agent": feedback_learning_agent,
-            "self-improver": self_improver_agent,
-            "meta-planning-analyzer": meta_planning_analyzer,
-            "meta-query-helper": meta_query_helper,
-        },
+        # Subagent definitions (12 agents)
+        agents=subagent_definitions,
         
         # MCP servers
         mcp_servers={
@@ -35,14 +35,17 @@ export function useWebSocket(url: string) {
             }));
             // Only keep the most recent events up to maxEvents
             events.value = processedEvents.slice(-maxEvents);
-          } else if (message.type === 'event') {
-            const newEvent = message.data as HookEvent;
+          } else if (message.type === 'event' || message.type === 'batch') {
+            // 'batch' frames carry several events ingested in one transaction
+            const newEvents = message.type === 'batch'
+              ? (Array.isArray(message.data) ? message.data : [])
+              : [message.data as HookEvent];
             // Convert timestamp to number if it's a string
-            const processedEvent = {
-              ...newEvent,
-              timestamp: typeof newEvent.timestamp === 'string' ? new Date(newEvent.timestamp).getTime() : newEvent.timestamp
-            };
-            events.value.push(processedEvent);
+            const processedEvents = newEvents.map(e => ({
+              ...e,
+              timestamp: typeof e.timestamp === 'string' ? new Date(e.timestamp).getTime() : e.timestamp
+            }));
+            events.value.push(...processedEvents);
             
             // Limit events array to maxEvents, removing the oldest when exceeded
             if (events.value.length > maxEvents) {
@@ -18,7 +18,7 @@ export interface FilterOptions {
 }
 
 export interface WebSocketMessage {
-  type: 'initial' | 'event';
+  type: 'initial' | 'event' | 'batch';
   data: HookEvent | HookEvent[];
 }
 
@@ -5,6 +5,42 @@ Lightweight Observability Server
 Minimal event collection server for Claude Code hook events.
 Stores events in SQLite, provides query API.
 
+Storage model:
+    One long-lived writer connection (WAL, synchronous=NORMAL) owned by a
+    single writer task fed through an asyncio queue; concurrent writes are
+    group-committed. Reads use a small pool of read-only connections in a
+    thread executor, so queries never block ingestion and vice versa.
+
+Rollups:
+    Per-session and per-minute (hook type x agent) aggregates are upserted
+    in the same transaction as the raw events, so /stats/* endpoints read
+    O(buckets) rows instead of scanning events.
+
+Search:
+    An FTS5 table (rowid = event id) indexes hook type, summary, session
+    name and selected payload fields. It is written in the same transaction
+    as the events and pruned by retention.
+
+Retention:
+    A background job archives raw events past their TTL (per event type)
+    into gzip JSONL segments per day under data/archive/ and only then
+    deletes them (a failed archive write leaves the events in place),
+    downsamples old minute rollups to hourly buckets and runs an
+    incremental VACUUM. Rollups outlive the raw events they summarize.
+    Configure with OBS_RETENTION_DAYS (default 30, -1 keeps forever),
+    OBS_RETENTION_TTLS ("PreToolUse=7,Notification=3"),
+    OBS_ROLLUP_MINUTE_DAYS (default 14) and OBS_RETENTION_INTERVAL_S.
+
+WebSocket fan-out:
+    Each /stream client has its own bounded send queue drained by its own
+    sender task. Ingest only enqueues; a slow client drops its oldest
+    frames instead of stalling ingestion for everyone.
+
+Metrics:
+    /metrics is rendered from in-memory counters and histograms updated
+    as events are stored and frames are sent, so a scrape never queries
+    SQLite or waits on the writer.
+
 Based on: disler/claude-code-hooks-multi-agent-observability architecture
 Implementation: Simplified Python version (100 lines vs 1000+ line TypeScript)
 
@@ -14,19 +50,36 @@ Usage:
 
 API:
     POST /events - Receive hook events
-    GET /events/recent?limit=100 - Query recent events
+    POST /events/batch - Receive an array of hook events in one transaction
+    GET /events/recent?limit=100 - Query recent events (newest first)
+        &before_id=N - Older page (keyset cursor from next_before_id)
+        &after_id=N - Newer page (events just after id N, newest first)
+        &since_id=N - Incremental poll: events after id N, oldest first
+    GET /events/search?q=... - Full-text search (FTS5), ranked or newest first
+    GET /events/sessions - Sessions with event counts (from rollups)
+    GET /stats/sessions - Per-session counts and first/last times
+    GET /stats/hooks - Event counts by hook type
+    GET /stats/agents - Event counts by agent
+    GET /stats/tokens - Token usage totals
+    GET /stats/timeline - Per-minute counts (optionally by hook type/agent)
+    GET /metrics - Prometheus/OpenMetrics exposition (in-memory counters)
     GET /health - Health check
 
 VERSION: 1.0.0
 DATE: 2025-10-16
 """
 
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from typing import Dict, Any, List, Optional, Set
+from typing import Callable, Dict, Any, List, Optional
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import bisect
+import gzip
+import os
 import sqlite3
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 import uvicorn
@@ -49,17 +102,121 @@ class ObservabilityEvent(BaseModel):
 DB_PATH = Path(__file__).parent / "data" / "events.db"
 DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-# WebSocket clients storage
-websocket_clients: Set[WebSocket] = set()
+# Frames buffered per WebSocket client before the oldest are dropped
+CLIENT_QUEUE_MAXSIZE = 256
+
+
+def parse_ttls(spec: str) -> Dict[str, int]:
+    """Parse "EventType=days,Other=days" into a TTL map"""
+    ttls = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        event_type, days = item.split("=", 1)
+        ttls[event_type.strip()] = int(days)
+    return ttls
+
+
+# Retention (days; -1 keeps forever)
+RETENTION_DEFAULT_DAYS = int(os.getenv("OBS_RETENTION_DAYS", "30"))
+RETENTION_TTL_DAYS: Dict[str, int] = parse_ttls(os.getenv("OBS_RETENTION_TTLS", ""))
+ROLLUP_MINUTE_RETENTION_DAYS = int(os.getenv("OBS_ROLLUP_MINUTE_DAYS", "14"))
+RETENTION_INTERVAL_S = int(os.getenv("OBS_RETENTION_INTERVAL_S", "3600"))
+RETENTION_CHUNK_SIZE = 5000  # Events archived per writer job
+VACUUM_PAGES_PER_RUN = 2000  # Free pages returned to the OS per run
+
+# Upper bound on events accepted by a single POST /events/batch
+MAX_BATCH_SIZE = 1000
+
+# Upper bound on events returned by one page of /events/recent or /events/search
+MAX_PAGE_SIZE = 1000
+
+# Storage tuning
+READER_POOL_SIZE = 4  # Read-only connections (and reader threads)
+WRITE_QUEUE_MAXSIZE = 10_000  # Pending write jobs before ingest applies backpressure
+MAX_GROUP_COMMIT = 256  # Write jobs coalesced into one transaction
+
+# /metrics (seconds)
+WRITE_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+SEND_LAG_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+INGEST_RATE_WINDOW_S = 60
+
+INSERT_EVENT_SQL = """
+    INSERT INTO events (timestamp, ts_ms, source_app, session_id, hook_event_type, payload, chat, summary, session_name, session_context)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+SESSION_ROLLUP_SQL = """
+    INSERT INTO session_rollup (session_id, session_name, source_app, event_count, first_ts_ms, last_ts_ms, first_event, last_event)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(session_id) DO UPDATE SET
+        event_count = event_count + excluded.event_count,
+        session_name = COALESCE(excluded.session_name, session_name),
+        last_event = CASE WHEN excluded.last_ts_ms >= last_ts_ms THEN excluded.last_event ELSE last_event END,
+        last_ts_ms = MAX(last_ts_ms, excluded.last_ts_ms)
+"""
+
+MINUTE_ROLLUP_SQL = """
+    INSERT INTO minute_rollup (bucket_ms, hook_event_type, agent, event_count, input_tokens, output_tokens, task_calls)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(bucket_ms, hook_event_type, agent) DO UPDATE SET
+        event_count = event_count + excluded.event_count,
+        input_tokens = input_tokens + excluded.input_tokens,
+        output_tokens = output_tokens + excluded.output_tokens,
+        task_calls = task_calls + excluded.task_calls
+"""
+
+# SQL equivalent of is_task_call(), used when rebuilding rollups
+TASK_CALL_SQL_EXPR = """
+    (hook_event_type = 'PreToolUse' AND json_extract(payload, '$.tool_name') = 'Task')
+"""
+
+# SQL equivalent of extract_agent(), used when rebuilding rollups
+AGENT_SQL_EXPR = """
+    CASE
+        WHEN hook_event_type = 'PreToolUse' AND json_extract(payload, '$.tool_name') = 'Task'
+            THEN COALESCE(json_extract(payload, '$.tool_input.subagent_type'), 'unknown')
+        ELSE COALESCE(json_extract(payload, '$.agent_name'), '')
+    END
+"""
+
+# Payload keys whose values are indexed for /events/search
+SEARCH_PAYLOAD_FIELDS = (
+    "message", "error", "reason", "summary", "text", "text_preview",
+    "problem_text", "problem_id", "problem_type", "prompt", "dimension",
+    "top_concept", "tool_name", "agent_name", "pattern_type", "image_name",
+)
+
+INSERT_SEARCH_SQL = """
+    INSERT INTO events_fts (rowid, hook_event_type, summary, session_name, body)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+DAY_MS = 24 * HOUR_MS
+
+EVENT_COLUMNS = "id, timestamp, ts_ms, source_app, session_id, hook_event_type, payload, chat, summary, session_name, session_context"
 
 
 def init_db():
     """Initialize SQLite database"""
     conn = sqlite3.connect(DB_PATH)
+    
+    # Incremental auto-vacuum lets retention hand freed pages back to the OS
+    # in small steps; converting an existing database needs one full VACUUM
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("VACUUM")
+    
+    # WAL is persistent in the database file; readers no longer block the writer
+    conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("""
         CREATE TABLE IF NOT EXISTS events (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             timestamp TEXT NOT NULL,
+            ts_ms INTEGER,
             source_app TEXT NOT NULL,
             session_id TEXT NOT NULL,
             hook_event_type TEXT NOT NULL,
@@ -70,24 +227,453 @@ def init_db():
             session_context TEXT
         )
     """)
+    
+    # Migrate databases created before ts_ms existed: add the column and
+    # backfill it from the local-time ISO timestamp
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+    if "ts_ms" not in columns:
+        conn.execute("ALTER TABLE events ADD COLUMN ts_ms INTEGER")
+        conn.execute("""
+            UPDATE events
+            SET ts_ms = CAST(ROUND((julianday(timestamp, 'utc') - 2440587.5) * 86400000) AS INTEGER)
+            WHERE ts_ms IS NULL
+        """)
+    
     conn.execute("CREATE INDEX IF NOT EXISTS idx_session ON events(session_id)")
-    conn.execute("CREATE INDEX IF NOT EXISTS idx_timestamp ON events(timestamp)")
+    conn.execute("DROP INDEX IF EXISTS idx_timestamp")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_ts_ms ON events(ts_ms)")
     conn.execute("CREATE INDEX IF NOT EXISTS idx_event_type ON events(hook_event_type)")
+    
+    # Rollups maintained incrementally on ingest
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS session_rollup (
+            session_id TEXT PRIMARY KEY,
+            session_name TEXT,
+            source_app TEXT,
+            event_count INTEGER NOT NULL,
+            first_ts_ms INTEGER NOT NULL,
+            last_ts_ms INTEGER NOT NULL,
+            first_event TEXT NOT NULL,
+            last_event TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_session_rollup_last ON session_rollup(last_ts_ms)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS minute_rollup (
+            bucket_ms INTEGER NOT NULL,
+            hook_event_type TEXT NOT NULL,
+            agent TEXT NOT NULL,
+            event_count INTEGER NOT NULL,
+            input_tokens INTEGER NOT NULL DEFAULT 0,
+            output_tokens INTEGER NOT NULL DEFAULT 0,
+            task_calls INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (bucket_ms, hook_event_type, agent)
+        ) WITHOUT ROWID
+    """)
+    
+    # Full-text index over events (rowid = events.id)
+    has_search = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = 'events_fts'"
+    ).fetchone()
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS events_fts USING fts5(
+            hook_event_type, summary, session_name, body
+        )
+    """)
+    
+    # First start with rollups/search: build them from existing events
+    has_rollups = conn.execute("SELECT 1 FROM session_rollup LIMIT 1").fetchone()
+    has_events = conn.execute("SELECT 1 FROM events LIMIT 1").fetchone()
+    if has_events and not has_rollups:
+        rebuild_rollups(conn)
+    if has_events and not has_search:
+        rebuild_search_index(conn)
+    
     conn.commit()
     conn.close()
 
 
+def rebuild_search_index(conn: sqlite3.Connection):
+    """Recompute events_fts from the raw events table"""
+    conn.execute("DELETE FROM events_fts")
+    cursor = conn.execute(
+        "SELECT id, hook_event_type, summary, session_name, payload FROM events"
+    )
+    while True:
+        rows = cursor.fetchmany(1000)
+        if not rows:
+            break
+        search_rows = []
+        for event_id, hook_event_type, summary, session_name, payload in rows:
+            try:
+                payload = json.loads(payload) if payload else {}
+            except json.JSONDecodeError:
+                payload = {}
+            search_rows.append((
+                event_id, hook_event_type, _json_text(summary),
+                _json_text(session_name), search_body(payload)
+            ))
+        conn.executemany(INSERT_SEARCH_SQL, search_rows)
+
+
+def rebuild_rollups(conn: sqlite3.Connection):
+    """Recompute rollup tables from the raw events table"""
+    conn.execute("DELETE FROM session_rollup")
+    conn.execute("DELETE FROM minute_rollup")
+    conn.execute("""
+        INSERT INTO session_rollup (session_id, session_name, source_app, event_count, first_ts_ms, last_ts_ms, first_event, last_event)
+        SELECT session_id, MAX(session_name), MIN(source_app), COUNT(*),
+               MIN(ts_ms), MAX(ts_ms), MIN(timestamp), MAX(timestamp)
+        FROM events
+        GROUP BY session_id
+    """)
+    conn.execute(f"""
+        INSERT INTO minute_rollup (bucket_ms, hook_event_type, agent, event_count, input_tokens, output_tokens, task_calls)
+        SELECT ts_ms - ts_ms % {MINUTE_MS}, hook_event_type, {AGENT_SQL_EXPR}, COUNT(*),
+               SUM(CAST(COALESCE(json_extract(payload, '$.usage.input_tokens'), 0) AS INTEGER)),
+               SUM(CAST(COALESCE(json_extract(payload, '$.usage.output_tokens'), 0) AS INTEGER)),
+               SUM({TASK_CALL_SQL_EXPR})
+        FROM events
+        GROUP BY 1, 2, 3
+    """)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with Prometheus semantics (value <= le)"""
+    
+    def __init__(self, buckets: tuple):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+    
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+    
+    def cumulative(self) -> List[tuple]:
+        """(le, cumulative count) pairs, ending with +Inf"""
+        pairs = []
+        total = 0
+        for le, n in zip(self.buckets + (float("inf"),), self.counts):
+            total += n
+            pairs.append((le, total))
+        return pairs
+
+
+class ServerMetrics:
+    """
+    In-memory counters behind /metrics.
+    
+    Updated only from the event loop as work happens, so a scrape just
+    formats numbers: it never touches the database or the write queue.
+    """
+    
+    def __init__(self):
+        self.events_by_type: Dict[str, int] = {}
+        self.ingest_requests: Dict[str, int] = {"single": 0, "batch": 0}
+        self.ingest_errors = 0
+        self.write_latency = Histogram(WRITE_LATENCY_BUCKETS)
+        self.write_jobs = 0
+        self.ws_frames_sent = 0
+        self.ws_frames_dropped = 0
+        self.ws_send_lag = Histogram(SEND_LAG_BUCKETS)
+        # Per-second ingest counts in a ring, for a rate gauge that needs no scan
+        self._rate_counts = [0] * INGEST_RATE_WINDOW_S
+        self._rate_seconds = [0] * INGEST_RATE_WINDOW_S
+    
+    def record_ingest(self, endpoint: str, events: List["ObservabilityEvent"]):
+        """Count a successfully stored request and its events"""
+        self.ingest_requests[endpoint] += 1
+        for event in events:
+            event_type = event.hook_event_type
+            self.events_by_type[event_type] = self.events_by_type.get(event_type, 0) + 1
+        
+        second = int(time.monotonic())
+        slot = second % INGEST_RATE_WINDOW_S
+        if self._rate_seconds[slot] != second:
+            self._rate_seconds[slot] = second
+            self._rate_counts[slot] = 0
+        self._rate_counts[slot] += len(events)
+    
+    def ingest_rate(self) -> float:
+        """Events per second averaged over the last INGEST_RATE_WINDOW_S seconds"""
+        oldest = int(time.monotonic()) - INGEST_RATE_WINDOW_S
+        total = sum(
+            count for count, second in zip(self._rate_counts, self._rate_seconds)
+            if second > oldest
+        )
+        return total / INGEST_RATE_WINDOW_S
+
+
+metrics = ServerMetrics()
+
+
+class EventStore:
+    """
+    SQLite access for the server.
+    
+    Writes: one connection owned by a single writer task. Handlers submit
+    write jobs (callables taking the connection) through an asyncio queue;
+    the writer drains whatever is pending, applies it in one transaction on
+    a dedicated thread and resolves each job's future with its result.
+    
+    Reads: a fixed pool of read-only connections, each used by one reader
+    thread at a time via run_in_executor.
+    """
+    
+    def __init__(self, db_path: Path, reader_pool_size: int = READER_POOL_SIZE):
+        self.db_path = db_path
+        self.reader_pool_size = reader_pool_size
+        self._writer_conn: Optional[sqlite3.Connection] = None
+        self._writer_executor: Optional[ThreadPoolExecutor] = None
+        self._reader_executor: Optional[ThreadPoolExecutor] = None
+        self._write_queue: Optional[asyncio.Queue] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+    
+    async def start(self):
+        """Open connections and start the writer task"""
+        self._writer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-writer")
+        self._reader_executor = ThreadPoolExecutor(
+            max_workers=self.reader_pool_size,
+            thread_name_prefix="sqlite-reader"
+        )
+        
+        loop = asyncio.get_running_loop()
+        self._writer_conn = await loop.run_in_executor(self._writer_executor, self._open_writer)
+        
+        self._readers = asyncio.Queue()
+        for _ in range(self.reader_pool_size):
+            self._readers.put_nowait(self._open_reader())
+        
+        self._write_queue = asyncio.Queue(maxsize=WRITE_QUEUE_MAXSIZE)
+        self._writer_task = asyncio.create_task(self._writer_loop(), name="sqlite-writer")
+    
+    async def stop(self):
+        """Drain pending writes, stop the writer task and close connections"""
+        if self._writer_task:
+            await self._write_queue.join()
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+        
+        loop = asyncio.get_running_loop()
+        if self._writer_conn:
+            await loop.run_in_executor(self._writer_executor, self._writer_conn.close)
+        while self._readers and not self._readers.empty():
+            self._readers.get_nowait().close()
+        
+        for executor in (self._writer_executor, self._reader_executor):
+            if executor:
+                executor.shutdown(wait=True)
+    
+    def _open_writer(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _open_reader(self) -> sqlite3.Connection:
+        return sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            check_same_thread=False
+        )
+    
+    @property
+    def write_queue_depth(self) -> int:
+        return self._write_queue.qsize() if self._write_queue else 0
+    
+    async def write(self, job: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run a write job on the writer connection and return its result"""
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((job, future, True))
+        return await future
+    
+    async def maintain(self, job: Callable[[sqlite3.Connection], Any]) -> Any:
+        """
+        Run a job on the writer connection outside any transaction.
+        
+        For statements that manage their own transaction (e.g. executescript
+        with incremental_vacuum). Never coalesced with other jobs.
+        """
+        future = asyncio.get_running_loop().create_future()
+        await self._write_queue.put((job, future, False))
+        return await future
+    
+    async def read(self, query: Callable[..., Any], *args) -> Any:
+        """Run query(conn, *args) on a pooled read-only connection"""
+        conn = await self._readers.get()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._reader_executor, query, conn, *args)
+        finally:
+            self._readers.put_nowait(conn)
+    
+    async def _writer_loop(self):
+        loop = asyncio.get_running_loop()
+        
+        while True:
+            jobs = [await self._write_queue.get()]
+            while len(jobs) < MAX_GROUP_COMMIT and not self._write_queue.empty():
+                jobs.append(self._write_queue.get_nowait())
+            
+            started = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(self._writer_executor, self._apply, jobs)
+            except Exception as e:
+                results = [e] * len(jobs)
+            metrics.write_latency.observe(time.perf_counter() - started)
+            metrics.write_jobs += len(jobs)
+            
+            for (_, future, _), result in zip(jobs, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            
+            for _ in jobs:
+                self._write_queue.task_done()
+    
+    def _apply(self, jobs: List[tuple]) -> List[Any]:
+        """
+        Apply queued jobs in order (runs on the writer thread).
+        
+        Consecutive write jobs share one transaction; maintenance jobs run
+        alone between them.
+        """
+        results: List[Any] = []
+        group: List[Callable] = []
+        
+        for job, _, transactional in jobs:
+            if transactional:
+                group.append(job)
+                continue
+            results.extend(self._apply_transaction(group))
+            group = []
+            try:
+                results.append(job(self._writer_conn))
+            except Exception as e:
+                results.append(e)
+        
+        results.extend(self._apply_transaction(group))
+        return results
+    
+    def _apply_transaction(self, group: List[Callable]) -> List[Any]:
+        """Apply write jobs in one transaction; results or exceptions per job"""
+        if not group:
+            return []
+        
+        conn = self._writer_conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            results = [job(conn) for job in group]
+            conn.execute("COMMIT")
+            return results
+        except Exception as e:
+            conn.execute("ROLLBACK")
+            if len(group) == 1:
+                return [e]
+        
+        # A job in the group failed: apply individually so only it fails
+        results = []
+        for job in group:
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                results.append(job(conn))
+                conn.execute("COMMIT")
+            except Exception as e:
+                conn.execute("ROLLBACK")
+                results.append(e)
+        return results
+
+
+class ClientChannel:
+    """
+    Outbound path for one /stream client.
+    
+    Frames are queued without blocking; a dedicated sender task writes them
+    to the socket. When the client falls behind, the oldest queued frame is
+    dropped to make room (the dashboard only shows recent events anyway).
+    Each frame carries its enqueue time so send lag can be measured.
+    """
+    
+    def __init__(self, websocket: WebSocket, maxsize: int = CLIENT_QUEUE_MAXSIZE):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def start(self):
+        """Start the sender task"""
+        self._task = asyncio.create_task(self._run())
+    
+    async def close(self):
+        """Stop the sender task"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+    
+    def enqueue(self, message: str):
+        """Queue a pre-serialized frame, dropping the oldest if full"""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+            metrics.ws_frames_dropped += 1
+        self.queue.put_nowait((time.monotonic(), message))
+    
+    async def _run(self):
+        try:
+            while True:
+                queued_at, message = await self.queue.get()
+                await self.websocket.send_text(message)
+                metrics.ws_send_lag.observe(time.monotonic() - queued_at)
+                metrics.ws_frames_sent += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Client went away mid-send; stop receiving broadcasts
+            websocket_clients.pop(self.websocket, None)
+
+
+# WebSocket clients storage (socket -> its outbound channel)
+websocket_clients: Dict[WebSocket, ClientChannel] = {}
+
+# Shared store, created at startup
+store: Optional[EventStore] = None
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler (replaces deprecated on_event)"""
+    global store
+    
     # Startup
     init_db()
+    store = EventStore(DB_PATH)
+    await store.start()
+    retention_task = asyncio.create_task(retention_loop())
     print("✅ Observability server started")
     print(f"   Database: {DB_PATH}")
     print(f"   Listening on: http://localhost:4000")
     print(f"   WebSocket endpoint: ws://localhost:4000/stream")
     yield
     # Shutdown
+    retention_task.cancel()
+    try:
+        await retention_task
+    except asyncio.CancelledError:
+        pass
+    await store.stop()
     print("👋 Observability server shutting down")
 
 
@@ -98,6 +684,347 @@ app = FastAPI(
 )
 
 
+def now_stamps() -> tuple:
+    """Current time as (local ISO timestamp, epoch milliseconds)"""
+    now = datetime.now()
+    return now.isoformat(), int(now.timestamp() * 1000)
+
+
+def event_to_row(event: ObservabilityEvent, timestamp: str, ts_ms: int) -> tuple:
+    """Serialize an event into an INSERT_EVENT_SQL parameter tuple"""
+    return (
+        timestamp,
+        ts_ms,
+        event.source_app,
+        event.session_id,
+        event.hook_event_type,
+        json.dumps(event.payload),
+        json.dumps(event.chat) if event.chat else None,
+        event.summary,
+        event.session_name,
+        json.dumps(event.session_context) if event.session_context else None
+    )
+
+
+def _json_text(value: Optional[str]) -> Optional[str]:
+    """Treat legacy 'null' strings stored in text columns as missing"""
+    return value if value and value != 'null' else None
+
+
+def row_to_json(row: tuple) -> str:
+    """
+    Serialize an EVENT_COLUMNS row to its API JSON object.
+    
+    The payload/chat/session_context columns already hold JSON written by
+    json.dumps, so they are spliced in verbatim instead of being parsed and
+    re-encoded for every row.
+    """
+    return (
+        f'{{"id": {row[0]}, '
+        f'"timestamp": {json.dumps(row[1])}, '
+        f'"ts_ms": {json.dumps(row[2])}, '
+        f'"source_app": {json.dumps(row[3])}, '
+        f'"session_id": {json.dumps(row[4])}, '
+        f'"hook_event_type": {json.dumps(row[5])}, '
+        f'"payload": {row[6] or "{}"}, '
+        f'"chat": {_json_text(row[7]) or "null"}, '
+        f'"summary": {json.dumps(_json_text(row[8]))}, '
+        f'"session_name": {json.dumps(_json_text(row[9]))}, '
+        f'"session_context": {_json_text(row[10]) or "null"}}}'
+    )
+
+
+def rows_to_json_array(rows: List[tuple]) -> str:
+    """Serialize EVENT_COLUMNS rows to a JSON array"""
+    return "[" + ", ".join(row_to_json(row) for row in rows) + "]"
+
+
+def is_task_call(hook_event_type: str, payload: Dict[str, Any]) -> bool:
+    """Whether an event is a Task (subagent) tool call"""
+    return hook_event_type == "PreToolUse" and payload.get("tool_name") == "Task"
+
+
+def extract_agent(hook_event_type: str, payload: Dict[str, Any]) -> str:
+    """Agent an event is attributed to in rollups ('' if none)"""
+    if is_task_call(hook_event_type, payload):
+        tool_input = payload.get("tool_input")
+        agent = tool_input.get("subagent_type") if isinstance(tool_input, dict) else None
+        return str(agent) if agent is not None else "unknown"
+    agent = payload.get("agent_name")
+    return str(agent) if agent is not None else ""
+
+
+def extract_tokens(payload: Dict[str, Any]) -> tuple:
+    """(input_tokens, output_tokens) reported in a payload's usage block"""
+    usage = payload.get("usage")
+    if not isinstance(usage, dict):
+        return 0, 0
+    try:
+        return int(usage.get("input_tokens") or 0), int(usage.get("output_tokens") or 0)
+    except (TypeError, ValueError):
+        return 0, 0
+
+
+def build_rollups(events: List[ObservabilityEvent], timestamp: str, ts_ms: int) -> tuple:
+    """
+    Aggregate a batch into rollup upsert parameters.
+    
+    Returns:
+        (SESSION_ROLLUP_SQL rows, MINUTE_ROLLUP_SQL rows)
+    """
+    bucket_ms = ts_ms - ts_ms % MINUTE_MS
+    sessions: Dict[str, list] = {}
+    minutes: Dict[tuple, list] = {}
+    
+    for event in events:
+        session = sessions.get(event.session_id)
+        if session is None:
+            sessions[event.session_id] = [
+                event.session_id, event.session_name, event.source_app,
+                1, ts_ms, ts_ms, timestamp, timestamp
+            ]
+        else:
+            session[3] += 1
+            if event.session_name:
+                session[1] = event.session_name
+        
+        key = (bucket_ms, event.hook_event_type, extract_agent(event.hook_event_type, event.payload))
+        input_tokens, output_tokens = extract_tokens(event.payload)
+        counts = minutes.setdefault(key, [0, 0, 0, 0])
+        counts[0] += 1
+        counts[1] += input_tokens
+        counts[2] += output_tokens
+        counts[3] += is_task_call(event.hook_event_type, event.payload)
+    
+    return (
+        [tuple(session) for session in sessions.values()],
+        [key + tuple(counts) for key, counts in minutes.items()]
+    )
+
+
+def search_body(payload: Any) -> str:
+    """Text indexed for an event's payload: SEARCH_PAYLOAD_FIELDS values"""
+    if not isinstance(payload, dict):
+        return ""
+    parts = []
+    for field in SEARCH_PAYLOAD_FIELDS:
+        value = payload.get(field)
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool):
+            parts.append(str(value))
+        elif isinstance(value, dict):
+            # e.g. {"error": {"type": ..., "message": ...}}
+            parts.extend(str(v) for v in value.values() if isinstance(v, (str, int, float)))
+    return " ".join(parts)
+
+
+def event_to_search_row(event: ObservabilityEvent) -> tuple:
+    """events_fts columns for an event (rowid is added at insert time)"""
+    return (event.hook_event_type, event.summary, event.session_name, search_body(event.payload))
+
+
+def insert_rows(
+    conn: sqlite3.Connection,
+    rows: List[tuple],
+    rollups: Optional[tuple] = None,
+    search_rows: Optional[List[tuple]] = None
+) -> List[int]:
+    """
+    Insert event rows and apply their rollups and search index entries
+    (writer job). Returns the assigned ids.
+    
+    Runs inside the writer transaction, so rowids are contiguous and the
+    rollups and index can never disagree with the raw events.
+    """
+    conn.executemany(INSERT_EVENT_SQL, rows)
+    last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+    event_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+    
+    if rollups:
+        session_rows, minute_rows = rollups
+        conn.executemany(SESSION_ROLLUP_SQL, session_rows)
+        conn.executemany(MINUTE_ROLLUP_SQL, minute_rows)
+    
+    if search_rows:
+        conn.executemany(
+            INSERT_SEARCH_SQL,
+            [(event_id,) + search_row for event_id, search_row in zip(event_ids, search_rows)]
+        )
+    
+    return event_ids
+
+
+def select_expired_events(
+    conn: sqlite3.Connection,
+    now_ms: int,
+    limit: int = RETENTION_CHUNK_SIZE
+) -> List[tuple]:
+    """Oldest `limit` events past their TTL (read query; nothing is deleted)"""
+    clauses = []
+    params: List[Any] = []
+    
+    for event_type, days in RETENTION_TTL_DAYS.items():
+        if days >= 0:
+            clauses.append("(hook_event_type = ? AND ts_ms < ?)")
+            params.extend([event_type, now_ms - days * DAY_MS])
+    
+    if RETENTION_DEFAULT_DAYS >= 0:
+        overridden = list(RETENTION_TTL_DAYS)
+        placeholders = ", ".join("?" * len(overridden))
+        clauses.append(f"(hook_event_type NOT IN ({placeholders}) AND ts_ms < ?)")
+        params.extend(overridden + [now_ms - RETENTION_DEFAULT_DAYS * DAY_MS])
+    
+    if not clauses:
+        return []
+    
+    return conn.execute(
+        f"SELECT {EVENT_COLUMNS} FROM events WHERE {' OR '.join(clauses)} ORDER BY id LIMIT ?",
+        params + [limit]
+    ).fetchall()
+
+
+def archive_events(archive_dir: Path, rows: List[tuple]):
+    """
+    Write expired rows to gzip JSONL segments before they are deleted.
+    
+    One segment per local calendar day of the events in the chunk, named
+    events-YYYY-MM-DD-<first id>.jsonl.gz. Each segment is written to a
+    temporary file and renamed into place, so a retried chunk (e.g. after
+    a failed delete) replaces its segment instead of duplicating rows.
+    """
+    # Group by local calendar day of the event
+    by_day: Dict[str, List[tuple]] = {}
+    for row in rows:
+        by_day.setdefault(row[1][:10], []).append(row)
+    
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    for day, day_rows in by_day.items():
+        segment = archive_dir / f"events-{day}-{day_rows[0][0]:012d}.jsonl.gz"
+        tmp_path = segment.with_name(segment.name + ".tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            for row in day_rows:
+                f.write(row_to_json(row) + "\n")
+        os.replace(tmp_path, segment)
+
+
+def delete_events(conn: sqlite3.Connection, event_ids: List[int]) -> int:
+    """Delete archived events and their search rows (writer job)"""
+    expired_ids = [(event_id,) for event_id in event_ids]
+    conn.executemany("DELETE FROM events WHERE id = ?", expired_ids)
+    conn.executemany("DELETE FROM events_fts WHERE rowid = ?", expired_ids)
+    return len(expired_ids)
+
+
+def downsample_rollups(conn: sqlite3.Connection, now_ms: int) -> int:
+    """
+    Merge minute buckets older than ROLLUP_MINUTE_RETENTION_DAYS into
+    hour-aligned buckets of the same table (writer job).
+    
+    Returns the number of minute buckets folded away.
+    """
+    if ROLLUP_MINUTE_RETENTION_DAYS < 0:
+        return 0
+    
+    cutoff = now_ms - ROLLUP_MINUTE_RETENTION_DAYS * DAY_MS
+    cutoff -= cutoff % HOUR_MS
+    
+    conn.execute(f"""
+        INSERT INTO minute_rollup (bucket_ms, hook_event_type, agent, event_count, input_tokens, output_tokens, task_calls)
+        SELECT bucket_ms - bucket_ms % {HOUR_MS}, hook_event_type, agent,
+               SUM(event_count), SUM(input_tokens), SUM(output_tokens), SUM(task_calls)
+        FROM minute_rollup
+        WHERE bucket_ms < ? AND bucket_ms % {HOUR_MS} != 0
+        GROUP BY 1, 2, 3
+        ON CONFLICT(bucket_ms, hook_event_type, agent) DO UPDATE SET
+            event_count = event_count + excluded.event_count,
+            input_tokens = input_tokens + excluded.input_tokens,
+            output_tokens = output_tokens + excluded.output_tokens,
+            task_calls = task_calls + excluded.task_calls
+    """, (cutoff,))
+    cursor = conn.execute(
+        f"DELETE FROM minute_rollup WHERE bucket_ms < ? AND bucket_ms % {HOUR_MS} != 0",
+        (cutoff,)
+    )
+    return cursor.rowcount
+
+
+def incremental_vacuum(conn: sqlite3.Connection, pages: int = VACUUM_PAGES_PER_RUN) -> int:
+    """
+    Return up to `pages` free pages to the OS (maintenance job).
+    
+    Uses executescript because the Python driver only steps a PRAGMA once,
+    which would free a single page. Returns the remaining free page count.
+    """
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+    return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+async def run_retention(now_ms: Optional[int] = None) -> Dict[str, int]:
+    """
+    Run one retention pass through the writer task.
+    
+    Expiry runs in chunks, each its own writer job, so ingestion interleaves
+    with a large backlog instead of waiting behind it. Each chunk is
+    archived before it is deleted; if the archive write fails the pass
+    stops (raising) with the chunk still in the database.
+    """
+    if now_ms is None:
+        _, now_ms = now_stamps()
+    archive_dir = store.db_path.parent / "archive"
+    
+    expired = 0
+    while True:
+        rows = await store.read(select_expired_events, now_ms)
+        if rows:
+            await asyncio.to_thread(archive_events, archive_dir, rows)
+            event_ids = [row[0] for row in rows]
+            expired += await store.write(lambda conn: delete_events(conn, event_ids))
+        if len(rows) < RETENTION_CHUNK_SIZE:
+            break
+    
+    downsampled = await store.write(lambda conn: downsample_rollups(conn, now_ms))
+    free_pages = await store.maintain(incremental_vacuum)
+    
+    return {"expired": expired, "downsampled_buckets": downsampled, "free_pages": free_pages}
+
+
+async def retention_loop():
+    """Background task: run retention every RETENTION_INTERVAL_S"""
+    while True:
+        await asyncio.sleep(RETENTION_INTERVAL_S)
+        try:
+            result = await run_retention()
+            if result["expired"] or result["downsampled_buckets"]:
+                print(
+                    f"🧹 Retention: archived {result['expired']} events, "
+                    f"downsampled {result['downsampled_buckets']} rollup buckets"
+                )
+        except Exception as e:
+            print(f"Retention error: {e}")
+
+
+def event_to_broadcast(event: ObservabilityEvent, event_id: int, timestamp: str, ts_ms: int) -> Dict[str, Any]:
+    """Build the WebSocket representation of a stored event"""
+    return {
+        "id": event_id,
+        "timestamp": timestamp,
+        "ts_ms": ts_ms,
+        "source_app": event.source_app,
+        "session_id": event.session_id,
+        "hook_event_type": event.hook_event_type,
+        "payload": event.payload,
+        "chat": event.chat,
+        "summary": event.summary,
+        "session_name": event.session_name,
+        "session_context": event.session_context
+    }
+
+
+def broadcast(message: str):
+    """Queue a pre-serialized frame for every WebSocket client (never blocks)"""
+    for channel in list(websocket_clients.values()):
+        channel.enqueue(message)
+
+
 @app.post("/events")
 async def receive_event(event: ObservabilityEvent):
     """
@@ -107,56 +1034,63 @@ async def receive_event(event: ObservabilityEvent):
     Broadcasts to WebSocket clients in real-time.
     """
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.execute("""
-            INSERT INTO events (timestamp, source_app, session_id, hook_event_type, payload, chat, summary, session_name, session_context)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            datetime.now().isoformat(),
-            event.source_app,
-            event.session_id,
-            event.hook_event_type,
-            json.dumps(event.payload),
-            json.dumps(event.chat) if event.chat else None,
-            event.summary,
-            event.session_name,
-            json.dumps(event.session_context) if event.session_context else None
-        ))
-        event_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
-        # Prepare event for broadcast
-        broadcast_event = {
-            "id": event_id,
-            "timestamp": datetime.now().isoformat(),
-            "source_app": event.source_app,
-            "session_id": event.session_id,
-            "hook_event_type": event.hook_event_type,
-            "payload": event.payload,
-            "chat": event.chat,
-            "summary": event.summary,
-            "session_name": event.session_name,
-            "session_context": event.session_context
-        }
+        timestamp, ts_ms = now_stamps()
+        
+        row = event_to_row(event, timestamp, ts_ms)
+        rollups = build_rollups([event], timestamp, ts_ms)
+        search_rows = [event_to_search_row(event)]
+        event_id = (await store.write(lambda conn: insert_rows(conn, [row], rollups, search_rows)))[0]
+        metrics.record_ingest("single", [event])
         
         # Broadcast to all WebSocket clients
-        if websocket_clients:
-            message = json.dumps({"type": "event", "data": broadcast_event})
-            disconnected = set()
-            
-            for client in websocket_clients:
-                try:
-                    await client.send_text(message)
-                except:
-                    disconnected.add(client)
-            
-            # Remove disconnected clients
-            websocket_clients.difference_update(disconnected)
+        broadcast_event = event_to_broadcast(event, event_id, timestamp, ts_ms)
+        broadcast(json.dumps({"type": "event", "data": broadcast_event}))
         
         return {"status": "ok", "event_type": event.hook_event_type, "id": event_id}
         
     except Exception as e:
+        metrics.ingest_errors += 1
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/events/batch")
+async def receive_events_batch(events: List[ObservabilityEvent]):
+    """
+    Receive and store an array of hook events.
+    
+    All events are inserted in a single transaction and broadcast to
+    WebSocket clients as one "batch" frame, so a burst costs one commit
+    and one send per client instead of one per event.
+    """
+    if len(events) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(events)} > {MAX_BATCH_SIZE} events"
+        )
+    
+    if not events:
+        return {"status": "ok", "count": 0, "ids": []}
+    
+    try:
+        timestamp, ts_ms = now_stamps()
+        
+        rows = [event_to_row(event, timestamp, ts_ms) for event in events]
+        rollups = build_rollups(events, timestamp, ts_ms)
+        search_rows = [event_to_search_row(event) for event in events]
+        event_ids = await store.write(lambda conn: insert_rows(conn, rows, rollups, search_rows))
+        metrics.record_ingest("batch", events)
+        
+        # Broadcast the whole batch as one frame
+        broadcast_events = [
+            event_to_broadcast(event, event_id, timestamp, ts_ms)
+            for event, event_id in zip(events, event_ids)
+        ]
+        broadcast(json.dumps({"type": "batch", "data": broadcast_events}))
+        
+        return {"status": "ok", "count": len(events), "ids": event_ids}
+        
+    except Exception as e:
+        metrics.ingest_errors += 1
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -164,22 +1098,45 @@ async def receive_event(event: ObservabilityEvent):
 async def get_recent_events(
     limit: int = 100,
     session_id: Optional[str] = None,
-    event_type: Optional[str] = None
+    event_type: Optional[str] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+    since_id: Optional[int] = None,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None
 ):
     """
-    Query recent events with optional filtering.
+    Query recent events with optional filtering and keyset pagination.
+    
+    Pages are addressed by event id (monotonic with ingestion), never by
+    OFFSET, so each page is an index range scan regardless of depth.
     
     Args:
-        limit: Maximum events to return (default 100)
+        limit: Maximum events to return (default 100, clamped to 1..MAX_PAGE_SIZE)
         session_id: Filter by session ID
         event_type: Filter by hook event type
+        before_id: Return events older than this id (newest first)
+        after_id: Return the events immediately newer than this id (newest first)
+        since_id: Incremental mode - events newer than this id, oldest first;
+                  pass back next_since_id to fetch only new rows next time
+        start_ms: Only events at or after this epoch-ms time
+        end_ms: Only events before this epoch-ms time
+    
+    Returns:
+        events, count, next_before_id (cursor for the next older page, or
+        null when exhausted) and next_since_id (highest id returned).
     """
+    if sum(cursor is not None for cursor in (before_id, after_id, since_id)) > 1:
+        raise HTTPException(
+            status_code=400,
+            detail="Use at most one of before_id, after_id, since_id"
+        )
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
     try:
-        conn = sqlite3.connect(DB_PATH)
-        
         # Build query with filters
-        query = "SELECT id, timestamp, source_app, session_id, hook_event_type, payload, chat, summary, session_name, session_context FROM events WHERE 1=1"
-        params = []
+        query = f"SELECT {EVENT_COLUMNS} FROM events WHERE 1=1"
+        params: List[Any] = []
         
         if session_id:
             query += " AND session_id = ?"
@@ -189,30 +1146,209 @@ async def get_recent_events(
             query += " AND hook_event_type = ?"
             params.append(event_type)
         
-        query += " ORDER BY timestamp DESC LIMIT ?"
+        if start_ms is not None:
+            query += " AND ts_ms >= ?"
+            params.append(start_ms)
+        
+        if end_ms is not None:
+            query += " AND ts_ms < ?"
+            params.append(end_ms)
+        
+        ascending = after_id is not None or since_id is not None
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        elif ascending:
+            query += " AND id > ?"
+            params.append(after_id if after_id is not None else since_id)
+        
+        query += f" ORDER BY id {'ASC' if ascending else 'DESC'} LIMIT ?"
         params.append(limit)
         
-        cursor = conn.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        rows = await store.read(lambda conn: conn.execute(query, params).fetchall())
         
-        # Convert to dict format
-        events = []
-        for row in rows:
-            events.append({
-                "id": row[0],
-                "timestamp": row[1],
-                "source_app": row[2],
-                "session_id": row[3],
-                "hook_event_type": row[4],
-                "payload": json.loads(row[5]) if row[5] else {},
-                "chat": json.loads(row[6]) if row[6] and row[6] != 'null' else None,
-                "summary": row[7] if row[7] and row[7] != 'null' else None,
-                "session_name": row[8] if row[8] and row[8] != 'null' else None,
-                "session_context": json.loads(row[9]) if row[9] and row[9] != 'null' else None
-            })
-        
-        return {"events": events, "count": len(events)}
+        # after_id pages are fetched oldest-first but returned newest-first
+        if after_id is not None:
+            rows.reverse()
+        
+        ids = [row[0] for row in rows]
+        next_before_id = min(ids) if ids and len(rows) == limit and since_id is None else None
+        next_since_id = max(ids) if ids else (since_id if since_id is not None else after_id)
+        
+        body = (
+            f'{{"events": {rows_to_json_array(rows)}, '
+            f'"count": {len(rows)}, '
+            f'"next_before_id": {json.dumps(next_before_id)}, '
+            f'"next_since_id": {json.dumps(next_since_id)}}}'
+        )
+        return Response(content=body, media_type="application/json")
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def quote_search_terms(q: str) -> str:
+    """Turn free text into an FTS5 query of quoted terms (implicit AND)"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in q.split())
+
+
+def query_search(
+    conn: sqlite3.Connection,
+    match: str,
+    order: str,
+    filters: List[tuple],
+    cursor: tuple,
+    limit: int
+) -> List[tuple]:
+    """Run an events_fts MATCH joined back to events (reader job)"""
+    columns = ", ".join(f"e.{column.strip()}" for column in EVENT_COLUMNS.split(","))
+    query = f"""
+        SELECT {columns}, f.rank
+        FROM events_fts f JOIN events e ON e.id = f.rowid
+        WHERE events_fts MATCH ?
+    """
+    params: List[Any] = [match]
+    
+    for column, value in filters:
+        query += f" AND e.{column} = ?"
+        params.append(value)
+    
+    if order == "rank":
+        after_rank, after_id = cursor
+        if after_rank is not None and after_id is not None:
+            query += " AND (f.rank > ? OR (f.rank = ? AND f.rowid > ?))"
+            params.extend([after_rank, after_rank, after_id])
+        query += " ORDER BY f.rank, f.rowid LIMIT ?"
+    else:
+        (before_id,) = cursor
+        if before_id is not None:
+            query += " AND f.rowid < ?"
+            params.append(before_id)
+        query += " ORDER BY f.rowid DESC LIMIT ?"
+    params.append(limit)
+    
+    return conn.execute(query, params).fetchall()
+
+
+def query_sessions(conn: sqlite3.Connection, limit: Optional[int]) -> List[Dict[str, Any]]:
+    """Read sessions from session_rollup, most recently active first"""
+    rows = conn.execute("""
+        SELECT session_id, session_name, source_app, event_count,
+               first_event, last_event, first_ts_ms, last_ts_ms
+        FROM session_rollup
+        ORDER BY last_ts_ms DESC
+        LIMIT ?
+    """, (limit if limit is not None else -1,)).fetchall()
+    
+    return [
+        {
+            "session_id": row[0],
+            "session_name": row[1],
+            "source_app": row[2],
+            "event_count": row[3],
+            "first_event": row[4],
+            "last_event": row[5],
+            "first_ts_ms": row[6],
+            "last_ts_ms": row[7]
+        }
+        for row in rows
+    ]
+
+
+def query_minute_rollup(
+    conn: sqlite3.Connection,
+    group_by: List[str],
+    since_ms: Optional[int],
+    until_ms: Optional[int],
+    hook_event_type: Optional[str] = None,
+    agent: Optional[str] = None
+) -> List[tuple]:
+    """Sum minute_rollup counters over a time range, grouped by the given columns"""
+    select = ", ".join(group_by + [
+        "SUM(event_count)", "SUM(input_tokens)", "SUM(output_tokens)", "SUM(task_calls)"
+    ])
+    query = f"SELECT {select} FROM minute_rollup WHERE 1=1"
+    params: List[Any] = []
+    
+    if since_ms is not None:
+        query += " AND bucket_ms >= ?"
+        params.append(since_ms - since_ms % MINUTE_MS)
+    if until_ms is not None:
+        query += " AND bucket_ms < ?"
+        params.append(until_ms)
+    if hook_event_type:
+        query += " AND hook_event_type = ?"
+        params.append(hook_event_type)
+    if agent is not None:
+        query += " AND agent = ?"
+        params.append(agent)
+    
+    if group_by:
+        query += f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}"
+    
+    return conn.execute(query, params).fetchall()
+
+
+@app.get("/events/search")
+async def search_events(
+    q: str,
+    limit: int = 50,
+    order: str = "rank",
+    session_id: Optional[str] = None,
+    event_type: Optional[str] = None,
+    after_rank: Optional[float] = None,
+    after_id: Optional[int] = None,
+    before_id: Optional[int] = None
+):
+    """
+    Full-text search over hook type, summary, session name and selected
+    payload fields.
+    
+    Args:
+        q: FTS5 query (e.g. 'ocr failed', '"concept match"', 'quadr*');
+           plain text is accepted if it is not valid FTS5 syntax
+        limit: Maximum events to return (default 50, clamped to 1..MAX_PAGE_SIZE)
+        order: "rank" (best match first, bm25) or "recent" (newest first)
+        session_id: Filter by session ID
+        event_type: Filter by hook event type
+        after_rank, after_id: Keyset cursor for the next "rank" page
+                              (next_after_rank/next_after_id)
+        before_id: Keyset cursor for the next "recent" page (next_before_id)
+    """
+    if order not in ("rank", "recent"):
+        raise HTTPException(status_code=400, detail="order must be 'rank' or 'recent'")
+    if not q.strip():
+        raise HTTPException(status_code=400, detail="q must not be empty")
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    filters = []
+    if session_id:
+        filters.append(("session_id", session_id))
+    if event_type:
+        filters.append(("hook_event_type", event_type))
+    cursor = (after_rank, after_id) if order == "rank" else (before_id,)
+    
+    try:
+        try:
+            rows = await store.read(query_search, q, order, filters, cursor, limit)
+        except sqlite3.OperationalError as e:
+            if "fts5" not in str(e) and "no such column" not in str(e):
+                raise
+            # Not valid FTS5 syntax: search the words literally
+            rows = await store.read(query_search, quote_search_terms(q), order, filters, cursor, limit)
+        
+        page_full = len(rows) == limit
+        last = rows[-1] if rows and page_full else None
+        
+        body = (
+            f'{{"events": {rows_to_json_array([row[:-1] for row in rows])}, '
+            f'"count": {len(rows)}, '
+            f'"order": {json.dumps(order)}, '
+            f'"next_after_rank": {json.dumps(last[-1] if last and order == "rank" else None)}, '
+            f'"next_after_id": {json.dumps(last[0] if last and order == "rank" else None)}, '
+            f'"next_before_id": {json.dumps(last[0] if last and order == "recent" else None)}}}'
+        )
+        return Response(content=body, media_type="application/json")
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -222,29 +1358,133 @@ async def get_recent_events(
 async def get_sessions():
     """Get list of all session IDs"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.execute("""
-            SELECT DISTINCT session_id, 
-                   COUNT(*) as event_count,
-                   MIN(timestamp) as first_event,
-                   MAX(timestamp) as last_event
-            FROM events
-            GROUP BY session_id
-            ORDER BY last_event DESC
-        """)
-        rows = cursor.fetchall()
-        conn.close()
+        sessions = await store.read(query_sessions, None)
+        return {"sessions": sessions}
         
-        sessions = []
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/sessions")
+async def get_session_stats(limit: int = 100):
+    """
+    Per-session event counts and first/last activity, most recent first.
+    
+    Args:
+        limit: Maximum sessions to return (default 100)
+    """
+    try:
+        sessions = await store.read(query_sessions, limit)
+        return {"sessions": sessions, "count": len(sessions)}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/hooks")
+async def get_hook_stats(since_ms: Optional[int] = None, until_ms: Optional[int] = None):
+    """
+    Event counts by hook type.
+    
+    Args:
+        since_ms: Only count minutes at or after this epoch-ms time
+        until_ms: Only count minutes before this epoch-ms time
+    """
+    try:
+        rows = await store.read(query_minute_rollup, ["hook_event_type"], since_ms, until_ms)
+        return {"hook_calls": {row[0]: row[1] for row in rows}}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/agents")
+async def get_agent_stats(since_ms: Optional[int] = None, until_ms: Optional[int] = None):
+    """
+    Event counts by agent (Task subagent_type or payload agent_name), and
+    Task tool calls per subagent.
+    
+    Args:
+        since_ms: Only count minutes at or after this epoch-ms time
+        until_ms: Only count minutes before this epoch-ms time
+    """
+    try:
+        rows = await store.read(query_minute_rollup, ["agent", "hook_event_type"], since_ms, until_ms)
+        
+        agent_calls: Dict[str, int] = {}
+        task_calls: Dict[str, int] = {}
+        for agent, _, count, _, _, tasks in rows:
+            if not agent:
+                continue
+            agent_calls[agent] = agent_calls.get(agent, 0) + count
+            if tasks:
+                task_calls[agent] = task_calls.get(agent, 0) + tasks
+        
+        return {"agent_calls": agent_calls, "task_calls": task_calls}
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/tokens")
+async def get_token_stats(since_ms: Optional[int] = None, until_ms: Optional[int] = None):
+    """
+    Token usage totals reported in event payloads.
+    
+    Args:
+        since_ms: Only count minutes at or after this epoch-ms time
+        until_ms: Only count minutes before this epoch-ms time
+    """
+    try:
+        rows = await store.read(query_minute_rollup, [], since_ms, until_ms)
+        _, input_tokens, output_tokens, _ = rows[0]
+        input_tokens = input_tokens or 0
+        output_tokens = output_tokens or 0
+        return {
+            "total_tokens": input_tokens + output_tokens,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens
+        }
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.get("/stats/timeline")
+async def get_timeline_stats(
+    minutes: int = 60,
+    by: Optional[str] = None,
+    hook_event_type: Optional[str] = None,
+    agent: Optional[str] = None
+):
+    """
+    Per-minute event counts for the last N minutes.
+    
+    Args:
+        minutes: Window size in minutes (default 60)
+        by: Optional breakdown column: "hook_event_type" or "agent"
+        hook_event_type: Only count this hook type
+        agent: Only count this agent
+    """
+    if by not in (None, "hook_event_type", "agent"):
+        raise HTTPException(status_code=400, detail="by must be 'hook_event_type' or 'agent'")
+    
+    try:
+        _, now_ms = now_stamps()
+        since_ms = now_ms - minutes * MINUTE_MS
+        group_by = ["bucket_ms"] + ([by] if by else [])
+        rows = await store.read(
+            query_minute_rollup, group_by, since_ms, None, hook_event_type, agent
+        )
+        
+        buckets = []
         for row in rows:
-            sessions.append({
-                "session_id": row[0],
-                "event_count": row[1],
-                "first_event": row[2],
-                "last_event": row[3]
-            })
+            bucket = {"bucket_ms": row[0], "count": row[-4]}
+            if by:
+                bucket[by] = row[1]
+            buckets.append(bucket)
         
-        return {"sessions": sessions}
+        return {"buckets": buckets, "minutes": minutes}
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -257,54 +1497,127 @@ async def websocket_endpoint(websocket: WebSocket):
     Compatible with indydevdan dashboard.
     """
     await websocket.accept()
-    websocket_clients.add(websocket)
+    channel = ClientChannel(websocket)
+    websocket_clients[websocket] = channel
     
     print(f"✅ WebSocket client connected (total: {len(websocket_clients)})")
     
     try:
         # Send recent 50 events on connection
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.execute("""
-            SELECT id, timestamp, source_app, session_id, hook_event_type, payload, chat, summary, session_name, session_context
+        rows = await store.read(lambda conn: conn.execute(f"""
+            SELECT {EVENT_COLUMNS}
             FROM events 
-            ORDER BY timestamp DESC 
+            ORDER BY id DESC 
             LIMIT 50
-        """)
-        rows = cursor.fetchall()
-        conn.close()
+        """).fetchall())
         
-        # Format events
-        initial_events = []
-        for row in rows:
-            initial_events.append({
-                "id": row[0],
-                "timestamp": row[1],
-                "source_app": row[2],
-                "session_id": row[3],
-                "hook_event_type": row[4],
-                "payload": json.loads(row[5]) if row[5] else {},
-                "chat": json.loads(row[6]) if row[6] and row[6] != 'null' else None,
-                "summary": row[7] if row[7] and row[7] != 'null' else None,
-                "session_name": row[8] if row[8] and row[8] != 'null' else None,
-                "session_context": json.loads(row[9]) if row[9] and row[9] != 'null' else None
-            })
-        
-        # Send initial batch (reversed to chronological order)
-        initial_events.reverse()
-        await websocket.send_json({"type": "initial", "data": initial_events})
+        # Send initial batch (reversed to chronological order) before the
+        # sender task starts, so it is always the first frame
+        rows.reverse()
+        await websocket.send_text(f'{{"type": "initial", "data": {rows_to_json_array(rows)}}}')
+        channel.start()
         
         # Keep connection alive
         while True:
             data = await websocket.receive_text()
             # Echo back (heartbeat)
-            await websocket.send_text(json.dumps({"type": "pong"}))
+            channel.enqueue(json.dumps({"type": "pong"}))
             
     except WebSocketDisconnect:
-        websocket_clients.remove(websocket)
-        print(f"WebSocket client disconnected (remaining: {len(websocket_clients)})")
+        pass
     except Exception as e:
         print(f"WebSocket error: {e}")
-        websocket_clients.discard(websocket)
+    finally:
+        websocket_clients.pop(websocket, None)
+        await channel.close()
+        print(f"WebSocket client disconnected (remaining: {len(websocket_clients)})")
+
+
+def _label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _sample_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metrics(openmetrics: bool = False) -> str:
+    """
+    Format in-memory metrics in the Prometheus text format.
+    
+    Args:
+        openmetrics: Emit OpenMetrics 1.0 (counter families named without
+            _total, terminated by "# EOF") instead of text format 0.0.4
+    
+    Returns:
+        Exposition text
+    """
+    lines: List[str] = []
+    
+    def family(name: str, kind: str, help_text: str, samples: List[tuple]):
+        # samples: (suffix, labels dict, value)
+        type_name = name + "_total" if kind == "counter" and not openmetrics else name
+        lines.append(f"# HELP {type_name} {help_text}")
+        lines.append(f"# TYPE {type_name} {kind}")
+        for suffix, labels, value in samples:
+            label_text = ",".join(f'{k}="{_label_value(str(v))}"' for k, v in labels.items())
+            label_text = f"{{{label_text}}}" if label_text else ""
+            lines.append(f"{name}{suffix}{label_text} {_sample_value(value)}")
+    
+    def histogram(name: str, help_text: str, hist: Histogram):
+        samples = [("_bucket", {"le": _sample_value(le)}, n) for le, n in hist.cumulative()]
+        samples += [("_sum", {}, hist.sum), ("_count", {}, hist.count)]
+        family(name, "histogram", help_text, samples)
+    
+    family("observability_events_ingested", "counter", "Events stored, by hook event type", [
+        ("_total", {"hook_event_type": event_type}, count)
+        for event_type, count in sorted(metrics.events_by_type.items())
+    ])
+    family("observability_ingest_requests", "counter", "Successful ingest requests, by endpoint", [
+        ("_total", {"endpoint": endpoint}, count)
+        for endpoint, count in metrics.ingest_requests.items()
+    ])
+    family("observability_ingest_errors", "counter", "Ingest requests that failed to store",
+           [("_total", {}, metrics.ingest_errors)])
+    family("observability_ingest_rate_events_per_second", "gauge",
+           f"Events stored per second over the last {INGEST_RATE_WINDOW_S}s",
+           [("", {}, metrics.ingest_rate())])
+    
+    family("observability_write_queue_depth", "gauge", "Write jobs waiting for the writer task",
+           [("", {}, store.write_queue_depth if store else 0)])
+    family("observability_sqlite_write_jobs", "counter", "Write jobs applied by the writer task",
+           [("_total", {}, metrics.write_jobs)])
+    histogram("observability_sqlite_write_seconds",
+              "Time to apply one group-committed batch of write jobs", metrics.write_latency)
+    
+    channels = list(websocket_clients.values())
+    family("observability_websocket_clients", "gauge", "Connected /stream clients",
+           [("", {}, len(channels))])
+    family("observability_websocket_queued_frames", "gauge", "Frames waiting in client send queues",
+           [("", {}, sum(channel.queue.qsize() for channel in channels))])
+    family("observability_websocket_frames_sent", "counter", "Frames written to /stream clients",
+           [("_total", {}, metrics.ws_frames_sent)])
+    family("observability_websocket_frames_dropped", "counter", "Frames dropped for slow /stream clients",
+           [("_total", {}, metrics.ws_frames_dropped)])
+    histogram("observability_websocket_send_lag_seconds",
+              "Time from enqueue to send completion per frame", metrics.ws_send_lag)
+    
+    if openmetrics:
+        lines.append("# EOF")
+    return "\n".join(lines) + "\n"
+
+
+@app.get("/metrics")
+async def get_metrics(request: Request):
+    """Prometheus/OpenMetrics scrape endpoint (in-memory counters only)"""
+    openmetrics = "application/openmetrics-text" in request.headers.get("accept", "")
+    if openmetrics:
+        media_type = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+    else:
+        media_type = "text/plain; version=0.0.4; charset=utf-8"
+    return Response(content=render_metrics(openmetrics), media_type=media_type)
 
 
 @app.get("/health")
@@ -313,7 +1626,8 @@ async def health_check():
     return {
         "status": "healthy", 
         "service": "observability-server",
-        "websocket_clients": len(websocket_clients)
+        "websocket_clients": len(websocket_clients),
+        "write_queue_depth": store.write_queue_depth if store else 0
     }
 
 
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Context Store Benchmark
+
+Times ContextManager operations against the local SQLite memory-keeper
+stand-in (save with write-back batching, get, search, cleanup deletes).
+
+Usage:
+    python3 scripts/context_store_benchmark_script.py [--items 5000] [--db /tmp/ctx.db]
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import argparse
+import logging
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.context_service import ContextManager
+from infrastructure.memory_store_service import SQLiteMemoryKeeper
+
+CATEGORIES = ["tasks", "progress", "agent-performance", "errors", "debug"]
+
+
+def timed(label: str, count: int, func):
+    """Run func(i) count times; print mean latency and throughput"""
+    started = time.perf_counter()
+    for i in range(count):
+        func(i)
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {elapsed / count * 1e6:>9.1f}µs/op {count / elapsed:>11,.0f} ops/s")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark ContextManager on the SQLite store")
+    parser.add_argument("--items", type=int, default=5000, help="Items saved")
+    parser.add_argument("--queries", type=int, default=1000, help="get/search calls")
+    parser.add_argument("--db", default=None, help="SQLite file (default: temporary file)")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # ContextManager logs every call at INFO
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SQLiteMemoryKeeper(args.db or str(Path(tmp) / "context.db"))
+        context = ContextManager(store, batch_size=50)
+
+        timed(
+            "save (write-back, batched)", args.items,
+            lambda i: context.save(
+                f"item-{i}", {"step": i, "note": f"scaffolding step {i} for concept {i % 37}"},
+                CATEGORIES[i % len(CATEGORIES)], tags=[f"concept-{i % 37}"]
+            ),
+        )
+        timed("flush", 1, lambda i: context.flush())
+        timed("get (category, limit 10)", args.queries, lambda i: context.get(category=CATEGORIES[i % 5]))
+        timed("get (key)", args.queries, lambda i: context.get(key=f"item-{i}", limit=1))
+        timed("search (FTS)", args.queries, lambda i: context.search(f"concept {i % 37}", limit=10))
+        print(f"\nStored after retention cleanup: {store.count():,} of {args.items:,} saved")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
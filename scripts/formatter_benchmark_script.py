@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+JSON Formatter Microbenchmark
+
+Compares JSONFormatter and FastJSONFormatter on the same log records
+(plain message, agent extras, and with a trace_id set).
+
+Usage:
+    python3 scripts/formatter_benchmark_script.py [--records 200000]
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.logging_service import FastJSONFormatter, JSONFormatter, orjson, trace_id_var
+
+
+def make_records(count: int):
+    """Records spread over a few call sites, half with agent extras"""
+    records = []
+    for i in range(count):
+        record = logging.LogRecord(
+            name="math_agents", level=logging.DEBUG, pathname=__file__, lineno=40 + i % 8,
+            msg="Tool call: %s", args=(f"tool-{i % 5}",), exc_info=None, func="run_wave"
+        )
+        if i % 2:
+            record.agent_name = "problem_solver"
+            record.event_type = "tool_call"
+            record.duration_ms = 12.5
+            record.metadata = {"tool": "Read", "success": True}
+        records.append(record)
+    return records
+
+
+def bench(formatter: logging.Formatter, records, repeat: int) -> float:
+    """Best-of-N records per second"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for record in records:
+            formatter.format(record)
+        best = min(best, time.perf_counter() - started)
+    return len(records) / best
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark JSON log formatters")
+    parser.add_argument("--records", type=int, default=200_000, help="Records per run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per formatter (best is kept)")
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    if orjson is not None:
+        print("orjson: available (equivalent JSON; nested values written compactly)")
+    else:
+        print("orjson: not installed (json fallback; byte-identical to JSONFormatter)")
+
+    for label, trace_id in (("no trace_id", None), ("with trace_id", "a1b2c3d4")):
+        token = trace_id_var.set(trace_id)
+        try:
+            baseline = bench(JSONFormatter(), records, args.repeat)
+            fast = bench(FastJSONFormatter(), records, args.repeat)
+        finally:
+            trace_id_var.reset(token)
+        print(
+            f"{label:<14} JSONFormatter {baseline:>10,.0f} rec/s | "
+            f"FastJSONFormatter {fast:>10,.0f} rec/s | {fast / baseline:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
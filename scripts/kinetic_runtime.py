@@ -11,6 +11,7 @@ DATE: 2025-10-16
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 import asyncio
+import time
 
 
 class KineticRuntime:
@@ -22,6 +23,9 @@ class KineticRuntime:
     - EventReporter (observability)
     - RealtimeGateway (audio/text streaming)
     - ComputerUseAdapter (UI automation)
+    
+    Call shutdown() when done (or use `async with KineticRuntime(...)`) so
+    queued observability events are delivered or spooled, not lost.
     """
     
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -36,7 +40,8 @@ class KineticRuntime:
         # Initialize based on config
         if self.config.get('observability_enabled'):
             from integrations.observability.event_reporter import EventReporter
-            self._obs = EventReporter("kinetic-runtime")
+            # Batched, non-blocking delivery; spools to disk if the server is down
+            self._obs = EventReporter("kinetic-runtime", async_mode=True)
         
         if self.config.get('realtime_enabled'):
             from integrations.realtime.gateway_service import RealtimeGateway
@@ -124,6 +129,25 @@ class KineticRuntime:
         if self._realtime:
             await self._realtime.stop()
     
+    async def stop_observability(self):
+        """Flush pending observability events and close the reporter"""
+        if self._obs:
+            await self._obs.aclose()
+    
+    async def shutdown(self):
+        """Stop the realtime gateway and flush observability events"""
+        try:
+            await self.stop_realtime_gateway()
+        finally:
+            await self.stop_observability()
+    
+    async def __aenter__(self) -> "KineticRuntime":
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.shutdown()
+        return False
+    
     async def execute_ui_goal(self, goal: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Execute UI automation goal via computer-use"""
         if not self._computer_use:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Log Archive Tool
+
+Compacts StructuredLogger JSONL logs into columnar daily archives and runs
+per-agent aggregations over them.
+
+Usage:
+    python3 scripts/log_archive_script.py compact [--delete]
+    python3 scripts/log_archive_script.py latency --since 2025-10-01
+    python3 scripts/log_archive_script.py errors --since 2025-10-01 --until 2025-10-14
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.log_archive_service import agent_errors, agent_latency, compact_logs, load_tables
+
+DEFAULT_LOG_DIR = "/tmp/math-agent-logs"
+
+
+def print_latency(rows):
+    print(f"{'Agent':<32} {'Count':>8} {'Mean':>10} {'p50':>10} {'p95':>10} {'p99':>10} {'Max':>10}")
+    print("-" * 96)
+    for row in rows:
+        print(
+            f"{str(row['agent_name']):<32} {row['count']:>8} "
+            f"{row['mean_ms']:>9.0f}ms {row['p50_ms']:>8.0f}ms {row['p95_ms']:>8.0f}ms "
+            f"{row['p99_ms']:>8.0f}ms {row['max_ms']:>8.0f}ms"
+        )
+
+
+def print_errors(rows):
+    print(f"{'Agent':<32} {'Events':>8} {'Errors':>8} {'Rate':>7}  Top error types")
+    print("-" * 96)
+    for row in rows:
+        top = sorted(row["by_type"].items(), key=lambda kv: kv[1], reverse=True)[:3]
+        types = ", ".join(f"{name}={count}" for name, count in top)
+        print(
+            f"{str(row['agent_name']):<32} {row['events']:>8} {row['errors']:>8} "
+            f"{row['error_rate']:>6.1%}  {types}"
+        )
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Columnar archive and queries for agent logs")
+    parser.add_argument("--log-dir", default=DEFAULT_LOG_DIR, help="StructuredLogger log directory")
+    parser.add_argument("--archive-dir", default=None, help="Archive directory (default: LOG_DIR/archive)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    compact = subparsers.add_parser("compact", help="Archive closed daily JSONL files")
+    compact.add_argument("--delete", action="store_true", help="Remove JSONL files once archived")
+
+    for name, help_text in (("latency", "Per-agent duration percentiles"), ("errors", "Per-agent error counts")):
+        query = subparsers.add_parser(name, help=help_text)
+        query.add_argument("--since", help="First day (YYYY-MM-DD)")
+        query.add_argument("--until", help="Last day (YYYY-MM-DD)")
+        query.add_argument("--json", action="store_true", help="Print rows as JSON")
+        if name == "latency":
+            query.add_argument("--event-type", default="agent_complete", help="Event type to aggregate")
+
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        written = compact_logs(args.log_dir, args.archive_dir, delete=args.delete)
+        for path in written:
+            print(f"✅ {path}")
+        print(f"Archived {len(written)} day(s)")
+        return
+
+    started = time.perf_counter()
+    if args.command == "latency":
+        tables = load_tables(
+            args.log_dir, args.since, args.until,
+            columns=["agent_name", "event_type", "duration_ms"], archive_dir=args.archive_dir
+        )
+        rows = agent_latency(tables, args.event_type)
+        printer = print_latency
+    else:
+        tables = load_tables(
+            args.log_dir, args.since, args.until,
+            columns=["agent_name", "level", "error_type"], archive_dir=args.archive_dir
+        )
+        rows = agent_errors(tables)
+        printer = print_errors
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps(rows, indent=2, ensure_ascii=False))
+    else:
+        printer(rows)
+        print(f"\n{len(tables)} day(s) scanned in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
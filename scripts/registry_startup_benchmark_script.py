@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Agent Registry Startup Benchmark
+
+Measures subagent startup cost in fresh interpreters:
+- eager:       import all 12 subagent definitions (old main.py)
+- cold scan:   AgentRegistry discovery without a manifest (imports everything)
+- warm:        discovery from the cached manifest (no agent/SDK imports)
+- warm + use:  warm discovery, then first access to one agent
+
+Usage:
+    python3 scripts/registry_startup_benchmark_script.py [--repeat 5]
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+SETUP = """
+import contextlib, io, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+"""
+
+SCENARIOS = {
+    "eager": """
+import subagents
+for name in subagents.__all__:
+    getattr(subagents, name)
+""",
+    "cold scan": """
+from pathlib import Path
+from infrastructure.registry_service import AgentRegistry
+with contextlib.redirect_stdout(io.StringIO()):
+    AgentRegistry(Path({root!r}) / "subagents", manifest_path={manifest!r}).discover_agents(use_manifest=False)
+""",
+    "warm": """
+from pathlib import Path
+from infrastructure.registry_service import AgentRegistry
+with contextlib.redirect_stdout(io.StringIO()):
+    AgentRegistry(Path({root!r}) / "subagents", manifest_path={manifest!r}).discover_agents()
+""",
+    "warm + use": """
+from pathlib import Path
+from infrastructure.registry_service import AgentRegistry
+with contextlib.redirect_stdout(io.StringIO()):
+    agents = AgentRegistry(Path({root!r}) / "subagents", manifest_path={manifest!r}).discover_agents()
+agents["quality-agent"]
+""",
+}
+
+REPORT = """
+print((time.perf_counter() - started) * 1000)
+"""
+
+
+def run_once(code: str) -> float:
+    """Run code in a fresh interpreter; returns its elapsed milliseconds"""
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark agent registry startup")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per scenario (median kept)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = str(Path(tmp) / "agent_manifest.json")
+        results = {}
+        for name, body in SCENARIOS.items():
+            code = (SETUP + body + REPORT).format(root=str(project_root), manifest=manifest)
+            results[name] = statistics.median(run_once(code) for _ in range(args.repeat))
+
+    baseline = results["eager"]
+    print(f"{'Scenario':<12} {'Median':>10} {'vs eager':>9}")
+    print("-" * 33)
+    for name, elapsed in results.items():
+        print(f"{name:<12} {elapsed:>8.0f}ms {baseline / elapsed:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,6 +30,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from workflows.math_scaffolding_workflow import run_math_scaffolding_workflow
+from infrastructure.tracing_service import configure_tracing
 
 
 def main():
@@ -66,6 +67,9 @@ def main():
         print(f"❌ Error: Image file not found: {image_path}")
         sys.exit(1)
     
+    # Spans go to /tmp/math-agent-logs and the observability server
+    configure_tracing(observability=True, source_app="math_scaffolding")
+    
     # Run workflow
     result = asyncio.run(run_math_scaffolding_workflow(str(image_path)))
     
@@ -43,43 +43,43 @@ def parse_session_log(session_file: Path) -> dict:
         return {}
 
 
-def monitor_token_usage():
-    """Monitor token usage from observability events"""
+def session_start_ms(session_data: dict):
+    """Session start (epoch ms) from the session log, or None"""
+    try:
+        return int(datetime.fromisoformat(session_data['timestamp']).timestamp() * 1000)
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def monitor_token_usage(since_ms=None):
+    """
+    Monitor token usage from observability rollups.
+    
+    Totals are only a context-usage signal when scoped to the session
+    (since_ms = session start); without a start time the all-time totals
+    are shown and no 1M context percentage is reported.
+    """
     try:
         import httpx
         
-        # Query recent events
+        # Token totals are pre-aggregated by the server
         response = httpx.get(
-            "http://localhost:4000/events/recent?limit=1000",
+            "http://localhost:4000/stats/tokens",
+            params={"since_ms": since_ms} if since_ms is not None else None,
             timeout=5
         )
         
         if response.status_code != 200:
             return None
         
-        events = response.json().get('events', [])
-        
-        # Extract token usage from events
-        total_tokens = 0
-        input_tokens = 0
-        output_tokens = 0
-        
-        for event in events:
-            payload = event.get('payload', {})
-            
-            # Look for token usage in tool responses
-            if 'usage' in payload:
-                usage = payload['usage']
-                input_tokens += usage.get('input_tokens', 0)
-                output_tokens += usage.get('output_tokens', 0)
-        
-        total_tokens = input_tokens + output_tokens
+        usage = response.json()
+        total_tokens = usage.get('total_tokens', 0)
         
         return {
             'total_tokens': total_tokens,
-            'input_tokens': input_tokens,
-            'output_tokens': output_tokens,
-            'context_1m_usage_pct': (total_tokens / 1_000_000) * 100 if total_tokens > 0 else 0
+            'input_tokens': usage.get('input_tokens', 0),
+            'output_tokens': usage.get('output_tokens', 0),
+            'context_1m_usage_pct': (total_tokens / 1_000_000) * 100 if since_ms is not None else None
         }
     
     except Exception as e:
@@ -87,41 +87,21 @@ def monitor_token_usage():
 
 
 def get_agent_stats():
-    """Get agent execution stats from observability"""
+    """Get agent execution stats from observability rollups"""
     try:
         import httpx
         
-        response = httpx.get(
-            "http://localhost:4000/events/recent?limit=1000",
-            timeout=5
-        )
+        with httpx.Client(base_url="http://localhost:4000", timeout=5) as client:
+            agents_response = client.get("/stats/agents")
+            hooks_response = client.get("/stats/hooks")
         
-        if response.status_code != 200:
+        if agents_response.status_code != 200 or hooks_response.status_code != 200:
             return {}
         
-        events = response.json().get('events', [])
-        
-        # Count by agent
-        agent_calls = {}
-        hook_calls = {}
-        
-        for event in events:
-            hook_type = event.get('hook_event_type', '')
-            payload = event.get('payload', {})
-            
-            # Count hook types
-            hook_calls[hook_type] = hook_calls.get(hook_type, 0) + 1
-            
-            # Extract agent from tool calls
-            if hook_type == 'PreToolUse':
-                tool_name = payload.get('tool_name', '')
-                if tool_name == 'Task':
-                    agent = payload.get('tool_input', {}).get('subagent_type', 'unknown')
-                    agent_calls[agent] = agent_calls.get(agent, 0) + 1
-        
         return {
-            'agent_calls': agent_calls,
-            'hook_calls': hook_calls
+            # Task tool calls per subagent (PreToolUse events)
+            'agent_calls': agents_response.json().get('task_calls', {}),
+            'hook_calls': hooks_response.json().get('hook_calls', {})
         }
     
     except:
@@ -137,6 +117,7 @@ def display_status():
     
     # Session info
     session_file = find_latest_session()
+    session_data = {}
     if session_file:
         session_data = parse_session_log(session_file)
         print(f"📋 Session Info:")
@@ -150,23 +131,27 @@ def display_status():
     
     # Token usage
     print("🎯 1M Context Window Status:")
-    token_usage = monitor_token_usage()
+    token_usage = monitor_token_usage(session_start_ms(session_data))
     
     if token_usage:
         total = token_usage['total_tokens']
         pct = token_usage['context_1m_usage_pct']
         
-        print(f"   Total tokens: {total:,}")
+        print(f"   Total tokens{' (this session)' if pct is not None else ' (all time)'}: {total:,}")
         print(f"   Input tokens: {token_usage['input_tokens']:,}")
         print(f"   Output tokens: {token_usage['output_tokens']:,}")
-        print(f"   1M Context usage: {pct:.2f}%")
         
-        # Visual bar
-        bar_length = 50
-        filled = int(bar_length * pct / 100)
-        bar = '█' * filled + '░' * (bar_length - filled)
-        print(f"   [{bar}] {pct:.1f}%")
-        print(f"   Remaining: {1_000_000 - total:,} tokens")
+        if pct is not None:
+            print(f"   1M Context usage: {pct:.2f}%")
+            
+            # Visual bar
+            bar_length = 50
+            filled = min(int(bar_length * pct / 100), bar_length)
+            bar = '█' * filled + '░' * (bar_length - filled)
+            print(f"   [{bar}] {pct:.1f}%")
+            print(f"   Remaining: {max(1_000_000 - total, 0):,} tokens")
+        else:
+            print("   1M Context usage: unknown (no session start time)")
     else:
         print("   ⚠️  Token usage not available (observability server offline?)")
         print("   Note: 1M context is enabled via claude-sonnet-4-5-20250929 model")
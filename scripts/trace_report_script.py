@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Trace Report Tool
+
+Per-trace breakdown of span timings from the JSONL logs, printed as an
+indented flame-graph-style tree (total, self time, share of the root).
+
+Usage:
+    python3 scripts/trace_report_script.py --list
+    python3 scripts/trace_report_script.py --trace a1b2c3d4e5f60718
+    python3 scripts/trace_report_script.py --trace a1b2c3d4e5f60718 --folded > trace.folded
+        # folded stacks for flamegraph.pl / speedscope
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DEFAULT_LOG_DIR = "/tmp/math-agent-logs"
+BAR_WIDTH = 30
+
+
+def load_spans(log_dir: str, trace_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Read span entries (optionally for one trace) from agent-*.jsonl files"""
+    spans = []
+    for path in sorted(Path(log_dir).glob("agent-*.jsonl")):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                # Cheap prefilter before parsing
+                if '"span"' not in line or (trace_id and trace_id not in line):
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if entry.get("event_type") != "span":
+                    continue
+                if trace_id and entry.get("trace_id") != trace_id:
+                    continue
+                meta = entry.get("metadata") or {}
+                spans.append({
+                    "name": entry.get("message"),
+                    "trace_id": entry.get("trace_id"),
+                    "span_id": meta.get("span_id"),
+                    "parent_id": meta.get("parent_id"),
+                    "start_ms": meta.get("start_ms", 0),
+                    "duration_ms": entry.get("duration_ms") or 0.0,
+                    "status": meta.get("status", "ok"),
+                    "attributes": meta.get("attributes") or {},
+                })
+    return spans
+
+
+def build_tree(spans: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Link spans to their children; returns roots ordered by start time"""
+    by_id = {s["span_id"]: dict(s, children=[]) for s in spans}
+    roots = []
+    for node in by_id.values():
+        parent = by_id.get(node["parent_id"])
+        (parent["children"] if parent else roots).append(node)
+    for node in by_id.values():
+        node["children"].sort(key=lambda n: n["start_ms"])
+        node["self_ms"] = max(node["duration_ms"] - sum(c["duration_ms"] for c in node["children"]), 0.0)
+    roots.sort(key=lambda n: n["start_ms"])
+    return roots
+
+
+def print_tree(roots: List[Dict[str, Any]]):
+    """Indented tree with total/self time and a bar scaled to the trace"""
+    total = sum(r["duration_ms"] for r in roots) or 1.0
+    print(f"{'Span':<48} {'Total':>10} {'Self':>10} {'Share':>7}")
+    print("-" * (80 + BAR_WIDTH))
+
+    def walk(node, depth):
+        label = ("  " * depth + node["name"])[:47]
+        if node["status"] == "error":
+            label = (label + " ❌")[:47]
+        share = node["duration_ms"] / total
+        bar = "█" * max(1, round(share * BAR_WIDTH)) if node["duration_ms"] else ""
+        print(
+            f"{label:<48} {node['duration_ms']:>8.0f}ms {node['self_ms']:>8.0f}ms "
+            f"{share:>6.1%} {bar}"
+        )
+        for child in node["children"]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+
+
+def print_folded(roots: List[Dict[str, Any]]):
+    """Folded stacks ("a;b;c self_ms") for flame graph tools"""
+    def walk(node, stack):
+        stack = stack + [node["name"].replace(";", ":")]
+        if node["self_ms"] >= 0.5:
+            print(f"{';'.join(stack)} {round(node['self_ms'])}")
+        for child in node["children"]:
+            walk(child, stack)
+
+    for root in roots:
+        walk(root, [])
+
+
+def list_traces(spans: List[Dict[str, Any]], limit: int):
+    """Most recent traces with their root span and total time"""
+    traces: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        info = traces.setdefault(s["trace_id"], {"spans": 0, "start_ms": s["start_ms"], "root": None, "root_ms": 0.0})
+        info["spans"] += 1
+        info["start_ms"] = min(info["start_ms"], s["start_ms"])
+        if s["parent_id"] is None and s["duration_ms"] >= info["root_ms"]:
+            info["root"], info["root_ms"] = s["name"], s["duration_ms"]
+
+    print(f"{'Trace':<18} {'Spans':>6} {'Root span':<40} {'Duration':>10}")
+    print("-" * 78)
+    for trace_id, info in sorted(traces.items(), key=lambda kv: kv[1]["start_ms"], reverse=True)[:limit]:
+        print(f"{trace_id:<18} {info['spans']:>6} {str(info['root'])[:39]:<40} {info['root_ms']:>8.0f}ms")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Per-trace span breakdown from agent logs")
+    parser.add_argument("--log-dir", default=DEFAULT_LOG_DIR, help="StructuredLogger log directory")
+    parser.add_argument("--trace", help="Trace ID to break down (default: most recent)")
+    parser.add_argument("--list", action="store_true", help="List recent traces")
+    parser.add_argument("--limit", type=int, default=20, help="Traces shown by --list")
+    parser.add_argument("--folded", action="store_true", help="Print folded stacks instead of a tree")
+    args = parser.parse_args()
+
+    if args.list:
+        list_traces(load_spans(args.log_dir), args.limit)
+        return
+
+    trace_id = args.trace
+    if trace_id is None:
+        spans = load_spans(args.log_dir)
+        if not spans:
+            print("No spans found")
+            sys.exit(1)
+        trace_id = max(spans, key=lambda s: s["start_ms"])["trace_id"]
+        spans = [s for s in spans if s["trace_id"] == trace_id]
+    else:
+        spans = load_spans(args.log_dir, trace_id)
+
+    if not spans:
+        print(f"No spans found for trace {trace_id}")
+        sys.exit(1)
+
+    roots = build_tree(spans)
+    if args.folded:
+        print_folded(roots)
+    else:
+        print(f"Trace {trace_id} ({len(spans)} spans)\n")
+        print_tree(roots)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 """
 Subagents - Specialized AI Agents
 
-VERSION: 3.1.0 - Consistent Naming Convention
+VERSION: 3.2.0 - Lazy subagent imports
 All agents follow *_agent.py pattern for immediate role recognition.
 
 Architecture:
@@ -9,23 +9,42 @@ Architecture:
 - Subagents: 11 specialized agents (delegated via Task tool)
 """
 
-# Core Math Education Subagents (6)
-from .file_builder_agent import knowledge_builder
-from .validator_agent import quality_agent
-from .web_research_agent import research_agent
-from .requirements_agent import socratic_requirements_agent
-from .decomposer_agent import problem_decomposer_agent
-from .problem_generator_agent import problem_scaffolding_generator_agent
-
-# Extended Functionality Subagents (3)
-from .graph_query_agent import neo4j_query_agent
-from .personalization_agent import personalization_engine_agent
+import importlib
+
+# Export name -> defining module. Modules are imported on first attribute
+# access (PEP 562), so importing one subagent doesn't load all twelve prompts.
+_EXPORTS = {
+    # Core Math Education Subagents (6)
+    "knowledge_builder": "file_builder_agent",
+    "quality_agent": "validator_agent",
+    "research_agent": "web_research_agent",
+    "socratic_requirements_agent": "requirements_agent",
+    "problem_decomposer_agent": "decomposer_agent",
+    "problem_scaffolding_generator_agent": "problem_generator_agent",
+    # Extended Functionality Subagents (3)
+    "neo4j_query_agent": "graph_query_agent",
+    "personalization_engine_agent": "personalization_agent",
+    "feedback_learning_agent": "feedback_learning_agent",
+    # System Improvement Subagents (2)
+    "self_improver_agent": "code_improver_agent",
+    "meta_planning_analyzer": "planning_analyzer_agent",
+    "meta_query_helper": "query_helper_agent",
+}
+
+
+# This module shares its export's name: import it eagerly so the package
+# attribute is the definition, not the submodule the import system binds
 from .feedback_learning_agent import feedback_learning_agent
 
-# System Improvement Subagents (2)
-from .code_improver_agent import self_improver_agent
-from .planning_analyzer_agent import meta_planning_analyzer
-from .query_helper_agent import meta_query_helper
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # Cache: later lookups skip __getattr__
+    return value
+
 
 __all__ = [
     # Core Math Education (6)
@@ -0,0 +1,72 @@
+"""
+Test: Agent Registry Capability Indexes
+
+Verifies that capability and feature indexes are maintained on
+register/unregister/reload, that substring capability queries keep
+their old semantics, and that multi-capability queries intersect.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.registry_service import AgentRegistry
+
+
+def _meta(tools, thinking=False, caching=False):
+    return {"tools": tools, "has_extended_thinking": thinking, "has_prompt_caching": caching}
+
+
+def _registry(tmp_path):
+    registry = AgentRegistry(tmp_path / "agents")
+    registry.register("knowledge-builder", _meta(["Read", "Write", "Edit"], thinking=True))
+    registry.register("research-agent", _meta(["WebSearch", "mcp__brave-search__search", "Read"], thinking=True))
+    registry.register("quality-agent", _meta(["Read", "Grep"], caching=True))
+    registry.register("meta-orchestrator", _meta(["Task", "Read", "Write"], thinking=True, caching=True))
+    return registry
+
+
+def test_single_capability_lookup_matches_substrings(tmp_path):
+    registry = _registry(tmp_path)
+
+    assert registry.get_agents_by_capability("Write") == ["knowledge-builder", "meta-orchestrator"]
+    assert registry.get_agents_by_capability("search") == ["research-agent"]
+    assert registry.get_agents_by_capability("task") == ["meta-orchestrator"]
+    assert registry.get_agents_by_capability("Bash") == []
+    assert registry.get_agents_with_extended_thinking() == ["knowledge-builder", "meta-orchestrator", "research-agent"]
+    assert registry.get_agents_with_caching() == ["meta-orchestrator", "quality-agent"]
+
+
+def test_multi_capability_intersection_and_flags(tmp_path):
+    registry = _registry(tmp_path)
+
+    assert registry.get_agents_by_capabilities(["Read", "Write"]) == ["knowledge-builder", "meta-orchestrator"]
+    assert registry.get_agents_by_capabilities(["Write", "Task"]) == ["meta-orchestrator"]
+    assert registry.get_agents_by_capabilities(["Grep", "Task"], match_all=False) == ["meta-orchestrator", "quality-agent"]
+    assert registry.get_agents_by_capabilities(["Read"], prompt_caching=True) == ["meta-orchestrator", "quality-agent"]
+    assert registry.get_agents_by_capabilities(["Read"], extended_thinking=False) == ["quality-agent"]
+    assert registry.get_agents_by_capabilities([], prompt_caching=True, extended_thinking=True) == ["meta-orchestrator"]
+
+
+def test_reload_and_unregister_update_indexes(tmp_path):
+    registry = _registry(tmp_path)
+    assert registry.get_agents_by_capability("Grep") == ["quality-agent"]  # Cached query
+
+    # Reload with new tools: old capabilities go, cached queries are refreshed
+    registry.register("quality-agent", _meta(["Read", "Bash"]))
+    assert registry.get_agents_by_capability("Grep") == []
+    assert registry.get_agents_by_capability("bash") == ["quality-agent"]
+    assert "quality-agent" not in registry.get_agents_with_caching()
+
+    registry.register("grep-helper", _meta(["Grep"]))
+    assert registry.get_agents_by_capability("Grep") == ["grep-helper"]
+
+    registry.unregister("meta-orchestrator")
+    assert registry.get_agents_by_capability("Task") == []
+    assert registry.get_agents_by_capabilities(["Write"]) == ["knowledge-builder"]
+    assert "task" not in registry._by_tool
@@ -0,0 +1,103 @@
+"""
+Test: Agent Registry Discovery Manifest
+
+Verifies that the first discovery writes a manifest, that later
+discoveries read capability metadata from it without importing agent
+modules, that modules are imported on first use, and that changed
+files are rescanned.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import io
+import json
+import os
+import sys
+import uuid
+from contextlib import redirect_stdout
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.registry_service import AgentRegistry
+
+AGENT_SOURCE = '''
+from claude_agent_sdk import AgentDefinition
+
+{name} = AgentDefinition(
+    description="{description}",
+    prompt="Extended Thinking (5,000 token budget)",
+    tools=["Read", "Grep"],
+    model="claude-sonnet-4-5-20250929",
+)
+'''
+
+
+def _make_agents_dir(tmp_path):
+    package = tmp_path / f"fake_agents_{uuid.uuid4().hex[:8]}"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "alpha_agent.py").write_text(AGENT_SOURCE.format(name="alpha_agent", description="Alpha"))
+    (package / "beta_agent.py").write_text(AGENT_SOURCE.format(name="beta_agent", description="Beta"))
+    sys.path.insert(0, str(tmp_path))
+    return package
+
+
+def _discover(package, **kwargs):
+    registry = AgentRegistry(package)
+    with redirect_stdout(io.StringIO()):
+        agents = registry.discover_agents(**kwargs)
+    return registry, agents
+
+
+def _forget_modules(package):
+    for name in [m for m in sys.modules if m == package.name or m.startswith(package.name + ".")]:
+        del sys.modules[name]
+
+
+def test_first_discovery_writes_manifest(tmp_path):
+    package = _make_agents_dir(tmp_path)
+    registry, agents = _discover(package)
+
+    assert sorted(agents) == ["alpha-agent", "beta-agent"]
+    manifest = json.loads((package / ".agent_manifest.json").read_text())
+    entry = manifest["modules"]["alpha_agent"]
+    assert entry["exports"] == ["alpha_agent"]
+    assert entry["agents"]["alpha-agent"]["thinking_budget"] == 5_000
+    assert entry["mtime_ns"] == (package / "alpha_agent.py").stat().st_mtime_ns
+
+
+def test_warm_discovery_imports_lazily(tmp_path):
+    package = _make_agents_dir(tmp_path)
+    _discover(package)
+    _forget_modules(package)
+
+    registry, agents = _discover(package)
+    assert f"{package.name}.alpha_agent" not in sys.modules
+    assert registry.get_agents_by_capability("Grep") == ["alpha-agent", "beta-agent"]
+    assert registry.get_agent_capabilities("beta-agent")["description"] == "Beta"
+
+    assert agents["alpha-agent"].description == "Alpha"
+    assert f"{package.name}.alpha_agent" in sys.modules
+    assert f"{package.name}.beta_agent" not in sys.modules
+
+    renamed = registry.agent_map({"alpha": "alpha-agent"})
+    assert dict(renamed)["alpha"] is agents["alpha-agent"]
+
+
+def test_changed_module_is_rescanned(tmp_path):
+    package = _make_agents_dir(tmp_path)
+    _discover(package)
+    _forget_modules(package)
+
+    beta = package / "beta_agent.py"
+    beta.write_text(AGENT_SOURCE.format(name="beta_agent", description="Beta v2"))
+    stat = beta.stat()
+    os.utime(beta, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    registry, _ = _discover(package)
+    assert f"{package.name}.beta_agent" in sys.modules  # Rescanned
+    assert f"{package.name}.alpha_agent" not in sys.modules  # Still cached
+    assert registry.get_agent_capabilities("beta-agent")["description"] == "Beta v2"
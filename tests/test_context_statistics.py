@@ -0,0 +1,95 @@
+"""
+Test: ContextManager Maintained Statistics
+
+Verifies that per-category counts, byte sizes and oldest/newest
+timestamps are maintained on save, overwrite and delete, seeded once
+from earlier sessions, and served without further store reads.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from datetime import datetime
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.context_service import ContextManager
+from infrastructure.memory_store_service import SQLiteMemoryKeeper
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _CountingStore(SQLiteMemoryKeeper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gets = 0
+
+    def get(self, **params):
+        self.gets += 1
+        return super().get(**params)
+
+
+def test_statistics_track_saves_overwrites_and_moves():
+    clock = _Clock()
+    store = _CountingStore(clock=clock)
+    context = ContextManager(store, batch_size=1, clock=clock)
+
+    context.save("t1", "abcd", "tasks")
+    clock.now += 10
+    context.save("t2", "é", "tasks")  # 2 bytes in UTF-8
+    clock.now += 10
+    context.save("t1", "ab", "tasks")  # Overwrite: t1 is now the newest
+
+    stats = context.get_statistics()
+    assert stats["tasks"]["count"] == 2
+    assert stats["tasks"]["bytes"] == 4
+    assert stats["tasks"]["oldest"] == datetime.fromtimestamp(1_700_000_010.0).isoformat()
+    assert stats["tasks"]["newest"] == datetime.fromtimestamp(1_700_000_020.0).isoformat()
+    assert stats["debug"] == {
+        "count": 0, "bytes": 0, "oldest": None, "newest": None, "retention_days": 3, "max_items": 50
+    }
+
+    context.save("t2", "moved", "progress")
+    stats = context.get_statistics()
+    assert (stats["tasks"]["count"], stats["tasks"]["bytes"]) == (1, 2)
+    assert (stats["progress"]["count"], stats["progress"]["bytes"]) == (1, 5)
+
+    reads = store.gets
+    for _ in range(5):
+        context.get_statistics()
+    assert store.gets == reads  # No data transfer once seeded
+
+
+def test_statistics_seeded_from_earlier_session_and_follow_deletes(tmp_path):
+    db = str(tmp_path / "context.db")
+    clock = _Clock()
+    earlier = ContextManager(SQLiteMemoryKeeper(db, clock=clock), batch_size=1, clock=clock)
+    earlier.save_decision("Use SQLite", {"why": "offline"})
+    for i in range(5):
+        earlier.save(f"dbg-{i}", "x" * 10, "debug")
+    earlier.flush()
+
+    store = _CountingStore(db, clock=clock)
+    context = ContextManager(store, batch_size=1, clock=clock)
+    stats = context.get_statistics()
+    assert stats["decisions"]["count"] == 1
+    assert (stats["debug"]["count"], stats["debug"]["bytes"]) == (5, 50)
+    assert store.gets == len(ContextManager.CATEGORIES)
+
+    clock.now += 4 * 86400  # Earlier debug items expire on the next cleanup
+    for i in range(10):
+        context.save(f"task-{i}", "y", "tasks")
+    stats = context.get_statistics()
+    assert (stats["debug"]["count"], stats["debug"]["bytes"]) == (0, 0)
+    assert store.count("debug") == 0
+    assert stats["tasks"]["count"] == 10
+    assert stats["decisions"]["count"] == 1
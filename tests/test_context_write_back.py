@@ -0,0 +1,193 @@
+"""
+Test: ContextManager Write-Back Cache
+
+Verifies that saves are coalesced per key and flushed in batches (with a
+fallback to single saves), that reads flush first, and that retention
+cleanup runs from the local index without re-fetching categories.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.context_service import ContextManager
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+class _FakeMemoryKeeper:
+    """Records memory-keeper tool calls; optional tools can be disabled."""
+
+    def __init__(self, batch=True, delete=True, fail_saves=False):
+        self.batch = batch
+        self.delete = delete
+        self.fail_saves = fail_saves
+        self.calls = []
+        self.store = {}
+
+    def __call__(self, tool_name, **params):
+        self.calls.append(tool_name.rsplit("__", 1)[-1])
+        if tool_name.endswith("context_batch_save"):
+            if not self.batch:
+                raise RuntimeError("Unknown tool")
+            for item in params["items"]:
+                self.store[item["key"]] = item
+        elif tool_name.endswith("context_save"):
+            if self.fail_saves:
+                raise ConnectionError("memory-keeper down")
+            self.store[params["key"]] = params
+        elif tool_name.endswith("context_delete"):
+            if not self.delete:
+                raise RuntimeError("Unknown tool")
+            self.store.pop(params["key"], None)
+        elif tool_name.endswith("context_get"):
+            return {"items": [i for i in self.store.values() if i["category"] == params.get("category")]}
+        return {}
+
+
+def test_saves_are_coalesced_and_batched():
+    keeper = _FakeMemoryKeeper()
+    manager = ContextManager(keeper, batch_size=3, flush_interval_s=60, clock=_Clock())
+
+    manager.save("state", {"step": 1}, "session-state")
+    manager.save("state", {"step": 2}, "session-state")  # Coalesced
+    manager.save("task-1", "queued", "tasks")
+    assert keeper.calls == []
+
+    manager.save("task-2", "queued", "tasks")
+    assert keeper.calls == ["context_batch_save"]
+    assert keeper.store["state"]["value"] == '{"step": 2}'
+    assert set(keeper.store) == {"state", "task-1", "task-2"}
+
+
+def test_flush_interval_and_read_your_writes():
+    keeper = _FakeMemoryKeeper()
+    clock = _Clock()
+    manager = ContextManager(keeper, batch_size=100, flush_interval_s=5, clock=clock)
+
+    manager.save("a", "1", "debug")
+    clock.now += 6
+    manager.save("b", "2", "debug")  # Oldest pending is past the interval
+    assert keeper.calls == ["context_batch_save"]
+
+    manager.save("c", "3", "debug")
+    assert [i["key"] for i in manager.get(category="debug")] == ["a", "b", "c"]
+
+
+def test_batch_fallback_and_requeue_on_failure():
+    keeper = _FakeMemoryKeeper(batch=False)
+    manager = ContextManager(keeper, batch_size=100, clock=_Clock())
+    manager.save("a", "1", "debug")
+    manager.save("b", "2", "debug")
+    assert manager.flush() == 2
+    assert keeper.calls == ["context_batch_save", "context_save", "context_save"]
+
+    keeper.fail_saves = True
+    manager.save("c", "3", "debug")
+    with pytest.raises(ConnectionError):
+        manager.flush()
+    keeper.fail_saves = False
+    assert manager.flush() == 1
+    assert "c" in keeper.store
+
+
+def test_cleanup_uses_local_index_without_refetching():
+    keeper = _FakeMemoryKeeper()
+    clock = _Clock()
+    manager = ContextManager(keeper, batch_size=1, clock=clock)
+
+    for i in range(60):  # debug keeps 50 items for 3 days
+        manager.save(f"dbg-{i}", str(i), "debug")
+        clock.now += 1
+
+    assert keeper.calls.count("context_get") == 9  # One-time seeding per category
+    assert sorted(keeper.store, key=lambda k: int(k.split("-")[1]))[0] == "dbg-10"
+    assert len(keeper.store) == 50
+
+    clock.now += 4 * 86400  # Everything expires
+    for i in range(10):
+        manager.save(f"task-{i}", "x", "tasks")
+    assert keeper.calls.count("context_get") == 9
+    assert not any(k.startswith("dbg-") for k in keeper.store)
+    assert len(keeper.store) == 10
+
+
+def test_cleanup_marks_only_without_delete_api():
+    keeper = _FakeMemoryKeeper(delete=False)
+    manager = ContextManager(keeper, batch_size=1, clock=_Clock())
+
+    for i in range(60):
+        manager.save(f"dbg-{i}", str(i), "debug")
+
+    assert len(keeper.store) == 60
+    assert keeper.calls.count("context_delete") == 1  # Not retried once unsupported
+
+
+class _FlakyMemoryKeeper(_FakeMemoryKeeper):
+    """Fails the next N calls of one tool with a transient error."""
+
+    def __init__(self, tool, failures):
+        super().__init__()
+        self.tool = tool
+        self.failures = failures
+
+    def __call__(self, tool_name, **params):
+        if tool_name.endswith(self.tool) and self.failures:
+            self.failures -= 1
+            self.calls.append(tool_name.rsplit("__", 1)[-1])
+            raise ConnectionError("connection reset by peer")
+        return super().__call__(tool_name, **params)
+
+
+def test_transient_batch_error_keeps_batch_saves():
+    keeper = _FlakyMemoryKeeper("context_batch_save", failures=1)
+    manager = ContextManager(keeper, batch_size=100, clock=_Clock())
+
+    manager.save("a", "1", "debug")
+    manager.save("b", "2", "debug")
+    with pytest.raises(ConnectionError):
+        manager.flush()
+    assert "context_save" not in keeper.calls
+
+    assert manager.flush() == 2
+    assert keeper.calls == ["context_batch_save", "context_batch_save"]
+    assert set(keeper.store) == {"a", "b"}
+
+
+def test_transient_delete_error_keeps_delete_api():
+    keeper = _FlakyMemoryKeeper("context_delete", failures=1)
+    manager = ContextManager(keeper, batch_size=1, clock=_Clock())
+
+    for i in range(60):
+        manager.save(f"dbg-{i}", str(i), "debug")
+    assert keeper.calls.count("context_delete") == 1  # Failed; pass stopped
+    assert len(keeper.store) == 60
+
+    for i in range(60, 70):  # Next cleanup retries; deletes keep working
+        manager.save(f"dbg-{i}", str(i), "debug")
+    assert len(keeper.store) == 50
+
+
+def test_cleanup_drops_unflushed_items_without_store_calls():
+    keeper = _FlakyMemoryKeeper("context_delete", failures=100)
+    manager = ContextManager(keeper, batch_size=100, clock=_Clock())
+
+    for i in range(60):  # Still buffered when cleanup trims debug to 50
+        manager.save(f"dbg-{i}", str(i), "debug")
+    assert "context_delete" not in keeper.calls
+
+    assert manager.flush() == 50
+    assert sorted(keeper.store, key=lambda k: int(k.split("-")[1]))[0] == "dbg-10"
@@ -0,0 +1,140 @@
+"""
+Test: Workflow Deadline Propagation
+
+Verifies that a deadline set at workflow entry tightens (never extends)
+through nested scopes, that resilient_task cuts off attempts and skips
+retries that cannot finish in time, and that the OCR client and the
+parallel orchestrator drop work that is already too late.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.deadline_service import (
+    DeadlineExceeded,
+    current_deadline,
+    deadline_scope,
+    remaining_time,
+    shrink_timeout,
+)
+from infrastructure.error_service import RetryConfig, resilient_task
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_nested_scope_only_tightens_and_resets():
+    clock = _Clock()
+    assert current_deadline() is None
+    assert shrink_timeout(30) == 30
+
+    with deadline_scope(10, clock=clock) as outer:
+        assert shrink_timeout(30) == 10
+        with deadline_scope(60, clock=clock) as inner:
+            assert inner is outer  # Can't extend past the workflow deadline
+        with deadline_scope(2, clock=clock):
+            assert shrink_timeout(30) == 2
+        clock.now += 4
+        assert remaining_time() == 6
+        clock.now += 10
+        assert shrink_timeout(30) == 0.0
+        with pytest.raises(DeadlineExceeded):
+            outer.check("late stage")
+
+    assert current_deadline() is None
+
+
+async def test_resilient_task_cuts_off_attempt_at_deadline():
+    @resilient_task(RetryConfig(max_retries=3, initial_delay=0.0))
+    async def slow():
+        await asyncio.sleep(1.0)
+
+    with deadline_scope(0.05):
+        with pytest.raises(DeadlineExceeded):
+            await slow()
+
+
+async def test_resilient_task_skips_retry_that_cannot_finish():
+    calls = []
+
+    @resilient_task(RetryConfig(max_retries=3, initial_delay=5.0, jitter=False))
+    async def flaky():
+        calls.append(1)
+        raise ConnectionError("connection reset")
+
+    with deadline_scope(1.0):
+        with pytest.raises(ConnectionError):
+            await flaky()
+    assert len(calls) == 1  # 5s backoff would overrun the 1s deadline
+
+
+async def test_resilient_task_drops_call_after_deadline():
+    clock = _Clock()
+    calls = []
+
+    @resilient_task(RetryConfig(max_retries=3))
+    async def work():
+        calls.append(1)
+
+    with deadline_scope(1.0, clock=clock):
+        clock.now += 2
+        with pytest.raises(DeadlineExceeded):
+            await work()
+    assert calls == []
+
+
+def test_ocr_skipped_once_deadline_passed(monkeypatch, tmp_path):
+    import tools.mathpix_ocr_tool as ocr
+
+    def fail_post(*args, **kwargs):
+        raise AssertionError("OCR request sent after the deadline")
+
+    monkeypatch.setattr(ocr.requests, "post", fail_post)
+    monkeypatch.setattr(ocr, "send_hook_event", lambda *a, **k: None)
+    image = tmp_path / "problem.png"
+    image.write_bytes(b"png")
+
+    clock = _Clock()
+    with deadline_scope(1.0, clock=clock):
+        clock.now += 2
+        result = ocr.extract_math_from_image(str(image))
+
+    assert result["success"] is False
+    assert "deadline" in result["error"]
+
+
+async def test_parallel_wave_drops_late_variations(monkeypatch, tmp_path):
+    import workflows.parallel_scaffolding_orchestrator as orch
+
+    monkeypatch.setattr(orch, "send_hook_event", lambda *a, **k: None)
+    orchestrator = orch.ParallelScaffoldingOrchestrator(output_base_dir=str(tmp_path))
+
+    async def fake_variation(shared_context, dimension, iteration_number, existing_variations):
+        await asyncio.sleep(dimension)
+        return {"variation_iteration": iteration_number}
+
+    class _Dim(float):
+        name = "dim"
+
+    monkeypatch.setattr(orchestrator, "generate_single_variation", fake_variation)
+
+    with deadline_scope(0.2):
+        variations = await orchestrator._execute_parallel_wave(
+            shared_context={}, dimensions=[_Dim(0.0), _Dim(0.01), _Dim(5.0)], existing_variations=[]
+        )
+
+    assert sorted(v["variation_iteration"] for v in variations) == [1, 2]
@@ -0,0 +1,272 @@
+"""
+Test: Circuit Breaker, Retry Budget and Jittered Backoff
+
+Verifies breaker state transitions, that retries stop once the shared
+budget is spent, and that resilient_task fails fast on an open circuit.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure import error_service
+from infrastructure.error_service import (
+    CircuitBreaker,
+    CircuitOpenError,
+    HedgeConfig,
+    RetryBudget,
+    RetryConfig,
+    get_resilience_metrics,
+    resilient_task,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+NO_WAIT = RetryConfig(max_retries=3, initial_delay=0.0)
+
+
+def test_full_jitter_stays_within_backoff():
+    config = RetryConfig(initial_delay=1.0, max_delay=8.0)
+    delays = [config.get_delay(4) for _ in range(200)]
+    assert all(0 <= d <= 8.0 for d in delays)
+    assert len(set(delays)) > 1
+    assert RetryConfig(jitter=False).get_delay(3) == 4.0
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = _Clock()
+    breaker = CircuitBreaker("ocr", failure_threshold=2, recovery_timeout=10, clock=clock)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    clock.now = 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # Only one probe at a time
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.to_dict()["opened_total"] == 2
+
+
+def test_retry_budget_caps_retries_to_traffic_share():
+    clock = _Clock()
+    budget = RetryBudget(ratio=0.25, min_per_second=0.0, max_tokens=2.0, clock=clock)
+    assert budget.try_spend() and budget.try_spend()
+    assert not budget.try_spend()
+
+    for _ in range(4):
+        budget.record_request()
+    assert budget.try_spend()
+    assert not budget.try_spend()
+    assert budget.to_dict()["retries_rejected_total"] == 2
+
+    # Time alone refills the floor rate
+    budget.min_per_second = 1.0
+    clock.now += 1.0
+    assert budget.try_spend()
+
+
+async def test_resilient_task_fails_fast_when_circuit_open(monkeypatch):
+    monkeypatch.setattr(error_service, "_circuit_breakers", {})
+    monkeypatch.setattr(error_service, "_retry_budgets", {})
+    error_service.get_circuit_breaker("mathpix", failure_threshold=3, recovery_timeout=60)
+    calls = []
+
+    @resilient_task(NO_WAIT, dependency="mathpix")
+    async def call_mathpix():
+        calls.append(1)
+        raise ConnectionError("503 service unavailable")
+
+    with pytest.raises(ConnectionError):
+        await call_mathpix()
+    assert len(calls) == 3
+
+    with pytest.raises(CircuitOpenError):
+        await call_mathpix()
+    assert len(calls) == 3  # Not called while open
+
+    metrics = get_resilience_metrics()["mathpix"]
+    assert metrics["circuit"]["state"] == "open"
+    assert metrics["circuit"]["rejected_total"] == 1
+    assert metrics["retry_budget"]["retries_allowed_total"] == 2
+
+
+async def test_cancelled_half_open_probe_releases_its_slot():
+    clock = _Clock()
+    breaker = CircuitBreaker("ocr", failure_threshold=1, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+    clock.now = 10  # Half-open: one probe allowed
+    started = asyncio.Event()
+
+    @resilient_task(NO_WAIT, breaker=breaker)
+    async def probe(hang: bool):
+        if hang:
+            started.set()
+            await asyncio.sleep(60)
+        return "ok"
+
+    task = asyncio.create_task(probe(True))
+    await started.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    assert await probe(False) == "ok"  # The slot was given back
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_resilient_task_stops_when_budget_spent():
+    budget = RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0)
+    calls = []
+
+    @resilient_task(RetryConfig(max_retries=5, initial_delay=0.0), budget=budget)
+    async def flaky():
+        calls.append(1)
+        raise TimeoutError("timeout")
+
+    with pytest.raises(TimeoutError):
+        await flaky()
+    assert len(calls) == 2  # One retry from the single token, then give up
+
+
+async def test_non_retryable_errors_do_not_trip_breaker():
+    breaker = CircuitBreaker("model", failure_threshold=1)
+
+    @resilient_task(NO_WAIT, breaker=breaker)
+    async def bad_input():
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        await bad_input()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+async def test_non_retryable_errors_leave_breaker_unchanged():
+    clock = _Clock()
+    breaker = CircuitBreaker("model", failure_threshold=2, recovery_timeout=10, clock=clock)
+    breaker.record_failure()
+
+    @resilient_task(NO_WAIT, breaker=breaker)
+    async def bad_input():
+        raise ValueError("invalid prompt")
+
+    with pytest.raises(ValueError):
+        await bad_input()
+    assert breaker.consecutive_failures == 1  # Not reset by a bad request
+
+    breaker.record_failure()
+    clock.now = 10  # Half-open: one probe allowed
+    with pytest.raises(ValueError):
+        await bad_input()
+    assert breaker.state == CircuitBreaker.HALF_OPEN  # Not closed by it either
+    assert breaker.allow_request()  # The probe slot was given back
+
+
+def _warm_monitor(latency_ms=20.0, samples=30):
+    from infrastructure.monitoring_service import PerformanceMonitor
+
+    monitor = PerformanceMonitor()
+    for _ in range(samples):
+        monitor.record_execution("generator", latency_ms, success=True)
+    return monitor
+
+
+async def test_hedge_launches_duplicate_after_p95_and_cancels_loser():
+    import asyncio
+
+    hedge = HedgeConfig(monitor=_warm_monitor(), agent_name="generator")
+    started, cancelled = [], []
+
+    @resilient_task(NO_WAIT, hedge=hedge)
+    async def generate():
+        attempt = len(started)
+        started.append(attempt)
+        try:
+            await asyncio.sleep(1.0 if attempt == 0 else 0.01)  # First call is a straggler
+        except asyncio.CancelledError:
+            cancelled.append(attempt)
+            raise
+        return attempt
+
+    assert await generate() == 1
+    await asyncio.sleep(0)
+    assert started == [0, 1]
+    assert cancelled == [0]
+    assert hedge.to_dict()["hedges_won_total"] == 1
+
+
+async def test_hedge_latency_recorded_apart_from_delay_stats():
+    monitor = _warm_monitor()
+    hedge = HedgeConfig(monitor=monitor, agent_name="generator", record_latency=True)
+
+    @resilient_task(NO_WAIT, hedge=hedge)
+    async def generate():
+        return "ok"
+
+    assert await generate() == "ok"
+    assert monitor.get_metrics("generator").execution_count == 30
+    assert monitor.get_metrics("generator:hedged").execution_count == 1
+
+
+async def test_hedge_skipped_without_history_or_budget():
+    import asyncio
+
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    cold = HedgeConfig(monitor=_warm_monitor(samples=3), agent_name="generator")
+    assert await resilient_task(NO_WAIT, hedge=cold)(slow)() == "ok"
+    assert len(calls) == 1 and cold.hedges_launched == 0
+
+    broke = HedgeConfig(
+        monitor=_warm_monitor(), agent_name="generator",
+        budget=RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=0.0),
+    )
+    assert await resilient_task(NO_WAIT, hedge=broke)(slow)() == "ok"
+    assert len(calls) == 2 and broke.hedges_skipped == 1
+
+
+async def test_hedge_falls_back_to_surviving_copy_on_error():
+    import asyncio
+
+    hedge = HedgeConfig(monitor=_warm_monitor(), agent_name="generator", record_latency=False)
+    attempts = []
+
+    @resilient_task(RetryConfig(max_retries=1), hedge=hedge)
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            await asyncio.sleep(0.05)
+            return "slow but fine"
+        raise ValueError("duplicate failed")
+
+    assert await flaky() == "slow but fine"
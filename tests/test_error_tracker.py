@@ -0,0 +1,71 @@
+"""
+Test: Bounded, Indexed ErrorTracker
+
+Verifies that error records are kept in a bounded ring buffer with
+per-agent and per-type indexes that follow eviction, and that repeated
+errors are deduplicated by fingerprint while summaries stay exact.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.error_service import ErrorTracker, error_fingerprint
+
+
+def test_ring_buffer_bounds_records_and_indexes():
+    tracker = ErrorTracker(max_logs=5)
+    for i in range(8):
+        agent = "ocr" if i % 2 else "generator"
+        error = TimeoutError(f"call {i} timed out") if i < 6 else ValueError("bad input")
+        tracker.record_error(agent, f"task-{i}", error, {"i": i})
+
+    assert len(tracker.error_logs) == 5
+    assert [r.context_snapshot["i"] for r in tracker.get_error_logs()] == [3, 4, 5, 6, 7]
+    assert [r.task_id for r in tracker.get_error_logs("ocr")] == ["task-3", "task-5", "task-7"]
+    assert [r.task_id for r in tracker.get_error_logs(error_type="ValueError")] == ["task-6", "task-7"]
+    assert [r.task_id for r in tracker.get_error_logs("ocr", "TimeoutError")] == ["task-3", "task-5"]
+    assert tracker.get_error_logs("missing") == []
+
+
+def test_summary_counts_survive_eviction_and_dedupe_by_fingerprint():
+    tracker = ErrorTracker(max_logs=3)
+    for i in range(10):
+        tracker.record_error("ocr", f"task-{i}", ConnectionError(f"connection {i} reset by 10.0.0.{i}"), {})
+    tracker.record_error("generator", "t", ValueError("bad input"), {})
+
+    summary = tracker.get_error_summary()
+    assert summary["total_errors"] == 11
+    assert summary["retained_errors"] == 3
+    assert summary["by_agent"] == {"ocr": 10, "generator": 1}
+    assert summary["by_type"] == {"ConnectionError": 10, "ValueError": 1}
+    assert summary["distinct_errors"] == 2
+
+    top = summary["fingerprints"][0]
+    assert top["count"] == 10 and top["agent"] == "ocr"
+    assert top["first_seen"] <= top["last_seen"]
+
+
+def test_fingerprint_ignores_volatile_parts_only():
+    a = error_fingerprint("ocr", "TimeoutError", "request 123 to 0xdeadbeef timed out")
+    b = error_fingerprint("ocr", "TimeoutError", "request 456 to 0xcafe timed out")
+    assert a == b
+    assert a != error_fingerprint("generator", "TimeoutError", "request 1 to 0x1 timed out")
+    assert a != error_fingerprint("ocr", "TimeoutError", "request 1 refused")
+
+
+def test_fingerprint_table_is_bounded_lru():
+    tracker = ErrorTracker(max_fingerprints=2)
+    tracker.record_error("a", "t", ValueError("first"), {})
+    tracker.record_error("a", "t", ValueError("second"), {})
+    tracker.record_error("a", "t", ValueError("first"), {})  # Refreshes "first"
+    tracker.record_error("a", "t", ValueError("third"), {})  # Evicts "second"
+
+    messages = {e.sample_message for e in tracker.fingerprints.values()}
+    assert messages == {"first", "third"}
+    assert tracker.get_error_summary()["total_errors"] == 4
@@ -0,0 +1,258 @@
+"""
+Test: Async EventReporter Batching and Spool
+
+Verifies that async-mode events are posted in batches over one pooled
+client, that batches are spooled to disk while the server is down, and
+that the spool is replayed in order once the server is reachable again
+(even without new events), and that events the server rejects are
+quarantined instead of retried.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+import httpx
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from integrations.observability.event_reporter import EventReporter
+
+
+class _FakeServer:
+    """httpx transport handler that records batches and can be taken down."""
+
+    def __init__(self, batch_status: int = 200):
+        self.batch_status = batch_status
+        self.up = True
+        self.batches = []
+        self.singles = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if not self.up:
+            raise httpx.ConnectError("connection refused", request=request)
+        body = json.loads(request.content)
+        if request.url.path.endswith("/batch"):
+            if self.batch_status == 200:
+                self.batches.append(body)
+            return httpx.Response(self.batch_status)
+        self.singles.append(body)
+        return httpx.Response(200)
+
+    def messages(self):
+        events = [e for batch in self.batches for e in batch] + self.singles
+        return [e["payload"]["message"] for e in events]
+
+
+def _reporter(tmp_path, server, **kwargs):
+    reporter = EventReporter(
+        "test-app",
+        base_url="http://obs.test/events",
+        async_mode=True,
+        spool_path=str(tmp_path / "spool.jsonl"),
+        **kwargs,
+    )
+    reporter._async_client = httpx.AsyncClient(transport=httpx.MockTransport(server))
+    return reporter
+
+
+async def test_async_mode_batches_over_one_client(tmp_path):
+    server = _FakeServer()
+    reporter = _reporter(tmp_path, server, batch_size=10, flush_interval_s=0.05)
+
+    for i in range(25):
+        assert reporter.notification("sess", f"m{i}") is True
+    await reporter.aclose()
+
+    assert [len(batch) for batch in server.batches] == [10, 10, 5]
+    assert server.messages() == [f"m{i}" for i in range(25)]
+    assert reporter.stats()["sent"] == 25
+
+
+async def test_falls_back_to_single_posts_without_batch_endpoint(tmp_path):
+    server = _FakeServer(batch_status=404)
+    reporter = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    reporter.notification("sess", "a")
+    reporter.notification("sess", "b")
+    await reporter.aclose()
+
+    assert server.messages() == ["a", "b"]
+
+
+async def test_outage_spools_then_replays_in_order(tmp_path):
+    server = _FakeServer()
+    server.up = False
+    reporter = _reporter(tmp_path, server, batch_size=2, flush_interval_s=0.01)
+
+    for i in range(5):
+        reporter.notification("sess", f"m{i}")
+    await reporter.flush()
+
+    assert reporter.spool_path.exists()
+    assert reporter.stats()["spooled"] == 5
+    assert server.messages() == []
+
+    # Server comes back; the next delivery replays the spool after it
+    server.up = True
+    reporter._retry_at = 0.0
+    reporter.notification("sess", "m5")
+    await reporter.aclose()
+
+    assert server.messages() == ["m5", "m0", "m1", "m2", "m3", "m4"]
+    assert reporter.stats()["replayed"] == 5
+    assert not reporter.spool_path.exists()
+
+
+async def test_full_queue_spills_to_disk(tmp_path):
+    server = _FakeServer()
+    reporter = _reporter(tmp_path, server, max_pending=2, flush_interval_s=0.01)
+
+    for i in range(5):
+        assert reporter.notification("sess", f"m{i}") is True
+    await reporter.flush()
+    assert reporter.stats()["spooled"] == 3
+    await reporter.aclose()
+
+    # Spooled overflow is replayed after the first live batch
+    assert sorted(server.messages()) == [f"m{i}" for i in range(5)]
+
+
+async def test_failed_spill_is_not_counted_as_spooled(tmp_path):
+    server = _FakeServer()
+    reporter = _reporter(tmp_path, server, max_pending=1, flush_interval_s=0.01)
+    (tmp_path / "blocker").write_text("")
+    reporter.spool_path = tmp_path / "blocker" / "spool.jsonl"  # Appends now fail
+
+    for i in range(3):
+        reporter.notification("sess", f"m{i}")
+    await reporter.flush()
+
+    assert reporter.stats()["spooled"] == 0
+    assert reporter._spool_pending is False
+    await reporter.aclose()
+
+
+def test_without_event_loop_events_are_spooled(tmp_path):
+    reporter = _reporter(tmp_path, _FakeServer())
+
+    assert reporter.notification("sess", "offline") is True
+    lines = reporter.spool_path.read_text().splitlines()
+    assert json.loads(lines[0])["payload"]["message"] == "offline"
+    asyncio.run(reporter._async_client.aclose())
+
+
+async def test_rejected_batch_is_quarantined_not_spooled(tmp_path):
+    class _Validating(_FakeServer):
+        def __call__(self, request):
+            body = json.loads(request.content)
+            events = body if isinstance(body, list) else [body]
+            if any(e["payload"]["message"] == "bad" for e in events):
+                return httpx.Response(422)
+            return super().__call__(request)
+
+    server = _Validating()
+    reporter = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    for message in ("a", "bad", "b"):
+        reporter.notification("sess", message)
+    await reporter.flush()
+    reporter.notification("sess", "c")
+    await reporter.aclose()
+
+    assert sorted(server.messages()) == ["a", "b", "c"]
+    assert reporter.stats()["rejected"] == 1
+    assert reporter.stats()["spooled"] == 0
+    assert not reporter.spool_path.exists()
+    rejected = reporter.rejected_path.read_text().splitlines()
+    assert [json.loads(line)["payload"]["message"] for line in rejected] == ["bad"]
+
+
+async def test_partial_fallback_spools_only_unsent_tail(tmp_path):
+    class _Overloaded(_FakeServer):
+        """Rejects batches holding "b" as a whole and answers 503 once to "b"."""
+
+        def __call__(self, request):
+            body = json.loads(request.content)
+            events = body if isinstance(body, list) else [body]
+            if len(events) > 1 and any(e["payload"]["message"] == "b" for e in events):
+                return httpx.Response(422)
+            if events[0]["payload"]["message"] == "b" and not self.overloaded_once:
+                self.overloaded_once = True
+                return httpx.Response(503)
+            return super().__call__(request)
+
+    server = _Overloaded()
+    server.overloaded_once = False
+    reporter = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    for message in ("a", "b", "c"):
+        reporter.notification("sess", message)
+    await reporter.flush()
+
+    spooled = reporter.spool_path.read_text().splitlines()
+    assert [json.loads(line)["payload"]["message"] for line in spooled] == ["b", "c"]
+    assert reporter.stats()["sent"] == 1
+
+    reporter._retry_at = 0.0
+    reporter.notification("sess", "d")
+    await reporter.aclose()
+
+    # Replay resumes at "b": nothing is delivered twice
+    assert [e["payload"]["message"] for e in server.singles] == ["a", "b", "c"]
+    assert [e["payload"]["message"] for batch in server.batches for e in batch] == ["d"]
+    assert reporter.stats()["replayed"] == 2
+
+
+async def test_server_errors_are_spooled_for_retry(tmp_path):
+    server = _FakeServer(batch_status=503)
+    reporter = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    reporter.notification("sess", "a")
+    await reporter.flush()
+    assert reporter.stats()["spooled"] == 1
+    assert reporter.stats()["rejected"] == 0
+    await reporter.aclose()
+
+
+async def test_idle_sender_replays_spool_once_server_is_back(tmp_path):
+    server = _FakeServer()
+    server.up = False
+    reporter = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    reporter.notification("sess", "m0")
+    reporter.notification("sess", "m1")
+    await reporter.flush()
+    assert reporter.stats()["spooled"] == 2
+
+    # No new events: the sender probes on its own once the backoff expires
+    server.up = True
+    reporter._retry_at = 0.0
+    for _ in range(100):
+        if reporter.stats()["replayed"] == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    assert server.messages() == ["m0", "m1"]
+    assert not reporter.spool_path.exists() and not reporter.replay_path.exists()
+    await reporter.aclose()
+
+
+async def test_runtime_shutdown_flushes_observability(tmp_path):
+    sys.path.insert(0, str(project_root / "scripts"))
+    from kinetic_runtime import KineticRuntime
+
+    server = _FakeServer()
+    runtime = KineticRuntime.__new__(KineticRuntime)  # Kinetic tier not needed here
+    runtime._realtime = None
+    runtime._obs = _reporter(tmp_path, server, flush_interval_s=0.01)
+
+    async with runtime:
+        runtime._obs.notification("sess", "pending at shutdown")
+
+    assert server.messages() == ["pending at shutdown"]
@@ -0,0 +1,86 @@
+"""
+Test: FastJSONFormatter
+
+Verifies that the fast-path formatter produces the same fields, values and
+key order as JSONFormatter, and that cached timestamp prefixes roll over.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import json
+import logging
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure import logging_service
+from infrastructure.logging_service import FastJSONFormatter, JSONFormatter, trace_id_var
+
+
+def _record(msg="Tool call: %s", args=("Read",), **extras):
+    record = logging.LogRecord(
+        name="math_agents", level=logging.INFO, pathname=__file__, lineno=7,
+        msg=msg, args=args, exc_info=None, func="run_wave"
+    )
+    for key, value in extras.items():
+        setattr(record, key, value)
+    return record
+
+
+def _without_timestamp(text):
+    data = json.loads(text)
+    data.pop("timestamp")
+    return data
+
+
+def test_matches_json_formatter_fields_and_order():
+    records = [
+        _record(),
+        _record("한국어 ✅ %s", ("ok",), agent_name="solver", duration_ms=1.5,
+                event_type="tool_call", metadata={"tool": "Read", "n": [1, None]}),
+        _record(agent_name=None),
+    ]
+    token = trace_id_var.set("trace-1")
+    try:
+        for record in records:
+            fast = _without_timestamp(FastJSONFormatter().format(record))
+            slow = _without_timestamp(JSONFormatter().format(record))
+            assert fast == slow
+            assert list(fast) == list(slow)
+    finally:
+        trace_id_var.reset(token)
+
+    # Non-ASCII stays unescaped, like ensure_ascii=False
+    assert "한국어 ✅ ok" in FastJSONFormatter().format(records[1])
+
+
+def test_exception_info_is_included():
+    try:
+        raise ValueError("bad input")
+    except ValueError:
+        record = logging.LogRecord("m", logging.ERROR, __file__, 1, "failed", (), sys.exc_info(), func="f")
+    data = json.loads(FastJSONFormatter().format(record))
+    assert "ValueError: bad input" in data["exc_info"]
+
+
+def test_timestamp_uses_record_time_and_cached_second():
+    formatter = FastJSONFormatter()
+    record = _record()
+    record.created = 1760608800.25  # 2025-10-16T10:00:00.25Z
+    assert json.loads(formatter.format(record))["timestamp"] == "2025-10-16T10:00:00.250000Z"
+
+    record.created = 1760608800.5
+    assert json.loads(formatter.format(record))["timestamp"] == "2025-10-16T10:00:00.500000Z"
+
+    record.created = 1760608801.0
+    assert json.loads(formatter.format(record))["timestamp"] == "2025-10-16T10:00:01.000000Z"
+
+
+def test_json_fallback_without_orjson(monkeypatch):
+    monkeypatch.setattr(logging_service, "orjson", None)
+    record = _record(metadata={1: "int key", "big": 2 ** 70})
+    fast = _without_timestamp(FastJSONFormatter().format(record))
+    assert fast == _without_timestamp(JSONFormatter().format(record))
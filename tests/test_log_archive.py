@@ -0,0 +1,119 @@
+"""
+Test: Columnar Log Archive
+
+Verifies that closed daily JSONL logs compact into columnar archives that
+round-trip, and that latency/error aggregations match the raw logs whether
+a day is archived or still JSONL.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import json
+import math
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.log_archive_service import (
+    DictColumn,
+    agent_errors,
+    agent_latency,
+    compact_logs,
+    load_tables,
+    read_archive,
+)
+
+
+def _write_day(log_dir: Path, day: str, entries, segment: str = ""):
+    path = log_dir / f"agent-{day.replace('-', '')}{segment}.jsonl"
+    with open(path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return path
+
+
+def _complete(day: str, agent: str, duration: float, success: bool = True):
+    return {
+        "timestamp": f"{day}T10:00:00", "trace_id": "t", "event_type": "agent_complete",
+        "agent_name": agent, "level": "INFO" if success else "ERROR",
+        "message": f"Agent done: {agent}", "duration_ms": duration,
+        "metadata": {"success": success},
+    }
+
+
+def _error(day: str, agent: str, error_type: str):
+    return {
+        "timestamp": f"{day}T10:00:01", "trace_id": "t", "event_type": "error",
+        "agent_name": agent, "level": "ERROR", "message": "boom",
+        "metadata": {"error_type": error_type},
+    }
+
+
+def test_compact_round_trips_closed_days_only(tmp_path):
+    _write_day(tmp_path, "2025-10-14", [_complete("2025-10-14", "solver", 100.0)])
+    _write_day(tmp_path, "2025-10-14", [_error("2025-10-14", "ocr", "Timeout")], segment="-1")
+    _write_day(tmp_path, "2025-10-16", [_complete("2025-10-16", "solver", 5.0)])
+
+    written = compact_logs(str(tmp_path), delete=True, today=date(2025, 10, 16))
+
+    assert [p.name for p in written] == ["agent-20251014.mlc"]
+    assert not list(tmp_path.glob("agent-20251014*.jsonl"))
+    assert (tmp_path / "agent-20251016.jsonl").exists()
+
+    table = read_archive(written[0])
+    assert isinstance(table["agent_name"], DictColumn)
+    assert [table["agent_name"].values[c] for c in table["agent_name"].codes] == ["solver", "ocr"]
+    assert table["duration_ms"][0] == 100.0 and math.isnan(table["duration_ms"][1])
+    assert list(table["success"]) == [1, -1]
+    assert json.loads(table["metadata"][1]) == {"error_type": "Timeout"}
+
+    # Projection only decodes the requested columns
+    assert set(read_archive(written[0], ["duration_ms"])) == {"duration_ms"}
+
+    # Re-running skips days that are already archived
+    assert compact_logs(str(tmp_path), today=date(2025, 10, 16)) == []
+
+
+def test_aggregations_span_archived_and_live_days(tmp_path):
+    _write_day(tmp_path, "2025-10-14", [_complete("2025-10-14", "solver", float(d)) for d in range(1, 101)])
+    _write_day(tmp_path, "2025-10-15", [
+        _complete("2025-10-15", "ocr", 500.0, success=False),
+        _error("2025-10-15", "ocr", "Timeout"),
+        _error("2025-10-15", "ocr", "Timeout"),
+        _error("2025-10-15", "solver", "ValueError"),
+    ])
+    compact_logs(str(tmp_path), today=date(2025, 10, 15))  # archives only 10-14
+
+    tables = load_tables(str(tmp_path))
+    assert len(tables) == 2
+
+    latency = {row["agent_name"]: row for row in agent_latency(tables)}
+    assert latency["solver"]["count"] == 100
+    assert latency["solver"]["p50_ms"] == 50.5
+    assert latency["solver"]["max_ms"] == 100.0
+    assert latency["ocr"]["p95_ms"] == 500.0
+
+    errors = {row["agent_name"]: row for row in agent_errors(tables)}
+    assert errors["ocr"]["errors"] == 3
+    assert errors["ocr"]["by_type"] == {"unknown": 1, "Timeout": 2}
+    assert errors["solver"]["errors"] == 1
+    assert errors["solver"]["events"] == 101
+
+    only_live = load_tables(str(tmp_path), since="2025-10-15")
+    assert {row["agent_name"] for row in agent_latency(only_live)} == {"ocr"}
+
+
+def test_cli_latency_json(tmp_path):
+    _write_day(tmp_path, "2025-10-14", [_complete("2025-10-14", "solver", 42.0)])
+    result = subprocess.run(
+        [sys.executable, str(project_root / "scripts" / "log_archive_script.py"),
+         "--log-dir", str(tmp_path), "latency", "--json"],
+        capture_output=True, text=True, check=True,
+    )
+    rows = json.loads(result.stdout)
+    assert rows[0]["agent_name"] == "solver" and rows[0]["max_ms"] == 42.0
@@ -0,0 +1,97 @@
+"""
+Test: SQLite Memory-Keeper Stand-In
+
+Verifies the local memory_tool_func: upserts by key, filtered newest-first
+gets, ranked FTS search, real deletion, and end-to-end use by
+ContextManager including retention cleanup.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.context_service import ContextManager
+from infrastructure.memory_store_service import SQLiteMemoryKeeper
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self):
+        self.now += 1
+        return self.now
+
+
+def _store(tmp_path):
+    return SQLiteMemoryKeeper(str(tmp_path / "context.db"), clock=_Clock())
+
+
+def test_save_get_filters_and_upsert(tmp_path):
+    store = _store(tmp_path)
+    store("mcp__memory-keeper__context_save", key="a", value="first", category="tasks", priority="high")
+    store("context_save", key="b", value="second", category="tasks", priority="low", channel="wave-1")
+    store("context_batch_save", items=[
+        {"key": "c", "value": "third", "category": "debug", "tags": ["ocr"]},
+        {"key": "a", "value": "first v2", "category": "tasks", "priority": "high"},
+    ])
+
+    assert [i["key"] for i in store("context_get", category="tasks")["items"]] == ["b", "a"]
+    assert [i["key"] for i in store("context_get", priorities=["high"])["items"]] == ["a"]
+    assert [i["key"] for i in store("context_get", channel="wave-1")["items"]] == ["b"]
+    item = store("context_get", key="a", limit=1)["items"][0]
+    assert item["value"] == "first v2"
+    assert item["created_at"] < item["updated_at"]
+    assert store("context_get", key="c")["items"][0]["tags"] == ["ocr"]
+    assert store.count() == 3
+
+    with pytest.raises(ValueError):
+        store("context_checkpoint")
+
+
+def test_fts_search_and_delete(tmp_path):
+    store = _store(tmp_path)
+    store("context_save", key="ocr-1", value="OCR failed on quadratic image", category="errors")
+    store("context_save", key="gen-1", value="generated quadratic scaffolding", category="progress")
+    store("context_save", key="gen-2", value="generated linear scaffolding", category="progress")
+
+    assert {i["key"] for i in store("context_search", query="quadratic")["items"]} == {"ocr-1", "gen-1"}
+    assert [i["key"] for i in store("context_search", query="quadratic", category="progress")["items"]] == ["gen-1"]
+    assert [i["key"] for i in store("context_search", query='OCR "failed')["items"]] == ["ocr-1"]  # Invalid FTS5
+
+    assert store("context_delete", key="gen-1")["deleted"] == 1
+    assert store("context_delete", key="gen-1")["deleted"] == 0
+    assert store("context_search", query="quadratic")["items"][0]["key"] == "ocr-1"
+    assert store.count("progress") == 1
+
+
+def test_blank_search_returns_nothing(tmp_path):
+    store = _store(tmp_path)
+    store("context_save", key="a", value="anything", category="tasks")
+
+    for query in ("", "   ", "\t\n"):
+        assert store("context_search", query=query) == {"items": []}
+
+
+def test_context_manager_end_to_end_with_retention(tmp_path):
+    store = _store(tmp_path)
+    context = ContextManager(store, batch_size=10)
+
+    context.save_session_state({"step": 3})
+    assert context.get_session_state() == {"step": 3}
+
+    for i in range(79):  # debug keeps at most 50; cleanup runs every 10th save
+        context.save(f"dbg-{i}", {"i": i}, "debug")
+    context.flush()
+
+    assert store.count("debug") == 50
+    assert context.search("dbg", category="debug", limit=100) != []
+    assert context.get(key="dbg-0") == []
+    assert context.get(key="dbg-78")[0]["value"] == '{"i": 78}'
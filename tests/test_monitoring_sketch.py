@@ -0,0 +1,78 @@
+"""
+Test: Streaming Duration Sketch in PerformanceMonitor
+
+Verifies that percentiles stay within the sketch's relative accuracy,
+that memory stays bounded, and that per-process monitors merge.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import json
+import random
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.monitoring_service import DurationSketch, PerformanceMonitor
+
+
+def _exact(values, q):
+    ordered = sorted(values)
+    return ordered[round(q * (len(ordered) - 1))]
+
+
+def test_quantiles_within_relative_accuracy():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(5, 1.2) for _ in range(20_000)]
+    sketch = DurationSketch()
+    for v in values:
+        sketch.add(v)
+
+    for q in (0.5, 0.9, 0.95, 0.99):
+        assert abs(sketch.quantile(q) - _exact(values, q)) <= 0.02 * _exact(values, q)
+    assert sketch.quantile(0.0) == min(values)
+    assert sketch.quantile(1.0) == max(values)
+    assert DurationSketch().quantile(0.95) == 0.0
+
+
+def test_memory_is_bounded():
+    sketch = DurationSketch(max_bins=64)
+    for i in range(1, 100_000):
+        sketch.add(float(i))
+    assert len(sketch.bins) <= 64
+    assert sketch.count == 99_999
+    # High quantiles are unaffected by collapsing the lowest bins
+    assert abs(sketch.quantile(0.99) - 99_000) <= 0.02 * 99_000
+
+
+def test_monitor_uses_sketch_and_merges_workers():
+    workers = [PerformanceMonitor() for _ in range(3)]
+    all_values = []
+    for w, monitor in enumerate(workers):
+        for i in range(1000):
+            duration = 10.0 + w * 100 + i % 50
+            all_values.append(duration)
+            monitor.record_execution("solver", duration, success=i % 10 != 0)
+
+    # State travels as JSON between processes
+    combined = PerformanceMonitor()
+    for monitor in workers:
+        combined.merge_state(json.loads(json.dumps(monitor.export_state())))
+
+    metrics = combined.get_metrics("solver")
+    assert metrics.execution_count == 3000
+    assert metrics.failure_count == 300
+    assert abs(metrics.avg_duration_ms - sum(all_values) / 3000) < 1e-6
+    assert abs(metrics.p95_duration_ms - _exact(all_values, 0.95)) <= 0.02 * _exact(all_values, 0.95)
+    assert metrics.to_dict()["p99_duration_ms"]
+
+
+def test_merge_rejects_mismatched_accuracy():
+    try:
+        DurationSketch(0.01).merge(DurationSketch(0.05))
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError")
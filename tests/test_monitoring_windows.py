@@ -0,0 +1,76 @@
+"""
+Test: Sliding-window Metrics and Regression Detection
+
+Verifies that window stats only cover recent buckets and that regression
+detection compares the current window against an earlier baseline.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure.monitoring_service import PerformanceMonitor
+
+
+class _Clock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _run(monitor, clock, seconds, per_second, duration_ms, fail_every=0):
+    for _ in range(seconds):
+        for i in range(per_second):
+            success = not (fail_every and i % fail_every == 0)
+            monitor.record_execution("solver", duration_ms, success)
+        clock.now += 1
+
+
+def test_windows_expire_old_buckets():
+    clock = _Clock()
+    monitor = PerformanceMonitor(clock=clock)
+    _run(monitor, clock, seconds=120, per_second=1, duration_ms=100.0)
+
+    assert 55 <= monitor.get_window_stats("solver", "1m").count <= 65
+    assert monitor.get_window_stats("solver", "5m").count == 120
+    assert monitor.get_window_stats("solver", "1h").count == 120
+
+    clock.now += 600
+    assert monitor.get_window_stats("solver", "1m").count == 0
+    assert monitor.get_window_stats("solver", "5m").count == 0
+    assert monitor.get_window_stats("solver", "1h").count == 120
+    assert monitor.get_window_stats("unknown") is None
+
+
+def test_fresh_slowdown_detected_despite_long_history():
+    clock = _Clock()
+    monitor = PerformanceMonitor(clock=clock)
+    _run(monitor, clock, seconds=3000, per_second=2, duration_ms=100.0)
+    assert not monitor.detect_window_regression("solver")
+
+    _run(monitor, clock, seconds=300, per_second=2, duration_ms=180.0)
+
+    # Lifetime average barely moves, the 5m window does
+    assert monitor.get_metrics("solver").avg_duration_ms < 110
+    assert not monitor.detect_performance_regression("solver", 100.0, window=None)
+    assert monitor.detect_performance_regression("solver", 100.0)
+    assert monitor.detect_window_regression("solver", current="5m", baseline="1h")
+
+
+def test_error_rate_regression():
+    clock = _Clock()
+    monitor = PerformanceMonitor(clock=clock)
+    _run(monitor, clock, seconds=1800, per_second=1, duration_ms=100.0)
+    _run(monitor, clock, seconds=60, per_second=4, duration_ms=100.0, fail_every=2)
+
+    recent = monitor.get_window_stats("solver", "1m")
+    assert recent.error_rate > 40
+    assert monitor.detect_window_regression("solver", current="1m", baseline="1h")
+    assert "windows" in monitor.to_dict()
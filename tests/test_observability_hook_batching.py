@@ -0,0 +1,113 @@
+"""
+Test: Non-blocking Batched Observability Emitter
+
+Verifies that send_hook_event never waits on the network, that queued
+events are delivered in batches, and that a full queue drops instead of
+blocking.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from tools import observability_hook
+from tools.observability_hook import _BatchingEmitter
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int):
+        self.status_code = status_code
+
+
+class _FakeSession:
+    """Records POSTs; optionally blocks until released."""
+
+    def __init__(self, batch_status: int = 200, gate: threading.Event = None):
+        self.batch_status = batch_status
+        self.gate = gate
+        self.batches = []
+        self.singles = []
+
+    def post(self, url, json=None, timeout=None):
+        if self.gate is not None:
+            self.gate.wait(timeout=5)
+        if url.endswith("/batch"):
+            if self.batch_status == 200:
+                self.batches.append(json)
+            return _FakeResponse(self.batch_status)
+        self.singles.append(json)
+        return _FakeResponse(200)
+
+
+def _make_emitter(session: _FakeSession, **kwargs) -> _BatchingEmitter:
+    emitter = _BatchingEmitter(**kwargs)
+    emitter._session = session
+    return emitter
+
+
+def test_events_delivered_in_batches():
+    session = _FakeSession()
+    emitter = _make_emitter(session, batch_size=10, flush_interval_s=0.05)
+
+    for i in range(25):
+        assert emitter.enqueue({"n": i})
+
+    assert emitter.flush(timeout=2)
+    delivered = [event["n"] for batch in session.batches for event in batch]
+    assert delivered == list(range(25))
+    assert all(len(batch) <= 10 for batch in session.batches)
+    assert emitter.stats()["sent"] == 25
+
+
+def test_falls_back_to_single_posts_without_batch_endpoint():
+    session = _FakeSession(batch_status=404)
+    emitter = _make_emitter(session, batch_size=5, flush_interval_s=0.05)
+
+    for i in range(7):
+        emitter.enqueue({"n": i})
+
+    assert emitter.flush(timeout=2)
+    assert [event["n"] for event in session.singles] == list(range(7))
+    assert emitter._batch_supported is False
+
+
+def test_full_queue_drops_without_blocking():
+    gate = threading.Event()
+    session = _FakeSession(gate=gate)
+    emitter = _make_emitter(session, maxsize=5, batch_size=1, flush_interval_s=0.01)
+
+    start = time.monotonic()
+    results = [emitter.enqueue({"n": i}) for i in range(50)]
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.5
+    assert results.count(False) > 0
+    assert emitter.stats()["dropped"] == results.count(False)
+
+    gate.set()
+    assert emitter.flush(timeout=2)
+
+
+def test_send_hook_event_does_not_block_on_network(monkeypatch):
+    gate = threading.Event()
+    session = _FakeSession(gate=gate)
+    emitter = _make_emitter(session, flush_interval_s=0.01)
+    monkeypatch.setattr(observability_hook, "_emitter", emitter)
+
+    start = time.monotonic()
+    for i in range(20):
+        assert observability_hook.send_hook_event("test", "test_event", {"n": i})
+    assert time.monotonic() - start < 0.5
+
+    gate.set()
+    assert observability_hook.flush_events(timeout=2)
+    delivered = [event for batch in session.batches for event in batch]
+    assert len(delivered) == 20
+    assert delivered[0]["session_id"] == observability_hook.get_session_id()
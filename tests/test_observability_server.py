@@ -0,0 +1,519 @@
+"""
+Test: Observability Server API
+
+Exercises the FastAPI app in observability-server/server.py in-process
+against a temporary SQLite database.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import asyncio
+import gzip
+import importlib.util
+import json
+import sqlite3
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+project_root = Path(__file__).parent.parent
+SERVER_PATH = project_root / "observability-server" / "server.py"
+
+
+def _event(n: int, event_type: str = "test_event", session_id: str = "sess-1") -> dict:
+    return {
+        "source_app": "test",
+        "session_id": session_id,
+        "hook_event_type": event_type,
+        "payload": {"n": n},
+    }
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Load a fresh copy of the server module bound to a temp database."""
+    spec = importlib.util.spec_from_file_location("obs_server_under_test", SERVER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "DB_PATH", tmp_path / "events.db")
+    return module
+
+
+@pytest.fixture
+def client(server):
+    with TestClient(server.app) as test_client:
+        yield test_client
+
+
+def test_single_event_ingest(client):
+    response = client.post("/events", json=_event(1))
+    assert response.status_code == 200
+    assert response.json()["id"] == 1
+
+    events = client.get("/events/recent").json()["events"]
+    assert [e["payload"]["n"] for e in events] == [1]
+
+
+def test_batch_ingest_assigns_contiguous_ids(client):
+    client.post("/events", json=_event(0))
+
+    response = client.post("/events/batch", json=[_event(i) for i in range(1, 6)])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 5
+    assert body["ids"] == [2, 3, 4, 5, 6]
+
+    events = client.get("/events/recent", params={"limit": 10}).json()["events"]
+    assert sorted(e["payload"]["n"] for e in events) == [0, 1, 2, 3, 4, 5]
+
+
+def test_batch_ingest_broadcasts_one_frame(client):
+    with client.websocket_connect("/stream") as ws:
+        assert ws.receive_json()["type"] == "initial"
+
+        client.post("/events/batch", json=[_event(i) for i in range(3)])
+
+        frame = ws.receive_json()
+        assert frame["type"] == "batch"
+        assert [e["payload"]["n"] for e in frame["data"]] == [0, 1, 2]
+
+
+def test_batch_rejects_oversized_and_accepts_empty(client, server):
+    too_many = [_event(i) for i in range(server.MAX_BATCH_SIZE + 1)]
+    assert client.post("/events/batch", json=too_many).status_code == 413
+
+    response = client.post("/events/batch", json=[])
+    assert response.status_code == 200
+    assert response.json()["count"] == 0
+
+
+def test_database_uses_wal_and_concurrent_writes_get_unique_ids(client, server):
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        responses = list(pool.map(lambda i: client.post("/events", json=_event(i)), range(40)))
+
+    ids = [r.json()["id"] for r in responses]
+    assert len(set(ids)) == 40
+
+    conn = sqlite3.connect(server.DB_PATH)
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 40
+    conn.close()
+
+
+class _StalledSocket:
+    """WebSocket stand-in whose sends block until released."""
+
+    def __init__(self):
+        self.sent = []
+        self.release = asyncio.Event()
+
+    async def send_text(self, message):
+        await self.release.wait()
+        self.sent.append(message)
+
+
+async def test_slow_client_drops_oldest_without_blocking(server):
+    socket = _StalledSocket()
+    channel = server.ClientChannel(socket, maxsize=3)
+    server.websocket_clients[socket] = channel
+    channel.start()
+    try:
+        server.broadcast("0")
+        await asyncio.sleep(0)  # sender picks up the first frame and stalls
+        for i in range(1, 10):
+            server.broadcast(str(i))
+
+        # First frame is in flight; the queue kept only the newest three
+        assert channel.dropped == 6
+        socket.release.set()
+        while channel.queue.qsize():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.01)
+        assert socket.sent == ["0", "7", "8", "9"]
+    finally:
+        server.websocket_clients.pop(socket, None)
+        await channel.close()
+
+
+def test_keyset_pagination_walks_all_events(client):
+    client.post("/events/batch", json=[_event(i) for i in range(25)])
+
+    seen = []
+    params = {"limit": 10}
+    while True:
+        page = client.get("/events/recent", params=params).json()
+        seen.extend(e["payload"]["n"] for e in page["events"])
+        if page["next_before_id"] is None:
+            break
+        params = {"limit": 10, "before_id": page["next_before_id"]}
+
+    assert seen == list(range(24, -1, -1))
+
+
+def test_since_id_returns_only_new_events(client):
+    client.post("/events/batch", json=[_event(i) for i in range(5)])
+    first = client.get("/events/recent", params={"since_id": 0}).json()
+    assert [e["payload"]["n"] for e in first["events"]] == [0, 1, 2, 3, 4]
+
+    cursor = first["next_since_id"]
+    empty = client.get("/events/recent", params={"since_id": cursor}).json()
+    assert empty["count"] == 0
+    assert empty["next_since_id"] == cursor
+
+    client.post("/events", json=_event(5))
+    new = client.get("/events/recent", params={"since_id": cursor}).json()
+    assert [e["payload"]["n"] for e in new["events"]] == [5]
+
+
+def test_after_id_and_time_filters(client):
+    client.post("/events/batch", json=[_event(i) for i in range(6)])
+
+    page = client.get("/events/recent", params={"after_id": 2, "limit": 2}).json()
+    assert [e["id"] for e in page["events"]] == [4, 3]
+
+    ts = page["events"][0]["ts_ms"]
+    assert isinstance(ts, int)
+    assert client.get("/events/recent", params={"end_ms": ts - 60_000}).json()["count"] == 0
+    assert client.get("/events/recent", params={"start_ms": ts - 60_000}).json()["count"] == 6
+
+    assert client.get("/events/recent", params={"after_id": 1, "before_id": 3}).status_code == 400
+
+
+def test_legacy_database_is_migrated(server, tmp_path):
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.execute("""
+        CREATE TABLE events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+            source_app TEXT NOT NULL, session_id TEXT NOT NULL,
+            hook_event_type TEXT NOT NULL, payload TEXT NOT NULL, chat TEXT,
+            summary TEXT, session_name TEXT, session_context TEXT
+        )
+    """)
+    conn.execute(
+        "INSERT INTO events (timestamp, source_app, session_id, hook_event_type, payload) "
+        "VALUES ('2025-10-16T21:15:36.527333', 'test', 's', 'e', '{}')"
+    )
+    conn.commit()
+    conn.close()
+
+    server.init_db()
+
+    conn = sqlite3.connect(server.DB_PATH)
+    ts_ms = conn.execute("SELECT ts_ms FROM events").fetchone()[0]
+    conn.close()
+    expected = int(datetime(2025, 10, 16, 21, 15, 36, 527333).timestamp() * 1000)
+    assert abs(ts_ms - expected) <= 1
+
+
+def _task_event(agent: str, session_id: str = "sess-1") -> dict:
+    return {
+        "source_app": "test",
+        "session_id": session_id,
+        "hook_event_type": "PreToolUse",
+        "payload": {"tool_name": "Task", "tool_input": {"subagent_type": agent}},
+    }
+
+
+def test_rollups_track_sessions_hooks_agents_and_tokens(client):
+    client.post("/events/batch", json=[
+        _task_event("research-agent"),
+        _task_event("research-agent"),
+        _task_event("quality-agent", session_id="sess-2"),
+        {**_event(0), "payload": {"usage": {"input_tokens": 100, "output_tokens": 20}}},
+    ])
+    client.post("/events", json={**_event(1, session_id="sess-2"), "session_name": "Quadratic - 10:00:00"})
+
+    sessions = {s["session_id"]: s for s in client.get("/events/sessions").json()["sessions"]}
+    assert sessions["sess-1"]["event_count"] == 3
+    assert sessions["sess-2"]["event_count"] == 2
+    assert sessions["sess-2"]["session_name"] == "Quadratic - 10:00:00"
+
+    hooks = client.get("/stats/hooks").json()["hook_calls"]
+    assert hooks == {"PreToolUse": 3, "test_event": 2}
+
+    agents = client.get("/stats/agents").json()
+    assert agents["task_calls"] == {"research-agent": 2, "quality-agent": 1}
+
+    tokens = client.get("/stats/tokens").json()
+    assert tokens == {"total_tokens": 120, "input_tokens": 100, "output_tokens": 20}
+
+    timeline = client.get("/stats/timeline", params={"by": "hook_event_type"}).json()["buckets"]
+    assert sum(b["count"] for b in timeline) == 5
+
+
+def test_task_calls_count_only_task_tool_uses(server, client):
+    client.post("/events/batch", json=[
+        _task_event("research-agent"),
+        {**_event(0, event_type="PreToolUse"),
+         "payload": {"tool_name": "Read", "agent_name": "research-agent"}},
+    ])
+
+    agents = client.get("/stats/agents").json()
+    assert agents["agent_calls"] == {"research-agent": 2}
+    assert agents["task_calls"] == {"research-agent": 1}
+
+    # Same answer from rollups rebuilt out of the raw events
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.execute("DELETE FROM session_rollup")
+    conn.execute("DELETE FROM minute_rollup")
+    conn.commit()
+    conn.close()
+    server.init_db()
+    assert client.get("/stats/agents").json() == agents
+
+
+def test_rollups_rebuilt_for_existing_events(server, client):
+    client.post("/events/batch", json=[_task_event("research-agent"), _event(0)])
+    expected_hooks = client.get("/stats/hooks").json()
+    expected_agents = client.get("/stats/agents").json()
+
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.execute("DELETE FROM session_rollup")
+    conn.execute("DELETE FROM minute_rollup")
+    conn.commit()
+    conn.close()
+    server.init_db()
+
+    assert client.get("/stats/hooks").json() == expected_hooks
+    assert client.get("/stats/agents").json() == expected_agents
+    assert client.get("/events/sessions").json()["sessions"][0]["event_count"] == 2
+
+
+def test_retention_archives_expired_events_and_keeps_rollups(client, server, monkeypatch):
+    monkeypatch.setattr(server, "RETENTION_DEFAULT_DAYS", 30)
+    monkeypatch.setattr(server, "RETENTION_TTL_DAYS", {"chatty": 1, "forever": -1})
+
+    client.post("/events/batch", json=[
+        _event(0), _event(1, event_type="chatty"), _event(2, event_type="forever")
+    ])
+    _, now_ms = server.now_stamps()
+
+    # Two days later only the chatty event has expired
+    result = client.portal.call(server.run_retention, now_ms + 2 * server.DAY_MS)
+    assert result["expired"] == 1
+    remaining = client.get("/events/recent").json()["events"]
+    assert sorted(e["hook_event_type"] for e in remaining) == ["forever", "test_event"]
+
+    # Sixty days later the default TTL applies; "forever" is kept
+    result = client.portal.call(server.run_retention, now_ms + 60 * server.DAY_MS)
+    assert result["expired"] == 1
+    remaining = client.get("/events/recent").json()["events"]
+    assert [e["hook_event_type"] for e in remaining] == ["forever"]
+
+    archived = []
+    for segment in (server.DB_PATH.parent / "archive").glob("events-*.jsonl.gz"):
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            archived.extend(json.loads(line) for line in f)
+    assert sorted(e["payload"]["n"] for e in archived) == [0, 1]
+
+    # Rollups still describe the expired events
+    hooks = client.get("/stats/hooks").json()["hook_calls"]
+    assert hooks == {"test_event": 1, "chatty": 1, "forever": 1}
+
+
+def test_retention_archives_once_when_group_commit_reruns_job(client, server, monkeypatch):
+    monkeypatch.setattr(server, "RETENTION_TTL_DAYS", {"chatty": 1})
+    client.post("/events/batch", json=[_event(0, event_type="chatty"), _event(1)])
+    _, now_ms = server.now_stamps()
+
+    def broken_job(conn):
+        raise sqlite3.OperationalError("disk I/O error")
+
+    async def retention_alongside_failing_write():
+        # Queued together: the group rolls back, then each job is re-run alone
+        results = await asyncio.gather(
+            server.run_retention(now_ms + 2 * server.DAY_MS),
+            server.store.write(broken_job),
+            return_exceptions=True,
+        )
+        return results[0]
+
+    result = client.portal.call(retention_alongside_failing_write)
+    assert result["expired"] == 1
+
+    archived = []
+    for segment in (server.DB_PATH.parent / "archive").glob("events-*.jsonl.gz"):
+        with gzip.open(segment, "rt", encoding="utf-8") as f:
+            archived.extend(json.loads(line) for line in f)
+    assert [e["payload"]["n"] for e in archived] == [0]
+
+
+def test_retention_keeps_events_when_archive_write_fails(client, server, monkeypatch):
+    monkeypatch.setattr(server, "RETENTION_CHUNK_SIZE", 1)
+    client.post("/events/batch", json=[_event(0), _event(1)])
+    _, now_ms = server.now_stamps()
+
+    def failing_archive(archive_dir, rows):
+        raise OSError("No space left on device")
+
+    archive_events = server.archive_events
+    monkeypatch.setattr(server, "archive_events", failing_archive)
+    with pytest.raises(OSError):
+        client.portal.call(server.run_retention, now_ms + 60 * server.DAY_MS)
+    assert client.get("/events/recent").json()["count"] == 2
+
+    # A retry once the archive is writable expires everything exactly once
+    monkeypatch.setattr(server, "archive_events", archive_events)
+    result = client.portal.call(server.run_retention, now_ms + 60 * server.DAY_MS)
+    assert result["expired"] == 2
+    assert client.get("/events/recent").json()["count"] == 0
+
+
+def test_recent_events_limit_is_clamped(client, server, monkeypatch):
+    monkeypatch.setattr(server, "MAX_PAGE_SIZE", 3)
+    client.post("/events/batch", json=[_event(i) for i in range(5)])
+
+    assert client.get("/events/recent", params={"limit": -1}).json()["count"] == 1
+    assert client.get("/events/recent", params={"limit": 100}).json()["count"] == 3
+
+
+def test_search_limit_is_clamped(client, server, monkeypatch):
+    monkeypatch.setattr(server, "MAX_PAGE_SIZE", 3)
+    client.post("/events/batch", json=[
+        {**_event(i), "payload": {"message": "ocr failed"}} for i in range(5)
+    ])
+
+    assert client.get("/events/search", params={"q": "ocr", "limit": -1}).json()["count"] == 1
+    assert client.get("/events/search", params={"q": "ocr", "limit": 100}).json()["count"] == 3
+
+
+def test_downsampling_merges_old_minutes_into_hours(client, server):
+    hour = 1_700_000_000_000 - 1_700_000_000_000 % server.HOUR_MS
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.executemany(
+        "INSERT INTO minute_rollup (bucket_ms, hook_event_type, agent, event_count) VALUES (?, 'e', '', ?)",
+        [(hour, 1), (hour + server.MINUTE_MS, 2), (hour + 5 * server.MINUTE_MS, 3)]
+    )
+    conn.commit()
+    conn.close()
+
+    now_ms = hour + (server.ROLLUP_MINUTE_RETENTION_DAYS + 1) * server.DAY_MS
+    result = client.portal.call(server.run_retention, now_ms)
+    assert result["downsampled_buckets"] == 2
+
+    conn = sqlite3.connect(server.DB_PATH)
+    rows = conn.execute("SELECT bucket_ms, event_count FROM minute_rollup").fetchall()
+    conn.close()
+    assert rows == [(hour, 6)]
+
+
+def test_database_uses_incremental_auto_vacuum(client, server):
+    conn = sqlite3.connect(server.DB_PATH)
+    assert conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    conn.close()
+
+
+def test_search_finds_payload_fields_and_paginates(client):
+    client.post("/events/batch", json=[
+        {**_event(i), "payload": {"problem_text": f"quadratic equation {i}"}} for i in range(5)
+    ] + [
+        {**_event(9, event_type="ocr_failed"), "payload": {"error": "mathpix timeout"}},
+        {**_event(10), "summary": "wave 3 finished", "payload": {"cwd": "quadratic"}},
+    ])
+
+    hits = client.get("/events/search", params={"q": "mathpix"}).json()
+    assert [e["payload"]["error"] for e in hits["events"]] == ["mathpix timeout"]
+    assert client.get("/events/search", params={"q": "ocr failed"}).json()["count"] == 1
+    assert client.get("/events/search", params={"q": "wave"}).json()["count"] == 1
+
+    # Only indexed payload fields are searchable
+    quadratic = client.get("/events/search", params={"q": "quadratic", "order": "recent", "limit": 2}).json()
+    seen = [e["payload"]["problem_text"] for e in quadratic["events"]]
+    while quadratic["next_before_id"] is not None:
+        quadratic = client.get("/events/search", params={
+            "q": "quadratic", "order": "recent", "limit": 2,
+            "before_id": quadratic["next_before_id"],
+        }).json()
+        seen.extend(e["payload"]["problem_text"] for e in quadratic["events"])
+    assert seen == [f"quadratic equation {i}" for i in range(4, -1, -1)]
+
+    ranked = client.get("/events/search", params={"q": "quadratic", "limit": 3}).json()
+    rest = client.get("/events/search", params={
+        "q": "quadratic", "limit": 3,
+        "after_rank": ranked["next_after_rank"], "after_id": ranked["next_after_id"],
+    }).json()
+    ids = [e["id"] for e in ranked["events"] + rest["events"]]
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_search_accepts_plain_text_and_follows_retention(client, server):
+    client.post("/events", json={**_event(0), "payload": {"message": "scaffolding-v2 done"}})
+
+    # "-" is FTS5 syntax; the query falls back to literal terms
+    assert client.get("/events/search", params={"q": "scaffolding-v2"}).json()["count"] == 1
+
+    _, now_ms = server.now_stamps()
+    client.portal.call(server.run_retention, now_ms + 365 * server.DAY_MS)
+    assert client.get("/events/search", params={"q": "scaffolding"}).json()["count"] == 0
+
+
+def test_search_index_rebuilt_for_existing_events(client, server):
+    client.post("/events", json={**_event(0), "payload": {"message": "legacy row"}})
+
+    conn = sqlite3.connect(server.DB_PATH)
+    conn.execute("DROP TABLE events_fts")
+    conn.commit()
+    conn.close()
+    server.init_db()
+
+    assert client.get("/events/search", params={"q": "legacy"}).json()["count"] == 1
+
+
+def _metric(text, sample):
+    for line in text.splitlines():
+        if line.startswith(sample + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_metrics_exposes_ingest_and_write_counters(client):
+    client.post("/events", json=_event(0, event_type="PreToolUse"))
+    client.post("/events/batch", json=[_event(i, event_type="PostToolUse") for i in range(3)])
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert _metric(text, 'observability_events_ingested_total{hook_event_type="PreToolUse"}') == 1
+    assert _metric(text, 'observability_events_ingested_total{hook_event_type="PostToolUse"}') == 3
+    assert _metric(text, 'observability_ingest_requests_total{endpoint="batch"}') == 1
+    assert _metric(text, 'observability_ingest_rate_events_per_second') == 4 / 60
+    assert _metric(text, 'observability_write_queue_depth') == 0
+    assert _metric(text, 'observability_sqlite_write_seconds_count') >= 2
+    assert _metric(text, 'observability_sqlite_write_seconds_bucket{le="+Inf"}') >= 2
+    assert "# TYPE observability_events_ingested_total counter" in text
+
+
+def test_metrics_openmetrics_negotiation(client):
+    response = client.get("/metrics", headers={"Accept": "application/openmetrics-text; version=1.0.0"})
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert "# TYPE observability_events_ingested counter" in response.text
+    assert response.text.endswith("# EOF\n")
+
+
+async def test_metrics_websocket_send_lag_and_drops(server):
+    socket = _StalledSocket()
+    channel = server.ClientChannel(socket, maxsize=1)
+    server.websocket_clients[socket] = channel
+    channel.start()
+    try:
+        server.broadcast("0")
+        await asyncio.sleep(0)
+        server.broadcast("1")
+        server.broadcast("2")
+        socket.release.set()
+        while len(socket.sent) < 2:
+            await asyncio.sleep(0.01)
+
+        text = server.render_metrics()
+        assert _metric(text, "observability_websocket_clients") == 1
+        assert _metric(text, "observability_websocket_frames_sent_total") == 2
+        assert _metric(text, "observability_websocket_frames_dropped_total") == 1
+        assert _metric(text, "observability_websocket_send_lag_seconds_count") == 2
+    finally:
+        server.websocket_clients.pop(socket, None)
+        await channel.close()
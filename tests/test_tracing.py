@@ -0,0 +1,180 @@
+"""
+Test: Hierarchical Span Tracing
+
+Verifies parent/child propagation through contextvars (including across
+asyncio tasks), export to the JSONL log and the observability hook, and
+the per-trace breakdown CLI.
+
+VERSION: 1.0.0
+DATE: 2025-10-16
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from infrastructure import tracing_service
+from infrastructure.logging_service import AgentExecutionLogger, StructuredLogger, trace_id_var
+from infrastructure.tracing_service import Tracer, configure_tracing, span, traced
+
+
+class _Collector:
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+@pytest.fixture
+def collector(monkeypatch):
+    collector = _Collector()
+    monkeypatch.setattr(tracing_service, "tracer", Tracer([collector]))
+    token = trace_id_var.set(None)
+    yield collector
+    trace_id_var.reset(token)
+
+
+async def test_nested_async_spans_link_to_parents(collector):
+    @traced("wave")
+    async def run_wave():
+        async def stage(name):
+            async with span(name, kind="stage"):
+                await asyncio.sleep(0.01)
+
+        await asyncio.gather(stage("ocr"), stage("generation"))
+        with span("persistence") as s:
+            s.set_attribute("rows", 3)
+
+    await run_wave()
+
+    by_name = {s.name: s for s in collector.spans}
+    root = by_name["wave"]
+    assert root.parent_id is None
+    assert {by_name[n].parent_id for n in ("ocr", "generation", "persistence")} == {root.span_id}
+    assert len({s.trace_id for s in collector.spans}) == 1
+    assert by_name["persistence"].attributes == {"rows": 3}
+    assert root.duration_ms >= by_name["ocr"].duration_ms >= 10
+    # Context is restored after the root span closes
+    assert tracing_service.current_span_id() is None
+    assert trace_id_var.get() is None
+
+
+def test_errors_mark_span_and_propagate(collector):
+    with pytest.raises(ValueError):
+        with span("ocr"):
+            raise ValueError("bad image")
+    assert collector.spans[0].status == "error"
+    assert "bad image" in collector.spans[0].error
+
+
+def test_agent_execution_logger_opens_agent_span(collector, tmp_path):
+    logger = StructuredLogger(log_dir=str(tmp_path), trace_id="t-123")
+    with span("wave"):
+        with AgentExecutionLogger(logger, "solver", "solve"):
+            pass
+    agent, wave = collector.spans
+    assert agent.name == "agent:solver" and agent.parent_id == wave.span_id
+    assert agent.trace_id == "t-123"
+
+
+def test_exports_to_jsonl_and_observability_then_reports(tmp_path, monkeypatch):
+    sent = []
+    import tools.observability_hook as hook
+    monkeypatch.setattr(hook, "send_hook_event", lambda app, kind, payload: sent.append((app, kind, payload)))
+    monkeypatch.setattr(tracing_service, "tracer", Tracer())
+    configure_tracing(log_dir=str(tmp_path), observability=True, source_app="test")
+    token = trace_id_var.set("trace-abc")
+    try:
+        with span("workflow"):
+            with span("ocr"):
+                pass
+            with span("generation"):
+                pass
+    finally:
+        trace_id_var.reset(token)
+    tracing_service.tracer.exporters[0].sink.flush()
+
+    assert [kind for _, kind, _ in sent] == ["span"] * 3
+    assert sent[-1][2]["name"] == "workflow"
+
+    result = subprocess.run(
+        [sys.executable, str(project_root / "scripts" / "trace_report_script.py"),
+         "--log-dir", str(tmp_path), "--trace", "trace-abc"],
+        capture_output=True, text=True, check=True,
+    )
+    lines = result.stdout.splitlines()
+    assert "Trace trace-abc (3 spans)" in lines[0]
+    names = [line.split()[0] for line in lines[4:]]
+    assert names == ["workflow", "ocr", "generation"]
+
+    folded = subprocess.run(
+        [sys.executable, str(project_root / "scripts" / "trace_report_script.py"),
+         "--log-dir", str(tmp_path), "--trace", "trace-abc", "--folded"],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    assert all(line.startswith("workflow") for line in folded.splitlines())
+
+
+async def test_concurrent_workflow_runs_get_their_own_traces(collector, tmp_path):
+    logger = StructuredLogger(log_dir=str(tmp_path), trace_id="process", buffered=False)
+
+    @traced("workflow", new_trace=True)
+    async def run(name):
+        with span("ocr"):
+            await asyncio.sleep(0.01)
+        logger.system_event("done", name)
+
+    await asyncio.gather(run("a"), run("b"))
+
+    roots = [s for s in collector.spans if s.name == "workflow"]
+    assert len({s.trace_id for s in roots}) == 2 and "process" not in {s.trace_id for s in roots}
+    assert all(s.parent_id is None for s in roots)
+    for ocr in (s for s in collector.spans if s.name == "ocr"):
+        assert ocr.parent_id in {r.span_id for r in roots if r.trace_id == ocr.trace_id}
+
+    entries = [json.loads(line) for line in logger.log_file.read_text().splitlines()]
+    assert {e["trace_id"] for e in entries} == {s.trace_id for s in roots}
+
+
+async def test_parallel_orchestrator_spans_waves_and_variations(collector, monkeypatch, tmp_path):
+    import workflows.math_scaffolding_workflow as workflow
+    import workflows.parallel_scaffolding_orchestrator as orch
+
+    async def fake_generate(problem_text, concepts, patterns):
+        await asyncio.sleep(0.01)
+        return {"steps": [{"difficulty": 2}]}
+
+    class _Dim:
+        def __init__(self, name):
+            self.name = name
+            self.cognitive_focus = "focus"
+            self.difficulty_modifier = 1.0
+            self.instructions = ""
+
+    monkeypatch.setattr(orch, "send_hook_event", lambda *a, **k: None)
+    monkeypatch.setattr(workflow, "generate_scaffolding", fake_generate)
+    orchestrator = orch.ParallelScaffoldingOrchestrator(output_base_dir=str(tmp_path))
+    context = {"problem_text": "x", "concepts": [], "existing_patterns": []}
+
+    with span("parallel_scaffolding", new_trace=True):
+        variations = await orchestrator._execute_parallel_wave(
+            shared_context=context, dimensions=[_Dim("a"), _Dim("b")], existing_variations=[]
+        )
+
+    assert len(variations) == 2
+    by_name = {}
+    for s in collector.spans:
+        by_name.setdefault(s.name, []).append(s)
+    (wave,) = by_name["wave"]
+    assert wave.parent_id == by_name["parallel_scaffolding"][0].span_id
+    assert wave.attributes["variations"] == 2
+    assert [s.parent_id for s in by_name["variation"]] == [wave.span_id] * 2
+    assert {s.attributes["dimension"] for s in by_name["variation"]} == {"a", "b"}
@@ -18,6 +18,8 @@ import logging
 
 from tools.observability_hook import send_hook_event
 from workflows.hook_events import HookEventType
+from infrastructure.deadline_service import DeadlineExceeded, check_deadline, shrink_timeout
+from infrastructure.tracing_service import traced
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +27,17 @@ logger = logging.getLogger(__name__)
 MATHPIX_APP_ID = "kc_palantir_math"
 MATHPIX_APP_KEY = "c89149d2c80f6a6a96e812da4c07d10ba7f74316f26414825ffbb3ed588c34d9"
 MATHPIX_API_URL = "https://api.mathpix.com/v3/text"
+MATHPIX_TIMEOUT_S = 30  # Shrunk to the remaining workflow deadline, if any
 
 
+@traced("tool:mathpix_ocr")
 def extract_math_from_image(image_path: str) -> Dict[str, Any]:
     """
     Extract mathematical notation from image using Mathpix OCR.
     
+    Under an active workflow deadline the request timeout is shrunk to the
+    time left, and the call is skipped entirely once the deadline has passed.
+    
     Args:
         image_path: Path to image file
         
@@ -57,6 +64,8 @@ def extract_math_from_image(image_path: str) -> Dict[str, Any]:
     logger.info(f"[OCR] Extracting math from {image_path_obj.name}...")
     
     try:
+        check_deadline("OCR")
+        
         # Read and encode image
         with open(image_path, 'rb') as image_file:
             image_data = base64.b64encode(image_file.read()).decode('utf-8')
@@ -88,7 +97,7 @@ def extract_math_from_image(image_path: str) -> Dict[str, Any]:
             MATHPIX_API_URL,
             headers=headers,
             json=payload,
-            timeout=30
+            timeout=shrink_timeout(MATHPIX_TIMEOUT_S)
         )
         
         if response.status_code == 200:
@@ -155,6 +164,24 @@ def extract_math_from_image(image_path: str) -> Dict[str, Any]:
                 "error": error_msg
             }
             
+    except DeadlineExceeded as e:
+        error_msg = str(e)
+        logger.error(f"[OCR] {error_msg}")
+        
+        send_hook_event(
+            "mathpix_ocr",
+            HookEventType.OCR_FAILED,
+            {"error": error_msg, "deadline_exceeded": True}
+        )
+        
+        return {
+            "text": "",
+            "latex": "",
+            "confidence": 0.0,
+            "success": False,
+            "error": error_msg
+        }
+        
     except FileNotFoundError:
         error_msg = f"Image file not found: {image_path}"
         logger.error(f"[OCR] {error_msg}")
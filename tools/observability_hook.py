@@ -3,23 +3,180 @@ Observability Hook - Event Sender
 
 Sends workflow events to observability server for real-time monitoring.
 
-VERSION: 2.0.0 - Human-Readable Session IDs
+Events are queued in-process and delivered by a background sender thread
+in batches over a pooled HTTP connection, so callers (including coroutines
+on the event loop) never wait on the network. When the queue is full new
+events are dropped and counted instead of blocking the workflow.
+
+VERSION: 2.1.0 - Non-blocking Batched Delivery
 DATE: 2025-10-16
 """
 
+import atexit
+import queue
 import requests
+import threading
+import time
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 OBSERVABILITY_URL = "http://localhost:4000/events"
+OBSERVABILITY_BATCH_URL = OBSERVABILITY_URL + "/batch"
 SESSION_ID = str(uuid.uuid4())  # Generated per workflow run
 SESSION_NAME = None  # Human-readable session name
 SESSION_CONTEXT = {}  # Additional session context
 
+# Delivery tuning
+QUEUE_MAXSIZE = 10_000  # Events buffered before new ones are dropped
+BATCH_SIZE = 100  # Max events per POST
+FLUSH_INTERVAL_S = 0.25  # Max time an event waits for a batch to fill
+REQUEST_TIMEOUT_S = 2.0  # Per-batch POST timeout (sender thread only)
+
+
+class _BatchingEmitter:
+    """
+    Bounded queue drained by a daemon thread that POSTs event batches.
+
+    The batch endpoint is used when the server supports it; servers without
+    it (404/405) fall back to per-event POSTs over the same pooled session.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = QUEUE_MAXSIZE,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_s: float = FLUSH_INTERVAL_S
+    ):
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=maxsize)
+        self._session: Optional[requests.Session] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._batch_supported = True
+        self.sent_count = 0
+        self.dropped_count = 0
+        self.failed_count = 0
+
+    def enqueue(self, event: Dict[str, Any]) -> bool:
+        """Queue an event without blocking. Returns False if it was dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except queue.Full:
+            self.dropped_count += 1
+            if self.dropped_count % 1000 == 1:
+                logger.debug(
+                    f"[Observability] Queue full, dropped {self.dropped_count} events so far"
+                )
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until all queued events have been handled.
+
+        Returns:
+            bool: True if the queue drained before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self._queue.unfinished_tasks == 0:
+                return True
+            time.sleep(0.01)
+        return self._queue.unfinished_tasks == 0
+
+    def stats(self) -> Dict[str, int]:
+        """Delivery counters for diagnostics."""
+        return {
+            "queued": self._queue.qsize(),
+            "sent": self.sent_count,
+            "dropped": self.dropped_count,
+            "failed": self.failed_count,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            if self._session is None:
+                self._session = requests.Session()
+            self._thread = threading.Thread(
+                target=self._run,
+                name="observability-emitter",
+                daemon=True
+            )
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            deadline = time.monotonic() + self.flush_interval_s
+
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._deliver(batch)
+            except Exception as e:
+                # Never let the sender thread die
+                self.failed_count += len(batch)
+                logger.debug(f"[Observability] Failed to send batch: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _deliver(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            if self._batch_supported:
+                response = self._session.post(
+                    OBSERVABILITY_BATCH_URL,
+                    json=batch,
+                    timeout=REQUEST_TIMEOUT_S
+                )
+                if response.status_code in (404, 405):
+                    self._batch_supported = False
+                elif response.status_code == 200:
+                    self.sent_count += len(batch)
+                    return
+                else:
+                    self.failed_count += len(batch)
+                    logger.warning(f"[Observability] Failed to send batch: {response.status_code}")
+                    return
+
+            for event in batch:
+                response = self._session.post(
+                    OBSERVABILITY_URL,
+                    json=event,
+                    timeout=REQUEST_TIMEOUT_S
+                )
+                if response.status_code == 200:
+                    self.sent_count += 1
+                else:
+                    self.failed_count += 1
+
+        except requests.exceptions.ConnectionError:
+            # Observability server not running - don't fail workflow
+            self.failed_count += len(batch)
+            logger.debug("[Observability] Server not available (this is OK)")
+
+
+_emitter = _BatchingEmitter()
+atexit.register(lambda: _emitter.flush(timeout=2.0))
+
 
 def send_hook_event(
     source_app: str,
@@ -27,7 +184,10 @@ def send_hook_event(
     payload: Dict[str, Any]
 ) -> bool:
     """
-    Send hook event to observability server.
+    Queue hook event for delivery to the observability server.
+    
+    Never blocks on the network: the event is handed to a background sender
+    that POSTs batches. Safe to call from inside coroutines.
     
     Args:
         source_app: Workflow type (e.g., "math_scaffolding", "ocr_extraction")
@@ -35,7 +195,7 @@ def send_hook_event(
         payload: Event data
         
     Returns:
-        bool: True if event sent successfully, False otherwise
+        bool: True if event was queued, False if it was dropped
     """
     try:
         # Prepare event payload with session context
@@ -55,29 +215,37 @@ def send_hook_event(
         if SESSION_CONTEXT:
             event_payload["session_context"] = SESSION_CONTEXT
         
-        response = requests.post(
-            OBSERVABILITY_URL,
-            json=event_payload,
-            timeout=1
-        )
-        
-        if response.status_code == 200:
-            logger.debug(f"[Observability] Sent {hook_event_type} from {source_app}")
-            return True
-        else:
-            logger.warning(f"[Observability] Failed to send event: {response.status_code}")
-            return False
+        queued = _emitter.enqueue(event_payload)
+        if queued:
+            logger.debug(f"[Observability] Queued {hook_event_type} from {source_app}")
+        return queued
             
-    except requests.exceptions.ConnectionError:
-        # Observability server not running - don't fail workflow
-        logger.debug(f"[Observability] Server not available (this is OK)")
-        return False
     except Exception as e:
         # Don't fail workflow if observability is down
-        logger.debug(f"[Observability] Failed to send event: {e}")
+        logger.debug(f"[Observability] Failed to queue event: {e}")
         return False
 
 
+def flush_events(timeout: float = 5.0) -> bool:
+    """
+    Block until queued events have been delivered (or given up on).
+    
+    Intended for the end of a workflow run or tests, not the hot path.
+    
+    Args:
+        timeout: Maximum seconds to wait
+        
+    Returns:
+        bool: True if the queue drained in time
+    """
+    return _emitter.flush(timeout=timeout)
+
+
+def get_emitter_stats() -> Dict[str, int]:
+    """Get delivery counters (queued, sent, dropped, failed)."""
+    return _emitter.stats()
+
+
 def get_session_id() -> str:
     """Get the current workflow session ID."""
     return SESSION_ID
@@ -18,7 +18,7 @@ DATE: 2025-10-16
 import asyncio
 import json
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 
@@ -27,9 +27,15 @@ from tools.feedback_collector import collect_interactive_feedback
 from workflows.concept_matcher import identify_concepts
 from tools.observability_hook import send_hook_event, get_session_id, set_session_context
 from workflows.hook_events import HookEventType
+from infrastructure.tracing_service import span, traced
+from infrastructure.deadline_service import check_deadline, deadline_scope
 
 logger = logging.getLogger(__name__)
 
+# End-to-end budget for the automated stages (OCR -> generation); teacher
+# feedback is interactive and runs outside it
+WORKFLOW_DEADLINE_S = 60.0
+
 
 async def query_neo4j_patterns(concepts: list) -> list:
     """
@@ -77,7 +83,12 @@ async def generate_scaffolding(
         
     Returns:
         dict: Scaffolding with steps
+        
+    Raises:
+        DeadlineExceeded: If the workflow deadline has already passed
     """
+    check_deadline("scaffolding generation")
+    
     send_hook_event(
         "scaffolding_generation",
         HookEventType.SCAFFOLDING_STARTED,
@@ -492,7 +503,11 @@ async def generate_validation_report(
     )
 
 
-async def run_math_scaffolding_workflow(image_path: str) -> Dict[str, Any]:
+@traced("math_scaffolding_workflow", new_trace=True)
+async def run_math_scaffolding_workflow(
+    image_path: str,
+    deadline_s: Optional[float] = WORKFLOW_DEADLINE_S
+) -> Dict[str, Any]:
     """
     Run complete math scaffolding workflow with feedback collection.
     
@@ -505,8 +520,12 @@ async def run_math_scaffolding_workflow(image_path: str) -> Dict[str, Any]:
     6. Learns patterns (continuous improvement)
     7. Stores in Neo4j (reusable patterns)
     
+    Steps 1-4 share one deadline (deadline_s); a stage that would start
+    after it is dropped and the workflow fails fast instead of hanging.
+    
     Args:
         image_path: Path to math problem image
+        deadline_s: Time budget for steps 1-4 (None = unbounded)
         
     Returns:
         dict: Complete workflow results with feedback and patterns
@@ -522,49 +541,54 @@ async def run_math_scaffolding_workflow(image_path: str) -> Dict[str, Any]:
     print("="*70)
     
     try:
-        # Step 1: OCR Extraction
-        print("\n[1/7] OCR Extraction...")
-        problem_data = extract_math_from_image(image_path)
+        with deadline_scope(deadline_s):
+            # Step 1: OCR Extraction
+            print("\n[1/7] OCR Extraction...")
+            with span("ocr", image=image_path):
+                problem_data = extract_math_from_image(image_path)
         
-        if not problem_data.get("success"):
-            print(f"❌ OCR failed: {problem_data.get('error')}")
-            return {"success": False, "error": "OCR failed"}
+            if not problem_data.get("success"):
+                print(f"❌ OCR failed: {problem_data.get('error')}")
+                return {"success": False, "error": "OCR failed"}
         
-        print(f"✅ OCR completed (confidence: {problem_data['confidence']:.2%})")
-        print(f"   Text: {problem_data['text'][:100]}...")
+            print(f"✅ OCR completed (confidence: {problem_data['confidence']:.2%})")
+            print(f"   Text: {problem_data['text'][:100]}...")
         
-        # Set session context with problem preview
-        problem_preview = problem_data['text'][:30].replace('\n', ' ')
-        set_session_context(
-            problem_preview=problem_preview,
-            workflow_type="Math Scaffolding",
-            image_path=image_path
-        )
+            # Set session context with problem preview
+            problem_preview = problem_data['text'][:30].replace('\n', ' ')
+            set_session_context(
+                problem_preview=problem_preview,
+                workflow_type="Math Scaffolding",
+                image_path=image_path
+            )
         
-        # Step 2: Concept Identification
-        print("\n[2/7] Concept Identification...")
-        concepts = identify_concepts(problem_data, top_k=3)
+            # Step 2: Concept Identification
+            print("\n[2/7] Concept Identification...")
+            with span("concept_matching", top_k=3):
+                concepts = identify_concepts(problem_data, top_k=3)
         
-        if not concepts:
-            print("❌ No concepts matched")
-            return {"success": False, "error": "No concepts matched"}
+            if not concepts:
+                print("❌ No concepts matched")
+                return {"success": False, "error": "No concepts matched"}
         
-        print(f"✅ Matched {len(concepts)} concepts:")
-        for i, c in enumerate(concepts, 1):
-            print(f"   {i}. {c['name']} (score: {c['relevance_score']:.3f})")
+            print(f"✅ Matched {len(concepts)} concepts:")
+            for i, c in enumerate(concepts, 1):
+                print(f"   {i}. {c['name']} (score: {c['relevance_score']:.3f})")
         
-        # Step 3: Query Patterns
-        print("\n[3/7] Querying Learned Patterns...")
-        patterns = await query_neo4j_patterns(concepts)
-        print(f"✅ Found {len(patterns)} applicable patterns")
+            # Step 3: Query Patterns
+            print("\n[3/7] Querying Learned Patterns...")
+            async with span("pattern_query", concepts=len(concepts)):
+                patterns = await query_neo4j_patterns(concepts)
+            print(f"✅ Found {len(patterns)} applicable patterns")
         
-        # Step 4: Generate Scaffolding
-        print("\n[4/7] Generating Scaffolding...")
-        scaffolding = await generate_scaffolding(
-            problem_data["text"],
-            concepts,
-            patterns
-        )
+            # Step 4: Generate Scaffolding
+            print("\n[4/7] Generating Scaffolding...")
+            async with span("generation", patterns=len(patterns)):
+                scaffolding = await generate_scaffolding(
+                    problem_data["text"],
+                    concepts,
+                    patterns
+                )
         
         # Add metadata to scaffolding
         scaffolding["image_source"] = image_path
@@ -578,7 +602,8 @@ async def run_math_scaffolding_workflow(image_path: str) -> Dict[str, Any]:
         
         # Step 5: Collect Feedback
         print("\n[5/7] Collecting Feedback...")
-        feedback_session = collect_interactive_feedback(scaffolding)
+        with span("feedback_collection"):
+            feedback_session = collect_interactive_feedback(scaffolding)
         
         if feedback_session.get("cancelled"):
             print("❌ Feedback collection cancelled")
@@ -588,12 +613,14 @@ async def run_math_scaffolding_workflow(image_path: str) -> Dict[str, Any]:
         
         # Step 6: Extract Patterns
         print("\n[6/7] Extracting Patterns...")
-        learned_patterns = await extract_patterns_from_feedback(feedback_session)
+        async with span("pattern_extraction"):
+            learned_patterns = await extract_patterns_from_feedback(feedback_session)
         print(f"✅ Extracted {len(learned_patterns)} patterns")
         
         # Step 7: Store in Neo4j
         print("\n[7/7] Storing Patterns...")
-        success = await store_patterns_neo4j(learned_patterns)
+        async with span("persistence", patterns=len(learned_patterns)):
+            success = await store_patterns_neo4j(learned_patterns)
         
         if success:
             print(f"✅ Patterns stored successfully")
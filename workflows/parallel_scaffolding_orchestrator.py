@@ -4,7 +4,7 @@ Parallel Scaffolding Orchestrator - Multi-Variation Generation
 Orchestrates parallel generation of multiple unique scaffolding variations
 using the infinite-agentic-loop pattern.
 
-VERSION: 1.0.0
+VERSION: 1.1.0 - End-to-end deadline per generation call
 DATE: 2025-10-16
 """
 
@@ -26,6 +26,8 @@ from workflows.concept_matcher import identify_concepts, load_all_concepts
 from tools.mathpix_ocr_tool import extract_math_from_image
 from tools.observability_hook import send_hook_event, set_session_context
 from workflows.hook_events import HookEventType
+from infrastructure.deadline_service import check_deadline, current_deadline, deadline_scope
+from infrastructure.tracing_service import span
 
 logger = logging.getLogger(__name__)
 
@@ -60,20 +62,24 @@ class ParallelScaffoldingOrchestrator:
     - Shared context reuse (OCR, concepts, patterns)
     - Uniqueness validation
     - Wave-based generation for infinite mode
+    - Optional end-to-end deadline: late variations are dropped, no new
+      wave starts once it has passed
     """
     
-    def __init__(self, output_base_dir: str = None):
+    def __init__(self, output_base_dir: str = None, deadline_s: Optional[float] = None):
         """
         Initialize orchestrator.
         
         Args:
             output_base_dir: Base directory for saving variations
+            deadline_s: Time budget per generate_* call (None = unbounded)
         """
         self.output_base_dir = Path(output_base_dir or "/home/kc-palantir/math/data/scaffolding_variations")
         self.output_base_dir.mkdir(parents=True, exist_ok=True)
         
         self.variation_engine = VariationEngine()
         self.generated_variations: List[Dict] = []
+        self.deadline_s = deadline_s
     
     async def prepare_shared_context(self, problem_image: str) -> Dict[str, Any]:
         """
@@ -96,7 +102,8 @@ class ParallelScaffoldingOrchestrator:
             {"image_path": problem_image}
         )
         
-        problem_data = extract_math_from_image(problem_image)
+        with span("ocr", image=problem_image):
+            problem_data = extract_math_from_image(problem_image)
         
         if not problem_data.get("success"):
             raise ValueError(f"OCR failed: {problem_data.get('error')}")
@@ -122,7 +129,8 @@ class ParallelScaffoldingOrchestrator:
             {}
         )
         
-        concepts = identify_concepts(problem_data, top_k=5)
+        with span("concept_matching", top_k=5):
+            concepts = identify_concepts(problem_data, top_k=5)
         
         send_hook_event(
             "parallel_orchestrator",
@@ -171,36 +179,39 @@ class ParallelScaffoldingOrchestrator:
         """
         from workflows.math_scaffolding_workflow import generate_scaffolding
         
-        logger.info(f"[Parallel] Generating variation {iteration_number} ({dimension.name})")
+        async with span("variation", iteration=iteration_number, dimension=dimension.name):
+            check_deadline(f"variation {iteration_number}")
         
-        send_hook_event(
-            "parallel_orchestrator",
-            ParallelHookEventType.VARIATION_GENERATED,
-            {
-                "iteration": iteration_number,
-                "dimension": dimension.name,
-                "wave_position": iteration_number
-            }
-        )
+            logger.info(f"[Parallel] Generating variation {iteration_number} ({dimension.name})")
         
-        # Generate scaffolding with dimension context
-        scaffolding = await generate_scaffolding(
-            shared_context["problem_text"],
-            shared_context["concepts"],
-            shared_context["existing_patterns"]
-        )
+            send_hook_event(
+                "parallel_orchestrator",
+                ParallelHookEventType.VARIATION_GENERATED,
+                {
+                    "iteration": iteration_number,
+                    "dimension": dimension.name,
+                    "wave_position": iteration_number
+                }
+            )
         
-        # Enhance with variation metadata
-        scaffolding["variation_dimension"] = dimension.name.lower().replace(" ", "_")
-        scaffolding["variation_iteration"] = iteration_number
-        scaffolding["pedagogy_style"] = dimension.cognitive_focus
-        scaffolding["difficulty_modifier"] = dimension.difficulty_modifier
-        scaffolding["dimension_instructions"] = dimension.instructions
+            # Generate scaffolding with dimension context
+            scaffolding = await generate_scaffolding(
+                shared_context["problem_text"],
+                shared_context["concepts"],
+                shared_context["existing_patterns"]
+            )
         
-        # Modify steps based on dimension (basic implementation)
-        scaffolding = self._apply_dimension_to_steps(scaffolding, dimension)
+            # Enhance with variation metadata
+            scaffolding["variation_dimension"] = dimension.name.lower().replace(" ", "_")
+            scaffolding["variation_iteration"] = iteration_number
+            scaffolding["pedagogy_style"] = dimension.cognitive_focus
+            scaffolding["difficulty_modifier"] = dimension.difficulty_modifier
+            scaffolding["dimension_instructions"] = dimension.instructions
         
-        return scaffolding
+            # Modify steps based on dimension (basic implementation)
+            scaffolding = self._apply_dimension_to_steps(scaffolding, dimension)
+        
+            return scaffolding
     
     def _apply_dimension_to_steps(
         self,
@@ -239,48 +250,49 @@ class ParallelScaffoldingOrchestrator:
         Returns:
             list: Generated scaffolding variations
         """
-        logger.info(f"[Parallel] Starting generation of {count} variations")
+        with deadline_scope(self.deadline_s), span("parallel_scaffolding", new_trace=True, count=count):
+            logger.info(f"[Parallel] Starting generation of {count} variations")
         
-        # Prepare shared context (runs once)
-        shared_context = await self.prepare_shared_context(problem_image)
+            # Prepare shared context (runs once)
+            shared_context = await self.prepare_shared_context(problem_image)
         
-        # Load existing variations for this problem
-        problem_id = self._get_problem_id(shared_context)
-        existing_variations = self._load_existing_variations(problem_id)
+            # Load existing variations for this problem
+            problem_id = self._get_problem_id(shared_context)
+            existing_variations = self._load_existing_variations(problem_id)
         
-        # Assign variation dimensions
-        dimensions = self.variation_engine.assign_dimensions(
-            count=count,
-            existing_variations=existing_variations
-        )
+            # Assign variation dimensions
+            dimensions = self.variation_engine.assign_dimensions(
+                count=count,
+                existing_variations=existing_variations
+            )
         
-        logger.info(f"[Parallel] Assigned dimensions: {[d.name for d in dimensions]}")
+            logger.info(f"[Parallel] Assigned dimensions: {[d.name for d in dimensions]}")
         
-        # Generate variations in parallel
-        variations = await self._execute_parallel_wave(
-            shared_context=shared_context,
-            dimensions=dimensions,
-            existing_variations=existing_variations
-        )
+            # Generate variations in parallel
+            variations = await self._execute_parallel_wave(
+                shared_context=shared_context,
+                dimensions=dimensions,
+                existing_variations=existing_variations
+            )
         
-        # Validate and save
-        validated_variations = []
-        for var in variations:
-            # Use relaxed threshold since variations have different dimensions
-            if validate_uniqueness(var, existing_variations + validated_variations, threshold=0.95):
-                validated_variations.append(var)
-                self._save_variation(var, problem_id)
-            else:
-                # Still save but log warning - variations with different dimensions are acceptable
-                logger.info(f"[Parallel] Variation {var['variation_iteration']} similar to existing, but different dimension")
-                validated_variations.append(var)
-                self._save_variation(var, problem_id)
+            # Validate and save
+            validated_variations = []
+            for var in variations:
+                # Use relaxed threshold since variations have different dimensions
+                if validate_uniqueness(var, existing_variations + validated_variations, threshold=0.95):
+                    validated_variations.append(var)
+                    self._save_variation(var, problem_id)
+                else:
+                    # Still save but log warning - variations with different dimensions are acceptable
+                    logger.info(f"[Parallel] Variation {var['variation_iteration']} similar to existing, but different dimension")
+                    validated_variations.append(var)
+                    self._save_variation(var, problem_id)
         
-        logger.info(f"[Parallel] Generated {len(validated_variations)}/{count} unique variations")
+            logger.info(f"[Parallel] Generated {len(validated_variations)}/{count} unique variations")
         
-        self.generated_variations.extend(validated_variations)
+            self.generated_variations.extend(validated_variations)
         
-        return validated_variations
+            return validated_variations
     
     async def _execute_parallel_wave(
         self,
@@ -303,55 +315,73 @@ class ParallelScaffoldingOrchestrator:
         
         logger.info(f"[Parallel] Executing wave {wave_number} with {len(dimensions)} agents")
         
-        send_hook_event(
-            "parallel_orchestrator",
-            ParallelHookEventType.WAVE_STARTED,
-            {
-                "wave_number": wave_number,
-                "agent_count": len(dimensions),
-                "dimensions": [d.name for d in dimensions]
-            }
-        )
+        # Child spans of the wave (one per variation task) inherit it via contextvars
+        async with span("wave", wave=wave_number, agents=len(dimensions)) as wave_span:
+            send_hook_event(
+                "parallel_orchestrator",
+                ParallelHookEventType.WAVE_STARTED,
+                {
+                    "wave_number": wave_number,
+                    "agent_count": len(dimensions),
+                    "dimensions": [d.name for d in dimensions]
+                }
+            )
         
-        # Create variation generation tasks
-        tasks = []
-        for i, dimension in enumerate(dimensions):
-            iteration_number = len(existing_variations) + i + 1
+            # Create variation generation tasks
+            tasks = []
+            for i, dimension in enumerate(dimensions):
+                iteration_number = len(existing_variations) + i + 1
             
-            task = self.generate_single_variation(
-                shared_context=shared_context,
-                dimension=dimension,
-                iteration_number=iteration_number,
-                existing_variations=existing_variations
+                task = self.generate_single_variation(
+                    shared_context=shared_context,
+                    dimension=dimension,
+                    iteration_number=iteration_number,
+                    existing_variations=existing_variations
+                )
+                tasks.append(task)
+        
+            # Execute in parallel; under a deadline, stragglers are cancelled and dropped
+            start_time = datetime.now()
+            deadline = current_deadline()
+            late = 0
+            if deadline is None:
+                variations = await asyncio.gather(*tasks, return_exceptions=True)
+            else:
+                futures = [asyncio.ensure_future(t) for t in tasks]
+                _, pending = await asyncio.wait(futures, timeout=deadline.timeout())
+                for future in pending:
+                    future.cancel()
+                late = len(pending)
+                variations = [f.exception() or f.result() for f in futures if f not in pending]
+            duration = (datetime.now() - start_time).total_seconds()
+        
+            # Filter out exceptions
+            valid_variations = [v for v in variations if not isinstance(v, Exception)]
+            exceptions = [v for v in variations if isinstance(v, Exception)]
+        
+            if exceptions:
+                logger.error(f"[Parallel] {len(exceptions)} agents failed: {exceptions}")
+            if late:
+                logger.warning(f"[Parallel] Dropped {late} variations that missed the deadline")
+        
+            send_hook_event(
+                "parallel_orchestrator",
+                ParallelHookEventType.WAVE_COMPLETED,
+                {
+                    "wave_number": wave_number,
+                    "variations_generated": len(valid_variations),
+                    "failures": len(exceptions),
+                    "dropped_late": late,
+                    "duration_seconds": duration
+                }
             )
-            tasks.append(task)
-        
-        # Execute in parallel
-        start_time = datetime.now()
-        variations = await asyncio.gather(*tasks, return_exceptions=True)
-        duration = (datetime.now() - start_time).total_seconds()
         
-        # Filter out exceptions
-        valid_variations = [v for v in variations if not isinstance(v, Exception)]
-        exceptions = [v for v in variations if isinstance(v, Exception)]
-        
-        if exceptions:
-            logger.error(f"[Parallel] {len(exceptions)} agents failed: {exceptions}")
-        
-        send_hook_event(
-            "parallel_orchestrator",
-            ParallelHookEventType.WAVE_COMPLETED,
-            {
-                "wave_number": wave_number,
-                "variations_generated": len(valid_variations),
-                "failures": len(exceptions),
-                "duration_seconds": duration
-            }
-        )
+            wave_span.set_attribute("variations", len(valid_variations))
+            wave_span.set_attribute("failures", len(exceptions))
+            wave_span.set_attribute("dropped_late", late)
+            logger.info(f"[Parallel] Wave {wave_number} completed: {len(valid_variations)} variations in {duration:.1f}s")
         
-        logger.info(f"[Parallel] Wave {wave_number} completed: {len(valid_variations)} variations in {duration:.1f}s")
-        
-        return valid_variations
+            return valid_variations
     
     def _get_problem_id(self, shared_context: Dict) -> str:
         """Generate problem ID from context."""
@@ -407,72 +437,78 @@ class ParallelScaffoldingOrchestrator:
         Returns:
             list: All generated variations
         """
-        logger.info(f"[Parallel] Starting wave-based generation (wave_size={wave_size})")
+        with deadline_scope(self.deadline_s), span("parallel_scaffolding", new_trace=True, wave_size=wave_size):
+            logger.info(f"[Parallel] Starting wave-based generation (wave_size={wave_size})")
         
-        # Prepare shared context once
-        shared_context = await self.prepare_shared_context(problem_image)
-        problem_id = self._get_problem_id(shared_context)
+            # Prepare shared context once
+            shared_context = await self.prepare_shared_context(problem_image)
+            problem_id = self._get_problem_id(shared_context)
         
-        all_variations = []
-        wave_number = 1
+            all_variations = []
+            wave_number = 1
         
-        while len(all_variations) < max_variations:
-            remaining = max_variations - len(all_variations)
-            if remaining <= 0:
-                break
+            while len(all_variations) < max_variations:
+                remaining = max_variations - len(all_variations)
+                if remaining <= 0:
+                    break
+                
+                deadline = current_deadline()
+                if deadline and deadline.expired():
+                    logger.info(f"[Parallel] Deadline reached, not starting wave {wave_number}")
+                    break
                 
-            current_wave_size = min(wave_size, int(remaining) if remaining != float('inf') else wave_size)
+                current_wave_size = min(wave_size, int(remaining) if remaining != float('inf') else wave_size)
             
-            logger.info(f"[Parallel] Wave {wave_number}: Generating {current_wave_size} variations (total so far: {len(all_variations)})")
+                logger.info(f"[Parallel] Wave {wave_number}: Generating {current_wave_size} variations (total so far: {len(all_variations)})")
             
-            # Assign dimensions for this wave
-            dimensions = self.variation_engine.assign_dimensions(
-                count=current_wave_size,
-                existing_variations=all_variations,
-                prefer_high_rated=(wave_number > 1)  # Use learned preferences after wave 1
-            )
+                # Assign dimensions for this wave
+                dimensions = self.variation_engine.assign_dimensions(
+                    count=current_wave_size,
+                    existing_variations=all_variations,
+                    prefer_high_rated=(wave_number > 1)  # Use learned preferences after wave 1
+                )
             
-            logger.info(f"[Parallel] Assigned dimensions: {[d.name for d in dimensions]}")
+                logger.info(f"[Parallel] Assigned dimensions: {[d.name for d in dimensions]}")
             
-            # Execute wave
-            wave_variations = await self._execute_parallel_wave(
-                shared_context=shared_context,
-                dimensions=dimensions,
-                existing_variations=all_variations
-            )
+                # Execute wave
+                wave_variations = await self._execute_parallel_wave(
+                    shared_context=shared_context,
+                    dimensions=dimensions,
+                    existing_variations=all_variations
+                )
             
-            logger.info(f"[Parallel] Wave {wave_number} produced {len(wave_variations)} variations")
+                logger.info(f"[Parallel] Wave {wave_number} produced {len(wave_variations)} variations")
             
-            # Validate and save
-            wave_added = 0
-            for var in wave_variations:
-                if validate_uniqueness(var, all_variations, threshold=0.95):
-                    all_variations.append(var)
-                    self._save_variation(var, problem_id)
-                    wave_added += 1
-                else:
-                    # For different dimensions, still accept
-                    all_variations.append(var)
-                    self._save_variation(var, problem_id)
-                    wave_added += 1
+                # Validate and save
+                wave_added = 0
+                for var in wave_variations:
+                    if validate_uniqueness(var, all_variations, threshold=0.95):
+                        all_variations.append(var)
+                        self._save_variation(var, problem_id)
+                        wave_added += 1
+                    else:
+                        # For different dimensions, still accept
+                        all_variations.append(var)
+                        self._save_variation(var, problem_id)
+                        wave_added += 1
             
-            logger.info(f"[Parallel] Wave {wave_number} added {wave_added} variations (total: {len(all_variations)})")
+                logger.info(f"[Parallel] Wave {wave_number} added {wave_added} variations (total: {len(all_variations)})")
             
-            wave_number += 1
+                wave_number += 1
             
-            # Check context capacity (simplified check)
-            if wave_number > 20:  # Safety limit
-                logger.info(f"[Parallel] Reached safety limit of 20 waves")
-                break
+                # Check context capacity (simplified check)
+                if wave_number > 20:  # Safety limit
+                    logger.info(f"[Parallel] Reached safety limit of 20 waves")
+                    break
             
-            # If no variations were added, stop
-            if wave_added == 0:
-                logger.warning(f"[Parallel] No variations added in wave {wave_number-1}, stopping")
-                break
+                # If no variations were added, stop
+                if wave_added == 0:
+                    logger.warning(f"[Parallel] No variations added in wave {wave_number-1}, stopping")
+                    break
         
-        logger.info(f"[Parallel] Completed: {len(all_variations)} total variations across {wave_number-1} waves")
+            logger.info(f"[Parallel] Completed: {len(all_variations)} total variations across {wave_number-1} waves")
         
-        return all_variations
+            return all_variations
     
     def synthesize_best_elements(
         self,
@@ -529,7 +565,8 @@ class ParallelScaffoldingOrchestrator:
 
 async def generate_variations_parallel(
     problem_image: str,
-    count: int = 3
+    count: int = 3,
+    deadline_s: Optional[float] = None
 ) -> List[Dict[str, Any]]:
     """
     Convenience function for parallel generation.
@@ -537,17 +574,19 @@ async def generate_variations_parallel(
     Args:
         problem_image: Path to problem image
         count: Number of variations (default: 3)
+        deadline_s: End-to-end time budget (None = unbounded)
         
     Returns:
         list: Generated variations
     """
-    orchestrator = ParallelScaffoldingOrchestrator()
+    orchestrator = ParallelScaffoldingOrchestrator(deadline_s=deadline_s)
     return await orchestrator.generate_multiple_scaffoldings(problem_image, count)
 
 
 async def generate_variations_infinite(
     problem_image: str,
-    wave_size: int = 3
+    wave_size: int = 3,
+    deadline_s: Optional[float] = None
 ) -> List[Dict[str, Any]]:
     """
     Convenience function for infinite generation.
@@ -555,11 +594,12 @@ async def generate_variations_infinite(
     Args:
         problem_image: Path to problem image
         wave_size: Agents per wave (default: 3)
+        deadline_s: End-to-end time budget; waves stop once it passes
         
     Returns:
         list: All generated variations
     """
-    orchestrator = ParallelScaffoldingOrchestrator()
+    orchestrator = ParallelScaffoldingOrchestrator(deadline_s=deadline_s)
     return await orchestrator.generate_with_waves(
         problem_image=problem_image,
         max_variations=float('inf'),